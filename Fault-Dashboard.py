@@ -1,15 +1,35 @@
 import streamlit as st
 import pandas as pd
-import requests
 import os
-import numpy as np
 from datetime import datetime
-import random
-from streamlit_autorefresh import st_autorefresh
 from charts_module import ChartGenerator
+from predictions_module import build_prediction_table
+from alerts_module import build_alert_table
+from refresh_module import fragment_run_every, update_fragment_interval
+from instrumentation_module import timed, diagnostics_enabled, render_diagnostics_panel, start_metrics_server, run_page
+from assets_module import build_stylesheet
+from scenario_module import ScenarioEngine
+from ingest_module import (
+    generate_row, init_stores, ingest_telemetry, predict_rows, ingest_predictions,
+    report_api_failure, IngestClient, sync_from_service
+)
 
 # API Configuration
-FASTAPI_URL = "https://fault-prediction-api.onrender.com/predict"
+FASTAPI_URL = os.environ.get("FASTAPI_URL", "https://fault-prediction-api.onrender.com/predict")
+# When set, the headless ingestion service (python ingest_module.py) generates and predicts;
+# the dashboard only pulls the new rows
+INGEST_URL = os.environ.get("INGEST_URL")
+# Optional shared-memory segment (or memory-mapped file) the service publishes telemetry to
+TELEMETRY_SHM = os.environ.get("TELEMETRY_SHM")
+TELEMETRY_SHM_PATH = os.environ.get("TELEMETRY_SHM_PATH")
+# Seconds the live fragment waits for a prediction before reporting the API as failing
+PREDICTION_TIMEOUT = float(os.environ.get("PREDICTION_TIMEOUT", 10))
+# Optional simulator scenario (see scenario_module.SCENARIOS), e.g. overheating: time-correlated
+# signals with a gradually developing fault instead of independent random rows
+SIMULATOR_SCENARIO = os.environ.get("SIMULATOR_SCENARIO")
+SIMULATOR_SEED = int(os.environ["SIMULATOR_SEED"]) if os.environ.get("SIMULATOR_SEED") else None
+# Scenario time per simulated row, in seconds
+SIMULATOR_STEP_SECONDS = float(os.environ.get("SIMULATOR_STEP_SECONDS", 5))
 
 # Streamlit configuration
 st.set_page_config(
@@ -49,7 +69,23 @@ TRANSLATIONS = {
         'processing_error': 'حدث خطأ أثناء المعالجة: ',
         'processed_success': 'تمت المعالجة والتنبؤ بنجاح! ✅',
         'welcome': 'مرحبًا بك في تحليل بيانات المركبة',
-        'simulator_status': 'حالة المحاكي: '
+        'simulator_status': 'حالة المحاكي: ',
+        'table_view': 'طريقة العرض',
+        'last_ten': 'آخر 10 تنبؤات',
+        'full_history': 'السجل الكامل',
+        'page_size': 'عدد الصفوف في الصفحة',
+        'page': 'الصفحة',
+        'showing_rows': 'عرض السجلات {start} - {stop} من {total}',
+        'anomaly_alert': 'تنبيه مبكر: قراءات غير طبيعية في',
+        'alerts_title': 'التنبيهات',
+        'alert_vehicle': 'المركبة',
+        'alert_severity': 'درجة الخطورة',
+        'time_range': 'النطاق الزمني',
+        'all_time': 'كامل السجل',
+        'last_15m': 'آخر 15 دقيقة',
+        'last_1h': 'آخر ساعة',
+        'last_6h': 'آخر 6 ساعات',
+        'last_24h': 'آخر 24 ساعة'
     },
     'en': {
         'title': 'Vehicle Analytics and Fault Prediction',
@@ -74,418 +110,251 @@ TRANSLATIONS = {
         'processing_error': 'Error occurred during processing: ',
         'processed_success': 'Processed and predicted successfully! ✅',
         'welcome': 'Welcome to Vehicle Analytics',
-        'simulator_status': 'Simulator Status: '
+        'simulator_status': 'Simulator Status: ',
+        'table_view': 'View',
+        'last_ten': 'Last 10 predictions',
+        'full_history': 'Full history',
+        'page_size': 'Rows per page',
+        'page': 'Page',
+        'showing_rows': 'Showing records {start} - {stop} of {total}',
+        'anomaly_alert': 'Early warning: anomalous readings in',
+        'alerts_title': 'Alerts',
+        'alert_vehicle': 'Vehicle',
+        'alert_severity': 'Severity',
+        'time_range': 'Time range',
+        'all_time': 'All history',
+        'last_15m': 'Last 15 minutes',
+        'last_1h': 'Last hour',
+        'last_6h': 'Last 6 hours',
+        'last_24h': 'Last 24 hours'
     }
 }
 
-# CSS for advanced design with modern Arabic fonts
+# Self-hosted stylesheet (static/css/dashboard.css), minified once per process
 def load_css():
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;600;700&display=swap');
-        @import url('https://fonts.googleapis.com/css2?family=Tajawal:wght@200;300;400;500;700;800;900&display=swap');
-        @import url('https://fonts.googleapis.com/css2?family=Almarai:wght@300;400;700;800&display=swap');
-        @import url('https://fonts.googleapis.com/css2?family=Cairo:wght@300;400;500;600;700;800&display=swap');
-        
-        .main {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }
-        
-        .stApp {
-            font-family: 'Cairo', 'Tajawal', 'Almarai', sans-serif;
-            font-weight: 400;
-            letter-spacing: 0.5px;
-            line-height: 1.6;
-        }
-        
-        .hero-header {
-            background: linear-gradient(rgba(30, 60, 114, 0.7), rgba(42, 82, 152, 0.7)),
-                       url('https://images.unsplash.com/photo-1542362567-b07e54358753?ixlib=rb-4.0.3&auto=format&fit=crop&w=1350&q=80');
-            background-size: cover;
-            background-position: center;
-            padding: 3rem 2rem;
-            border-radius: 20px;
-            color: white;
-            text-align: center;
-            margin-bottom: 2rem;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-            position: relative;
-            overflow: hidden;
-            height: 200px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-        
-        .hero-header::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grain" width="100" height="100" patternUnits="userSpaceOnUse"><circle cx="50" cy="50" r="1" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23grain)"/></svg>');
-            opacity: 0.1;
-        }
-        
-        .hero-title {
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-            font-size: 3.5rem;
-            margin-bottom: 1rem;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            position: relative;
-            z-index: 1;
-            letter-spacing: 1px;
-        }
-        
-        .hero-subtitle {
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-            font-size: 1.3rem;
-            opacity: 0.9;
-            position: relative;
-            z-index: 1;
-            letter-spacing: 0.5px;
-        }
-        
-        .css-1d391kg {
-            background: linear-gradient(180deg, #2c3e50 0%, #34495e 100%);
-        }
-        
-        .sidebar-content {
-            background: white;
-            padding: 1.5rem;
-            border-radius: 15px;
-            margin: 1rem 0;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        .metric-card {
-            background: white;
-            padding: 2rem;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            margin: 1rem 0;
-            transition: transform 0.3s ease;
-            border-left: 5px solid #3498db;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        .metric-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 15px 40px rgba(0,0,0,0.15);
-        }
-        
-        .chart-container {
-            background: white;
-            padding: 2rem;
-            border-radius: 20px;
-            box-shadow: 0 15px 35px rgba(0,0,0,0.1);
-            margin: 2rem 0;
-            border: 1px solid rgba(0,0,0,0.05);
-            font-family: 'Cairo', sans-serif;
-        }
-        
-        .chart-title {
-            font-family: 'Cairo', sans-serif;
-            font-size: 1.5rem;
-            font-weight: 600;
-            color: #3498db !important;  /* تم تغيير اللون من blue إلى #3498db الأزرق الأوضح */
-            margin-bottom: 0.5rem;
-            padding-bottom: 0.5rem;
-            border-bottom: 2px solid #3498db;  /* تم تغيير لون الخط السفلي أيضاً إلى الأزرق */
-            letter-spacing: 0.5px;
-        }
-        
-        .chart-description {
-            font-family: 'Tajawal', sans-serif;
-            font-size: 1rem;
-            color: black;
-            margin-bottom: 1rem;
-            font-weight: 400;
-            line-height: 1.7;
-        }
-        
-        .upload-area {
-            background: white;
-            padding: 3rem 2rem;
-            border-radius: 20px;
-            box-shadow: 0 15px 35px rgba(0,0,0,0.1);
-            margin: 2rem 0;
-            text-align: center;
-            border: 2px dashed #3498db;
-            transition: all 0.3s ease;
-            font-family: 'Cairo', sans-serif;
-        }
-        
-        .upload-area:hover {
-            border-color: #e74c3c;
-            transform: translateY(-2px);
-        }
-        
-        .status-success {
-            background: linear-gradient(135deg, #27ae60, #2ecc71);
-            color: white;
-            padding: 1rem 2rem;
-            border-radius: 10px;
-            margin: 1rem 0;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 500;
-        }
-        
-        .status-warning {
-            background: linear-gradient(135deg, #f39c12, #e67e22);
-            color: white;
-            padding: 1rem 2rem;
-            border-radius: 10px;
-            margin: 1rem 0;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 500;
-        }
-        
-        .fault-table {
-            background: white;
-            padding: 2rem;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            margin: 2rem 0;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
+    st.markdown(f"<style>{build_stylesheet()}</style>", unsafe_allow_html=True)
 
-        .fault-table table {
-            width: 100%;
-            border-collapse: separate;
-            border-spacing: 0;
-        }
+def show_anomaly_warning(t):
+    latest_anomalies = st.session_state['anomaly_detector'].latest
+    if latest_anomalies:
+        st.warning(f"{t['anomaly_alert']} {', '.join(latest_anomalies)}")
 
-        .fault-table th {
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            padding: 12px;
-            font-weight: 800;
-            text-align: center;
-        }
+# Function to simulate data generation and send to API like  OBD-II ELM327
+@timed("simulate_data", rows=1)
+def simulate_data(t):
+    if st.session_state.get('simulator_on', False):
+        if INGEST_URL:
+            # The service owns ingestion; pull what it collected since the last tick
+            sync_from_service(st.session_state, get_ingest_client(INGEST_URL))
+            show_anomaly_warning(t)
+            return
+        with st.spinner("Generating simulated data..."):
+            if SIMULATOR_SCENARIO:
+                if 'scenario_engine' not in st.session_state:
+                    st.session_state['scenario_engine'] = ScenarioEngine(
+                        SIMULATOR_SCENARIO, seed=SIMULATOR_SEED, step_seconds=SIMULATOR_STEP_SECONDS
+                    )
+                new_data = st.session_state['scenario_engine'].generate(1, start_time=datetime.now())
+            else:
+                new_data = pd.DataFrame([generate_row()])
+            if not new_data.empty:
+                new_data = ingest_telemetry(st.session_state, new_data)
+                # The local early warning is shown before the API call, so a slow or down API cannot delay it
+                show_anomaly_warning(t)
 
-        .fault-table td {
-            padding: 12px;
-            border-bottom: 1px solid #e1e8ed;
-            text-align: center;
-            font-weight: 800;
-        }
+                # Send to API; a failed call still records placeholder predictions for the rows
+                records, status_code = predict_rows(new_data, FASTAPI_URL, PREDICTION_TIMEOUT)
+                ingest_predictions(st.session_state, records, first_position=int(new_data.index[0]))
+                # Report a failing API once per incident rather than on every refresh
+                if status_code != 200 and report_api_failure(st.session_state, status_code):
+                    st.error(f"{t['api_error']} {status_code}")
 
-        .fault-table tr:last-child td {
-            border-bottom: none;
-        }
+@st.cache_resource
+def get_ingest_client(url):
+    """One client per server process, so the shared-memory segment is mapped once"""
+    return IngestClient(url, segment_name=TELEMETRY_SHM, segment_path=TELEMETRY_SHM_PATH)
 
-        .fault-table tr:nth-child(even) {
-            background: #f8f9fa;
-        }
-        
-        .charts-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(600px, 1fr));
-            gap: 2rem;
-            margin: 2rem 0;
-        }
-        
-        .footer {
-            background: linear-gradient(135deg, #2c3e50, #34495e);
-            color: white;
-            padding: 2rem;
-            border-radius: 15px;
-            text-align: center;
-            margin-top: 3rem;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        @keyframes fadeInUp {
-            from {
-                opacity: 0;
-                transform: translateY(30px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        .fade-in-up {
-            animation: fadeInUp 0.6s ease-out;
-        }
-        
-        .rtl {
-            direction: rtl;
-            text-align: right;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        .stButton > button {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            border-radius: 25px;
-            padding: 0.75rem 2rem;
-            font-weight: 800;
-            transition: all 0.3s ease;
-            font-family: 'Cairo', sans-serif;
-            letter-spacing: 0.5px;
-        }
-        
-        .stButton > button:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 10px 20px rgba(0,0,0,0.2);
-        }
-        
-        .stSelectbox > div > div {
-            border-radius: 10px;
-            border: 2px solid #e1e8ed;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        .stMultiSelect > div > div {
-            border-radius: 10px;
-            border: 2px solid #e1e8ed;
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        h1, h2, h3, h4, h5, h6 {
-            font-family: 'Cairo', sans-serif !important;
-            font-weight: 800;
-            letter-spacing: 0.5px;
-            color: #3498db !important;  
-        }
-        
-        h1 {
-            font-weight: 800;
-        }
-        
-        p {
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-            line-height: 1.7;
-            letter-spacing: 0.3px;
-        }
-        
-        label {
-            font-family: 'Cairo', sans-serif !important;
-            font-weight: 800;
-        }
-        
-        .stDataFrame {
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        .metric-container .metric-label {
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        .metric-container .metric-value {
-            font-family: 'Cairo', sans-serif;
-            font-weight: 800;
-        }
-        
-        /* تم إضافة هذا التعديل لضمان تطبيق اللون الأزرق على العناوين في الشريط الجانبي */
-        .sidebar-content h2, .sidebar-content h3 {
-            color: #3498db !important;
-        }
-        
-        .metric-card h3 {
-            color: #3498db !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+@st.cache_resource
+def get_chart_generator(language):
+    """One stateless ChartGenerator per language, shared by all sessions"""
+    return ChartGenerator(language)
 
-def generate_row():
+def init_session_state():
+    """Create the per-session stores on first run"""
+    if 'lang_code' not in st.session_state:
+        st.session_state['lang_code'] = 'ar'
+    init_stores(st.session_state)
 
-    is_fault = random.random() > 0.85  # n% Fault
-    status = "Fault" if is_fault else "Normal"
+def render_live_data(t):
+    """Live fragment: ingestion, alerts and the prediction table"""
+    # Run simulation if enabled
+    if st.session_state.get('simulator_on', False):
+        simulate_data(t)
+
+        # Faster cadence during an ongoing fault, slower when the tab looks idle
+        update_fragment_interval(
+            "live",
+            st.session_state['telemetry_version'],
+            active_fault=st.session_state['alert_manager'].open_count() > 0,
+            full_run=st.session_state.get('full_page_run', False)
+        )
 
-    def choose(normal_range, fault_range, is_float=False, round_to=0):
-        if is_fault:
-            val = np.random.uniform(*fault_range) if is_float else np.random.randint(*fault_range)
+    # Alert episodes: one entry per incident instead of one per tick
+    alert_manager = st.session_state['alert_manager']
+    if alert_manager.events:
+        st.markdown(f"<h2 style='color: #3498db;'>{t['alerts_title']}</h2>", unsafe_allow_html=True)
+        vehicle_col, severity_col = st.columns(2)
+        with vehicle_col:
+            alert_vehicle = st.selectbox(
+                t['alert_vehicle'],
+                options=[t['all_types']] + alert_manager.vehicles(),
+                key="alert_vehicle_select"
+            )
+        with severity_col:
+            alert_severity = st.selectbox(
+                t['alert_severity'],
+                options=[t['all_types'], 'critical', 'warning'],
+                key="alert_severity_select"
+            )
+        episodes = alert_manager.query(
+            vehicle=None if alert_vehicle == t['all_types'] else alert_vehicle,
+            severity=None if alert_severity == t['all_types'] else alert_severity,
+            limit=10
+        )
+        if episodes:
+            st.dataframe(build_alert_table(episodes), use_container_width=True, hide_index=True)
         else:
-            val = np.random.uniform(*normal_range) if is_float else np.random.randint(*normal_range)
-        return round(val, round_to) if is_float else val
+            st.markdown(f'<div class="status-warning">{t["no_results"]}</div>', unsafe_allow_html=True)
 
-    return {
-        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "Engine_RPM": choose((900, 2000), (4000, 6000)),
-        "Coolant_Temp_C": choose((85, 95), (100, 120)),
-        "Oil_Temp_C": choose((80, 95), (110, 130)),
-        "Idle_Status": np.random.choice(["False", "True"], p=[0.8, 0.2]),
-        "Engine_Load_Percent": choose((25, 50), (80, 100)),
-        "Ignition_Timing_Deg": choose((5, 20), (-5, 0)),
-        "MAP_kPa": choose((30, 60), (80, 100)),
-        "MAF_gps": choose((5, 15), (60, 150), is_float=True, round_to=1),
-        "Battery_Voltage_V": choose((13.5, 14.2), (11.0, 12.0), is_float=True, round_to=1),
-        "Charging_System_Status": np.random.choice(["Normal", "Fault"], p=[0.9, 0.1]),
-        "O2_Sensor_V": choose((0.6, 0.8), (0.1, 0.2), is_float=True, round_to=2),
-        "Catalytic_Converter_Percent": choose((90, 99), (70, 80)),
-        "EGR_Status": np.random.choice(["Open", "Closed", "Stuck_Open"], p=[0.5, 0.4, 0.1]),
-        "Vehicle_Speed_kmh": choose((40, 90), (150, 200)),
-        "Transmission_Gear": np.random.choice(
-            ["P", "R", "N", "D", "1", "2", "3", "4", "5", "6"],
-            p=[0.1, 0.05, 0.05, 0.5, 0.05, 0.05, 0.07, 0.07, 0.04, 0.02]
-        ),
-        "Brake_Status": np.random.choice(["Released", "Engaged"], p=[0.85, 0.15]),
-        "Tire_Pressure_psi": choose((30, 34), (20, 26)),
-        "Ambient_Temp_C": choose((20, 30), (35, 40)),
-        "Battery_Age_Months": choose((6, 24), (48, 72), is_float=True, round_to=1),
-        "Fuel_Level_Percent": choose((50, 100), (0, 15)),
-        "Status": status
-    }
+    # Display prediction table: last 10 predictions or the paginated full history
+    prediction_store = st.session_state['prediction_store']
+    if not prediction_store.empty:
+        st.markdown(f"<h2 style='color: #3498db;'>{t['fault_types']}</h2>", unsafe_allow_html=True) 
+        fault_types = [t['all_types']] + prediction_store.fault_types()
+        selected_fault = st.selectbox(t['select_fault'], fault_types, key="fault_select")
+        fault_filter = None if selected_fault == t['all_types'] else selected_fault
+        
+        table_view = st.radio(
+            t['table_view'],
+            options=[t['last_ten'], t['full_history']],
+            horizontal=True,
+            key="table_view_select"
+        )
+        
+        if table_view == t['full_history']:
+            # Server-side slicing: only the requested page is materialized and sent
+            total = prediction_store.count(fault_filter)
+            page_col, size_col = st.columns(2)
+            with size_col:
+                page_size = st.selectbox(t['page_size'], options=[50, 100, 500], index=1, key="page_size_select")
+            page_count = max(1, -(-total // page_size))
+            with page_col:
+                page = st.number_input(t['page'], min_value=1, max_value=page_count, value=1, step=1, key="page_select")
+            # Page 1 holds the newest predictions
+            stop = total - (page - 1) * page_size
+            start = max(stop - page_size, 0)
+            filtered_df = prediction_store.slice(start, stop, fault=fault_filter).iloc[::-1]
+        else:
+            # Posting-list lookup: only the last 10 rows of the selected type are materialized
+            filtered_df = prediction_store.tail(10, fault=fault_filter)
+        
+        if not filtered_df.empty:
+            table_df = build_prediction_table(filtered_df)
+            if table_view == t['full_history']:
+                st.caption(t['showing_rows'].format(start=start + 1, stop=stop, total=total))
+                st.dataframe(table_df, use_container_width=True, hide_index=True, height=400)
+            else:
+                st.markdown('<div class="fault-table">', unsafe_allow_html=True)
+                st.table(table_df)
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with timed("export_csv.predictions", rows=len(table_df)):
+                csv = table_df.to_csv(index=False)
+            st.download_button(
+                label=t['download_results'],
+                data=csv,
+                file_name="fault_predictions.csv",
+                mime="text/csv",
+                key="download_button"
+            )
+        else:
+            st.markdown(f'<div class="status-warning">{t["no_results"]}</div>', unsafe_allow_html=True)
 
-# Function to simulate data generation and send to API like  OBD-II ELM327
-def simulate_data():
-    if st.session_state.get('simulator_on', False):
-        with st.spinner("Generating simulated data..."):
-            new_data = pd.DataFrame([generate_row()])
-            if not new_data.empty:
-                st.session_state['simulated_data'] = pd.concat([st.session_state['simulated_data'], new_data], ignore_index=True)
-                
-                # Send to API
-                files = {'file': ('simulated_data.csv', st.session_state['simulated_data'].tail(1).to_csv(index=False), 'text/csv')}
-                response = requests.post(FASTAPI_URL, files=files)
-                if response.status_code == 200 and response.json().get("status") == "success":
-                    new_prediction = pd.DataFrame(response.json()["results"])
-                    st.session_state['predictions'] = pd.concat([st.session_state['predictions'], new_prediction], ignore_index=True)
-                else:
-                    t = TRANSLATIONS[st.session_state['lang_code']]
-                    st.error(f"{t['api_error']} {response.status_code}")
+def render_live_charts(t, chart_generator, selected_charts, chart_height, time_window=None):
+    """Live fragment: the selected charts, or the placeholder cards when there is nothing to plot"""
+    # Display charts dynamically
+    telemetry_store = st.session_state['telemetry_store']
+    if not telemetry_store.empty and selected_charts:
+        time_range = telemetry_store.time_range()
+        window_start = time_range[1] - time_window if time_window and time_range else None
+        st.markdown(f'''
+        <div class="chart-container fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
+            <h2 class="chart-title">{t['vehicle_dashboard']}</h2>
+        </div>
+        ''', unsafe_allow_html=True)
+        
+        anomalies = st.session_state['anomaly_detector'].flagged_positions()
+        charts_per_row = 2
+        chart_rows = [selected_charts[i:i + charts_per_row] for i in range(0, len(selected_charts), charts_per_row)]
+        
+        for row in chart_rows:
+            cols = st.columns(len(row))
+            for i, chart_name in enumerate(row):
+                with cols[i]:
+                    placeholder_chart = st.empty()
+                    with placeholder_chart.container():
+                        result = chart_generator.create_chart(
+                            chart_name,
+                            None,
+                            chart_height,
+                            anomalies=anomalies,
+                            telemetry=telemetry_store,
+                            start=window_start
+                        )
+                        fig = result["fig"]
+                        description = result["description"]
+                        
+                        st.markdown(f'''
+                        <div class="chart-container fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
+                            <h3 class="chart-title">{chart_name}</h3>
+                            <p class="chart-description">{description}</p>
+                        </div>
+                        ''', unsafe_allow_html=True)
+                        
+                        if fig:
+                            with timed("render.plotly_chart"):
+                                st.plotly_chart(fig, use_container_width=True)
+                        else:
+                            st.error(f"Could not create chart: {chart_name}. Data missing or invalid.")
+
+    # Display quick statistics and charts if no charts selected
+    elif not telemetry_store.empty:
+        st.markdown(f'''
+        <div class="metric-card fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
+            <h3 style="text-align: center; color: #7f8c8d;">
+                {t['no_charts_selected']}
+            </h3>
+            <p style="text-align: center;">{t['select_charts']}</p>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    # Welcome message if no data
+    else:
+        st.markdown(f'''
+        <div class="upload-area fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
+            <h2 style="color: #2c3e50;">{t.get('welcome', 'Welcome to Vehicle Analytics')}</h2>
+            <p style="color: #7f8c8d; font-size: 1.1rem;">
+                {t.get('welcome', 'Welcome to Vehicle Analytics')}
+            </p>
+            <br>
+        </div>
+        ''', unsafe_allow_html=True)
 
 def main():
     load_css()
+    start_metrics_server()
     
-    # Initialize session state
-    if 'lang_code' not in st.session_state:
-        st.session_state['lang_code'] = 'ar'
-    if 'simulated_data' not in st.session_state:
-        st.session_state['simulated_data'] = pd.DataFrame(columns=[
-            'Timestamp', 'Engine_RPM', 'Coolant_Temp_C', 'Oil_Temp_C', 'Idle_Status',
-            'Engine_Load_Percent', 'Ignition_Timing_Deg', 'MAP_kPa', 'MAF_gps',
-            'Battery_Voltage_V', 'Charging_System_Status', 'O2_Sensor_V',
-            'Catalytic_Converter_Percent', 'EGR_Status', 'Vehicle_Speed_kmh',
-            'Transmission_Gear', 'Brake_Status', 'Tire_Pressure_psi', 'Ambient_Temp_C',
-            'Battery_Age_Months', 'Fuel_Level_Percent', 'Status'
-        ])
-    if 'predictions' not in st.session_state:
-        st.session_state['predictions'] = pd.DataFrame(columns=['Recording', 'Predicted_Fault', 'Prediction_Message'])
-
-    # Auto-refresh when simulator is on
-    if st.session_state.get('simulator_on', False):
-        st_autorefresh(interval=5000, key="data_refresh")  # Refresh every 5 seconds
+    init_session_state()
 
     # Sidebar settings
     with st.sidebar:
@@ -538,7 +407,7 @@ def main():
         chart_height = size_mapping[chart_size]
         
         st.markdown(f"<h3 style='color: #3498db;'>📈{t['chart_selection']}</h3>", unsafe_allow_html=True)  
-        chart_generator = ChartGenerator(st.session_state['lang_code'])
+        chart_generator = get_chart_generator(st.session_state['lang_code'])
         available_charts = chart_generator.get_available_charts()
         
         selected_charts = st.multiselect(
@@ -549,10 +418,31 @@ def main():
             help="Select multiple charts to display"
         )
         
+        # Long windows are drawn from the telemetry rollups (see TelemetryStore.timeline)
+        time_windows = {
+            t['all_time']: None,
+            t['last_15m']: 15 * 60,
+            t['last_1h']: 60 * 60,
+            t['last_6h']: 6 * 60 * 60,
+            t['last_24h']: 24 * 60 * 60
+        }
+        time_range = st.selectbox(
+            t['time_range'],
+            options=list(time_windows),
+            index=0,
+            key="time_range_select"
+        )
+        
         st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
     
+    if diagnostics_enabled():
+        render_diagnostics_panel(storage={
+            "telemetry": st.session_state['telemetry_store'],
+            "predictions": st.session_state['prediction_store']
+        })
+    
     # Main header
     st.markdown(f'''
     <div class="hero-header fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
@@ -562,100 +452,15 @@ def main():
     ''', unsafe_allow_html=True)
     
 
-    # Run simulation if enabled
-    if st.session_state.get('simulator_on', False):
-        simulate_data()
-
-    # Display prediction table for last 10 predictions
-    if not st.session_state['predictions'].empty:
-        st.markdown(f"<h2 style='color: #3498db;'>{t['fault_types']}</h2>", unsafe_allow_html=True) 
-        fault_types = [t['all_types']] + list(st.session_state['predictions']['Predicted_Fault'].unique())
-        selected_fault = st.selectbox(t['select_fault'], fault_types, key="fault_select")
-        
-        if selected_fault != t['all_types']:
-            filtered_df = st.session_state['predictions'][st.session_state['predictions']['Predicted_Fault'] == selected_fault].tail(10)
-        else:
-            filtered_df = st.session_state['predictions'].tail(10)
-        
-        if not filtered_df.empty:
-            table_data = []
-            for idx, row in filtered_df.iterrows():
-                table_data.append({
-                    'Recording': f"{idx + 1}",
-                    'Predicted_Fault': row['Predicted_Fault'], 
-                    'Prediction_Message': row['Prediction_Message']  
-                })
-            table_df = pd.DataFrame(table_data)
-            st.markdown('<div class="fault-table">', unsafe_allow_html=True)
-            st.table(table_df)
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            csv = table_df.to_csv(index=False)
-            st.download_button(
-                label=t['download_results'],
-                data=csv,
-                file_name="fault_predictions.csv",
-                mime="text/csv",
-                key="download_button"
-            )
-        else:
-            st.markdown(f'<div class="status-warning">{t["no_results"]}</div>', unsafe_allow_html=True)
-
-    # Display charts dynamically
-    if not st.session_state['simulated_data'].empty and 'selected_charts' in locals() and selected_charts:
-        st.markdown(f'''
-        <div class="chart-container fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
-            <h2 class="chart-title">{t['vehicle_dashboard']}</h2>
-        </div>
-        ''', unsafe_allow_html=True)
-        
-        charts_per_row = 2
-        chart_rows = [selected_charts[i:i + charts_per_row] for i in range(0, len(selected_charts), charts_per_row)]
-        
-        for row in chart_rows:
-            cols = st.columns(len(row))
-            for i, chart_name in enumerate(row):
-                with cols[i]:
-                    placeholder_chart = st.empty()
-                    with placeholder_chart.container():
-                        result = chart_generator.create_chart(chart_name, st.session_state['simulated_data'], chart_height)
-                        fig = result["fig"]
-                        description = result["description"]
-                        
-                        st.markdown(f'''
-                        <div class="chart-container fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
-                            <h3 class="chart-title">{chart_name}</h3>
-                            <p class="chart-description">{description}</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
-                        
-                        if fig:
-                            st.plotly_chart(fig, use_container_width=True)
-                        else:
-                            st.error(f"Could not create chart: {chart_name}. Data missing or invalid.")
-
-    # Display quick statistics and charts if no charts selected
-    elif not st.session_state['simulated_data'].empty:
-        st.markdown(f'''
-        <div class="metric-card fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
-            <h3 style="text-align: center; color: #7f8c8d;">
-                {t['no_charts_selected']}
-            </h3>
-            <p style="text-align: center;">{t['select_charts']}</p>
-        </div>
-        ''', unsafe_allow_html=True)
-    
-    # Welcome message if no data
-    else:
-        st.markdown(f'''
-        <div class="upload-area fade-in-up {'rtl' if st.session_state['lang_code'] == 'ar' else ''}">
-            <h2 style="color: #2c3e50;">{t.get('welcome', 'Welcome to Vehicle Analytics')}</h2>
-            <p style="color: #7f8c8d; font-size: 1.1rem;">
-                {t.get('welcome', 'Welcome to Vehicle Analytics')}
-            </p>
-            <br>
-        </div>
-        ''', unsafe_allow_html=True)
+    # Live sections are fragments: each tick reruns only them, while the CSS,
+    # sidebar, header and footer are emitted on full-page runs only
+    run_every = fragment_run_every("live") if st.session_state.get('simulator_on', False) else None
+    st.session_state['full_page_run'] = True
+    st.fragment(render_live_data, run_every=run_every)(t)
+    st.fragment(render_live_charts, run_every=run_every)(
+        t, chart_generator, selected_charts, chart_height, time_windows[time_range]
+    )
+    st.session_state['full_page_run'] = False
     
     # Footer
     st.markdown(f'''
@@ -666,4 +471,4 @@ def main():
     ''', unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
+    run_page(main)
@@ -0,0 +1,172 @@
+import itertools
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+DEFAULT_VEHICLE_ID = "ELM327-01"
+NORMAL_LABELS = {"Normal", "No Fault", "No_Fault", "None", ""}
+SEVERITY_RANK = {"info": 0, "warning": 1, "critical": 2}
+
+
+class AlertManager:
+    """Turns per-row fault signals into debounced, deduplicated alert episodes
+
+    An episode is keyed by (vehicle, source, subject), e.g.
+    ("ELM327-01", "threshold", "Coolant_Temp_C"). It opens once the signal has
+    been seen `debounce` times within `clear_after` seconds, absorbs repeats
+    while open, and closes when the signal clears or goes quiet.
+    """
+
+    def __init__(self, debounce=2, clear_after=30.0, max_events=200):
+        self.debounce = debounce
+        self.clear_after = clear_after
+        self.events = deque(maxlen=max_events)
+        self._open = {}
+        self._pending = {}
+        self._ids = itertools.count(1)
+
+    def observe(self, vehicle, source, subject, severity, now=None, position=None, debounce=None):
+        """Record one occurrence of a fault signal; return the episode if this opened it"""
+        now = time.time() if now is None else now
+        key = (vehicle, source, subject)
+
+        episode = self._open.get(key)
+        if episode is not None:
+            episode["count"] += 1
+            episode["last_seen"] = now
+            if SEVERITY_RANK[severity] > SEVERITY_RANK[episode["severity"]]:
+                episode["severity"] = severity
+            return None
+
+        pending = self._pending.get(key)
+        if pending is None or now - pending["last_seen"] > self.clear_after:
+            pending = self._pending[key] = {"count": 0, "first_seen": now, "position": position, "severity": severity}
+        pending["count"] += 1
+        pending["last_seen"] = now
+        if SEVERITY_RANK[severity] > SEVERITY_RANK[pending["severity"]]:
+            pending["severity"] = severity
+
+        if pending["count"] < (self.debounce if debounce is None else debounce):
+            return None
+
+        del self._pending[key]
+        episode = {
+            "id": next(self._ids),
+            "vehicle": vehicle,
+            "source": source,
+            "subject": subject,
+            "severity": pending["severity"],
+            "status": "open",
+            "opened_at": pending["first_seen"],
+            "last_seen": now,
+            "closed_at": None,
+            "count": pending["count"],
+            "position": pending["position"]
+        }
+        self._open[key] = episode
+        self.events.append(episode)
+        return episode
+
+    def clear(self, vehicle, source, subject, now=None):
+        """Close the episode for a signal that has returned to normal"""
+        key = (vehicle, source, subject)
+        self._pending.pop(key, None)
+        episode = self._open.pop(key, None)
+        if episode is not None:
+            episode["status"] = "closed"
+            episode["closed_at"] = time.time() if now is None else now
+        return episode
+
+    def expire(self, now=None):
+        """Close episodes and drop pending signals not seen for clear_after seconds"""
+        now = time.time() if now is None else now
+        for key, episode in list(self._open.items()):
+            if now - episode["last_seen"] > self.clear_after:
+                self.clear(*key, now=episode["last_seen"])
+        for key, pending in list(self._pending.items()):
+            if now - pending["last_seen"] > self.clear_after:
+                del self._pending[key]
+
+    def ingest_predictions(self, results, vehicle=DEFAULT_VEHICLE_ID, now=None, first_position=None):
+        """Feed model predictions (list of dicts); non-normal labels become fault signals"""
+        opened = []
+        for offset, record in enumerate(results):
+            fault = record.get("Predicted_Fault")
+            if fault is None or str(fault) in NORMAL_LABELS:
+                continue
+            position = None if first_position is None else first_position + offset
+            episode = self.observe(vehicle, "prediction", str(fault), "critical", now=now, position=position)
+            if episode is not None:
+                opened.append(episode)
+        return opened
+
+    def ingest_rule_events(self, events, vehicle=DEFAULT_VEHICLE_ID, now=None):
+        """Feed RuleEngine transitions; the engine already applies minimum duration"""
+        opened = []
+        for event in events:
+            if event["severity"] == "normal":
+                self.clear(vehicle, "threshold", event["column"], now=now)
+                continue
+            episode = self.observe(vehicle, "threshold", event["column"], event["severity"],
+                                   now=now, position=event["position"], debounce=1)
+            if episode is not None:
+                opened.append(episode)
+        return opened
+
+    def hold_rule_state(self, severities, vehicle=DEFAULT_VEHICLE_ID, now=None, position=None):
+        """Keep threshold episodes open while their column is still out of range
+
+        RuleEngine only reports transitions, so a sustained breach sends
+        nothing after it opens; without this its episode would expire after
+        clear_after seconds while the sensor is still critical. A breach whose
+        episode expired while ingestion was paused is reopened.
+        """
+        now = time.time() if now is None else now
+        for column, severity in severities.items():
+            if severity == "normal":
+                continue
+            episode = self._open.get((vehicle, "threshold", column))
+            if episode is None:
+                self.observe(vehicle, "threshold", column, severity, now=now, position=position, debounce=1)
+            else:
+                episode["last_seen"] = now
+
+    def vehicles(self):
+        return sorted({episode["vehicle"] for episode in self.events})
+
+    def query(self, vehicle=None, severity=None, status=None, limit=None):
+        """Return logged episodes, newest first, filtered by vehicle, severity and status"""
+        matches = []
+        for episode in reversed(self.events):
+            if vehicle is not None and episode["vehicle"] != vehicle:
+                continue
+            if severity is not None and episode["severity"] != severity:
+                continue
+            if status is not None and episode["status"] != status:
+                continue
+            matches.append(episode)
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def open_count(self):
+        return len(self._open)
+
+
+def build_alert_table(episodes):
+    """Build the display table for a list of alert episodes"""
+    def fmt(ts):
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") if ts else ""
+
+    return pd.DataFrame({
+        "Vehicle": [e["vehicle"] for e in episodes],
+        "Severity": [e["severity"] for e in episodes],
+        "Source": [e["source"] for e in episodes],
+        "Subject": [e["subject"] for e in episodes],
+        "Status": [e["status"] for e in episodes],
+        "Opened": [fmt(e["opened_at"]) for e in episodes],
+        "Closed": [fmt(e["closed_at"]) for e in episodes],
+        "Occurrences": [e["count"] for e in episodes]
+    })
@@ -0,0 +1,124 @@
+import math
+from collections import deque
+
+import numpy as np
+
+SENSOR_COLUMNS = [
+    'Engine_RPM', 'Coolant_Temp_C', 'Oil_Temp_C', 'Engine_Load_Percent',
+    'Ignition_Timing_Deg', 'MAP_kPa', 'MAF_gps', 'Battery_Voltage_V',
+    'O2_Sensor_V', 'Catalytic_Converter_Percent', 'Vehicle_Speed_kmh',
+    'Tire_Pressure_psi', 'Ambient_Temp_C', 'Fuel_Level_Percent'
+]
+
+
+class RollingWindow:
+    """Fixed-size ring buffer keeping a running sum and sum of squares"""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = np.zeros(size)
+        self.count = 0
+        self.position = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value):
+        if self.count == self.size:
+            old = self.values[self.position]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        self.values[self.position] = value
+        self.total += value
+        self.total_sq += value * value
+        self.position = (self.position + 1) % self.size
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def std(self):
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class StreamingAnomalyDetector:
+    """Per-sensor rolling z-score, EWMA and CUSUM detectors, updated in O(1) per row"""
+
+    def __init__(self, columns=None, window=60, warmup=10, z_threshold=3.0,
+                 ewma_alpha=0.2, ewma_limit=3.0, cusum_k=0.5, cusum_h=5.0, max_flags=1000):
+        self.columns = list(columns or SENSOR_COLUMNS)
+        self.warmup = warmup
+        self.z_threshold = z_threshold
+        self.ewma_alpha = ewma_alpha
+        # Control limit of the EWMA statistic in units of the window standard deviation
+        self.ewma_limit = ewma_limit * math.sqrt(ewma_alpha / (2 - ewma_alpha))
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.rows_seen = 0
+
+        self._windows = {column: RollingWindow(window) for column in self.columns}
+        self._ewma = {column: None for column in self.columns}
+        self._cusum = {column: [0.0, 0.0] for column in self.columns}
+        # Flagged row positions per column, bounded so long sessions do not grow without limit
+        self._flags = {column: deque(maxlen=max_flags) for column in self.columns}
+        self.latest = {}
+
+    def update(self, row):
+        """Score one telemetry row and return {column: [detector names]} for flagged sensors"""
+        position = self.rows_seen
+        self.rows_seen += 1
+        flagged = {}
+
+        for column in self.columns:
+            value = row.get(column)
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            value = float(value)
+            window = self._windows[column]
+            mean, std = window.mean(), window.std()
+            reasons = []
+
+            # Scores are computed against the window before the new value is added
+            if window.count >= self.warmup and std > 0:
+                deviation = (value - mean) / std
+                if abs(deviation) > self.z_threshold:
+                    reasons.append('zscore')
+
+                ewma = self._ewma[column]
+                ewma = value if ewma is None else self.ewma_alpha * value + (1 - self.ewma_alpha) * ewma
+                self._ewma[column] = ewma
+                if abs(ewma - mean) > self.ewma_limit * std:
+                    reasons.append('ewma')
+
+                cusum = self._cusum[column]
+                cusum[0] = max(0.0, cusum[0] + deviation - self.cusum_k)
+                cusum[1] = max(0.0, cusum[1] - deviation - self.cusum_k)
+                if cusum[0] > self.cusum_h or cusum[1] > self.cusum_h:
+                    reasons.append('cusum')
+                    cusum[0] = cusum[1] = 0.0
+            else:
+                self._ewma[column] = value
+
+            window.push(value)
+
+            if reasons:
+                self._flags[column].append(position)
+                flagged[column] = reasons
+
+        self.latest = flagged
+        return flagged
+
+    def update_many(self, rows):
+        """Score a batch of rows (DataFrame or list of dicts) in arrival order"""
+        if hasattr(rows, 'to_dict'):
+            rows = rows.to_dict('records')
+        return [self.update(row) for row in rows]
+
+    def flagged_positions(self, column=None):
+        """Return flagged row positions, for one column or {column: positions} for all"""
+        if column is not None:
+            return list(self._flags.get(column, ()))
+        return {column: list(flags) for column, flags in self._flags.items() if flags}
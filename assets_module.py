@@ -0,0 +1,107 @@
+import hashlib
+import os
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# Files under static/ are served by Streamlit at app/static/ (server.enableStaticServing)
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+STATIC_URL = "app/static"
+STYLESHEET = STATIC_DIR / "css" / "dashboard.css"
+FONTS_DIR = STATIC_DIR / "fonts"
+FONTS_CSS = FONTS_DIR / "fonts.css"
+HERO_IMAGE = STATIC_DIR / "img" / "hero.jpg"
+
+FONT_FAMILIES = {
+    "Montserrat": [300, 400, 500, 600, 700],
+    "Tajawal": [200, 300, 400, 500, 700, 800, 900],
+    "Almarai": [300, 400, 700, 800],
+    "Cairo": [300, 400, 500, 600, 700, 800]
+}
+# ASSET_CDN_FALLBACK=1 loads fonts and the hero photo from Google Fonts and Unsplash while
+# they are not vendored; by default the page makes no external request and falls back to
+# the font stacks and the header gradient
+ASSET_CDN_FALLBACK = os.environ.get("ASSET_CDN_FALLBACK") == "1"
+HERO_IMAGE_SOURCE = "https://images.unsplash.com/photo-1542362567-b07e54358753?ixlib=rb-4.0.3&auto=format&fit=crop&w=1350&q=80"
+# Google Fonts serves woff2 only to user agents it knows support it
+WOFF2_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+_QUOTED = r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')"
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace, leaving quoted strings untouched"""
+    css = re.sub(_QUOTED + r"|/\*.*?\*/", lambda m: m.group(1) or "", css, flags=re.S)
+    css = re.sub(_QUOTED + r"|\s+", lambda m: m.group(1) or " ", css)
+    css = re.sub(_QUOTED + r"|\s*([{};,>])\s*|:\s+",
+                 lambda m: m.group(1) or m.group(2) or ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def font_stylesheet_url(family, weights):
+    return f"https://fonts.googleapis.com/css2?family={family}:wght@{';'.join(map(str, weights))}&display=swap"
+
+
+def asset_url(path):
+    """URL of a static file, versioned by its content so a changed file is never served stale"""
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()[:12]
+    return f"{STATIC_URL}/{path.relative_to(STATIC_DIR).as_posix()}?v={digest}"
+
+
+@lru_cache(maxsize=1)
+def build_stylesheet():
+    """Minified dashboard CSS with self-hosted fonts and hero photo, when present
+
+    The files are vendored into static/ with `python assets_module.py`.
+    Without them the fonts fall back through each font stack and the header
+    keeps its gradient, unless ASSET_CDN_FALLBACK loads them from the CDNs.
+    """
+    parts = []
+    if FONTS_CSS.exists():
+        parts.append(FONTS_CSS.read_text(encoding="utf-8"))
+    elif ASSET_CDN_FALLBACK:
+        # @import rules must come before every other rule of the stylesheet
+        parts.extend(f"@import url('{font_stylesheet_url(family, weights)}');"
+                     for family, weights in FONT_FAMILIES.items())
+    parts.append(STYLESHEET.read_text(encoding="utf-8"))
+    hero_url = asset_url(HERO_IMAGE) if HERO_IMAGE.exists() else HERO_IMAGE_SOURCE
+    if HERO_IMAGE.exists() or ASSET_CDN_FALLBACK:
+        parts.append(
+            ".hero-header { background-image: linear-gradient(rgba(30, 60, 114, 0.7), rgba(42, 82, 152, 0.7)), "
+            f"url('{hero_url}'); }}"
+        )
+    return minify_css("\n".join(parts))
+
+
+def fetch_assets():
+    """Download the fonts and hero photo into static/ (run once, then commit or bake into the image)"""
+    import requests
+
+    FONTS_DIR.mkdir(parents=True, exist_ok=True)
+    rules = []
+    for family, weights in FONT_FAMILIES.items():
+        url = font_stylesheet_url(family, weights)
+        response = requests.get(url, headers={"User-Agent": WOFF2_USER_AGENT}, timeout=30)
+        response.raise_for_status()
+        css = response.text
+        for source in sorted(set(re.findall(r"url\((https://[^)]+)\)", css))):
+            font = requests.get(source, timeout=30)
+            font.raise_for_status()
+            path = FONTS_DIR / f"{family}-{hashlib.sha1(font.content).hexdigest()[:12]}.woff2"
+            path.write_bytes(font.content)
+            css = css.replace(source, f"{STATIC_URL}/fonts/{path.name}")
+        rules.append(css)
+        print(f"{family}: {len(weights)} weights", file=sys.stderr)
+    FONTS_CSS.write_text("\n".join(rules), encoding="utf-8")
+
+    HERO_IMAGE.parent.mkdir(parents=True, exist_ok=True)
+    response = requests.get(HERO_IMAGE_SOURCE, timeout=30)
+    response.raise_for_status()
+    HERO_IMAGE.write_bytes(response.content)
+    print(f"hero image: {len(response.content)} bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # python assets_module.py  ->  vendor the fonts and hero photo into static/
+    fetch_assets()
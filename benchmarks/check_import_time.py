@@ -0,0 +1,81 @@
+"""Import-time budget check for the Streamlit pages.
+
+Each page is executed once in a fresh interpreter under `python -X importtime`
+(the `if __name__ == "__main__"` block does not run, so only module-level code
+and imports are measured). The check fails when
+
+- a module that must load lazily (plotly.express, requests, ...) is imported, or
+- the total import time exceeds the budget (median of --repeat runs).
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget-ms 1200 --repeat 5
+
+Exits with status 1 on any violation.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["Fault-Dashboard.py", "pages/ELM327-Analytics.py"]
+# Heavy modules that no page may import before they are used
+DEFERRED_MODULES = ["plotly.express", "plotly.subplots", "requests", "streamlit_autorefresh"]
+DEFAULT_BUDGET_MS = int(os.environ.get("IMPORT_BUDGET_MS", 1500))
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_page(page):
+    """Return (total import seconds, set of imported module names) for one page"""
+    code = f"import runpy, sys; sys.path.insert(0, {str(ROOT)!r}); runpy.run_path({str(ROOT / page)!r})"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed to load:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules.add(name)
+        # Only top-level entries: nested ones are already part of their parent's cumulative time
+        if len(indent) == 1:
+            total_us += cumulative
+    return total_us / 1e6, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the dashboard pages")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="maximum total import time per page (default: IMPORT_BUDGET_MS or 1500)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page (median is compared)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for page in PAGES:
+        runs = [measure_page(page) for _ in range(args.repeat)]
+        seconds = statistics.median(total for total, _ in runs)
+        imported = sorted(set(DEFERRED_MODULES) & runs[0][1])
+        print(f"{page:<40} {seconds * 1000:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+
+        if seconds * 1000 > args.budget_ms:
+            failures.append(f"{page}: {seconds * 1000:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        for module in imported:
+            failures.append(f"{page}: imports {module} at load time; it must be imported lazily")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+"""Headless performance benchmarks for ingestion, prediction and chart rendering.
+
+Runs without a browser or network: Streamlit calls execute in bare mode and
+the prediction API is replaced by benchmarks/stub_server.py.
+
+    python benchmarks/run_benchmarks.py                       # full run, compare to baseline
+    python benchmarks/run_benchmarks.py --sizes 1000 10000    # quick run
+    python benchmarks/run_benchmarks.py --save-baseline       # refresh the stored baseline
+    python benchmarks/check_import_time.py                    # cold-start import budget
+
+Results are written as JSON (stdout or --output). When a baseline exists,
+every benchmark slower than baseline * (1 + tolerance) is reported and the
+process exits with status 1. Each timed run is divided by a short fixed
+calibration workload run just before it, and a benchmark that looks slower is
+re-measured (--retries) before it counts, so a machine that is busier or
+slower for a while does not read as a regression.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+HISTORY_SIZES = [100, 10_000, 100_000]
+PREDICT_BATCH_SIZES = [1, 1_000, 10_000]
+# Differences below this are timer noise, never regressions
+MIN_REGRESSION_SECONDS = 0.002
+# Wait before re-measuring a benchmark that looked slower than its baseline
+RETRY_PAUSE_SECONDS = 5
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+
+def load_script(path, name):
+    """Import a Streamlit script (e.g. Fault-Dashboard.py) as a module"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_telemetry(n, seed=0):
+    """Vectorized synthetic telemetry with the same schema and ranges as generate_row()"""
+    rng = np.random.default_rng(seed)
+    is_fault = rng.random(n) > 0.85
+
+    def choose(normal_range, fault_range, is_float=False, round_to=0):
+        if is_float:
+            values = np.where(is_fault, rng.uniform(*fault_range, n), rng.uniform(*normal_range, n))
+            return np.round(values, round_to)
+        return np.where(is_fault, rng.integers(*fault_range, n), rng.integers(*normal_range, n))
+
+    timestamps = pd.date_range(end=datetime.now(), periods=n, freq="5s")
+    return pd.DataFrame({
+        "Timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+        "Engine_RPM": choose((900, 2000), (4000, 6000)),
+        "Coolant_Temp_C": choose((85, 95), (100, 120)),
+        "Oil_Temp_C": choose((80, 95), (110, 130)),
+        "Idle_Status": rng.choice(["False", "True"], n, p=[0.8, 0.2]),
+        "Engine_Load_Percent": choose((25, 50), (80, 100)),
+        "Ignition_Timing_Deg": choose((5, 20), (-5, 0)),
+        "MAP_kPa": choose((30, 60), (80, 100)),
+        "MAF_gps": choose((5, 15), (60, 150), is_float=True, round_to=1),
+        "Battery_Voltage_V": choose((13.5, 14.2), (11.0, 12.0), is_float=True, round_to=1),
+        "Charging_System_Status": rng.choice(["Normal", "Fault"], n, p=[0.9, 0.1]),
+        "O2_Sensor_V": choose((0.6, 0.8), (0.1, 0.2), is_float=True, round_to=2),
+        "Catalytic_Converter_Percent": choose((90, 99), (70, 80)),
+        "EGR_Status": rng.choice(["Open", "Closed", "Stuck_Open"], n, p=[0.5, 0.4, 0.1]),
+        "Vehicle_Speed_kmh": choose((40, 90), (150, 200)),
+        "Transmission_Gear": rng.choice(
+            ["P", "R", "N", "D", "1", "2", "3", "4", "5", "6"], n,
+            p=[0.1, 0.05, 0.05, 0.5, 0.05, 0.05, 0.07, 0.07, 0.04, 0.02]
+        ),
+        "Brake_Status": rng.choice(["Released", "Engaged"], n, p=[0.85, 0.15]),
+        "Tire_Pressure_psi": choose((30, 34), (20, 26)),
+        "Ambient_Temp_C": choose((20, 30), (35, 40)),
+        "Battery_Age_Months": choose((6, 24), (48, 72), is_float=True, round_to=1),
+        "Fuel_Level_Percent": choose((50, 100), (0, 15)),
+        "Status": np.where(is_fault, "Fault", "Normal")
+    })
+
+
+CALIBRATION_DATA = np.random.default_rng(0).random(100_000)
+
+
+def calibrate():
+    """Wall time of a small fixed NumPy + Python workload; tracks the machine's current speed"""
+    start = time.perf_counter()
+    np.sort(CALIBRATION_DATA)
+    sum(i * i for i in range(50_000))
+    return time.perf_counter() - start
+
+
+def measure(fn, repeat=5, setup=None):
+    """Run fn once untimed (imports, caches), then `repeat` times
+
+    Returns the per-run wall times and the calibration times taken just
+    before each run (best of three), in seconds.
+    """
+    times, calibrations = [], []
+    for run in range(repeat + 1):
+        if setup is not None:
+            setup()
+        calibration = min(calibrate() for _ in range(3))
+        start = time.perf_counter()
+        fn()
+        if run:
+            times.append(time.perf_counter() - start)
+            calibrations.append(calibration)
+    return times, calibrations
+
+
+class BenchmarkRun:
+    def __init__(self, repeat, baseline=None, tolerance=0.35, retries=0):
+        self.repeat = repeat
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.retries = retries
+        self.results = {}
+
+    def record(self, name, fn, rows=None, repeat=None, setup=None):
+        result = self._measure(fn, rows, repeat, setup)
+        for _ in range(self.retries if self.baseline else 0):
+            if not compare({name: result}, self.baseline, self.tolerance):
+                break
+            # A slow spell on the machine passes; a real regression is still there
+            time.sleep(RETRY_PAUSE_SECONDS)
+            retry = self._measure(fn, rows, repeat, setup)
+            if retry["normalized"] < result["normalized"]:
+                result = retry
+        self.results[name] = result
+        print(f"{name:<60} {result['seconds'] * 1000:10.2f} ms", file=sys.stderr)
+
+    def _measure(self, fn, rows, repeat, setup):
+        times, calibrations = measure(fn, repeat or self.repeat, setup)
+        median = statistics.median(times)
+        return {
+            "seconds": median,
+            "min_seconds": min(times),
+            # Median run time in units of the calibration workload
+            "normalized": statistics.median(t / c for t, c in zip(times, calibrations)),
+            "runs": len(times),
+            "rows": rows,
+            "rows_per_sec": rows / median if rows and median > 0 else None
+        }
+
+
+def bench_generate_row(run, dashboard):
+    from scenario_module import ScenarioEngine
+
+    count = 2_000
+    run.record("generate_row", lambda: [dashboard.generate_row() for _ in range(count)], rows=count)
+
+    # A live single-vehicle tick, then a 1000-vehicle fleet over 1000 steps
+    engine = ScenarioEngine("overheating", seed=0)
+    run.record("scenario.tick", lambda: engine.generate(1), rows=1)
+    fleet = ScenarioEngine("mixed_fleet", vehicles=1_000, seed=0)
+    run.record("scenario.fleet.1000x1000", lambda: fleet.generate(1_000), rows=1_000_000)
+
+
+def bench_simulate_data(run, dashboard, predict_url):
+    import streamlit as st
+
+    dashboard.FASTAPI_URL = predict_url
+    for history in HISTORY_SIZES:
+        base = make_telemetry(history, seed=history)
+        # A steady-state session has a prediction for every stored row
+        predictions = pd.DataFrame({"Recording": range(history), "Predicted_Fault": "No Fault", "Prediction_Message": ""})
+
+        def setup():
+            st.session_state.clear()
+            dashboard.init_session_state()
+            st.session_state["telemetry_store"].append(base.copy())
+            st.session_state["prediction_store"].append(predictions)
+            st.session_state["simulator_on"] = True
+            st.session_state["lang_code"] = "en"
+
+        run.record(f"simulate_data.history_{history}", lambda: dashboard.simulate_data(dashboard.TRANSLATIONS["en"]),
+                   rows=1, repeat=max(run.repeat, 5), setup=setup)
+
+
+def bench_predict(run, predict_url):
+    from ingest_module import PredictionClient
+
+    for size in PREDICT_BATCH_SIZES:
+        batch = make_telemetry(size, seed=size)
+        for batch_format in ("csv", "arrow"):
+            client = PredictionClient(predict_url, batch_format, binary_min_rows=0)
+            run.record(f"predict_call.{batch_format}.{size}", lambda: client.predict(batch), rows=size)
+
+    # 10k telemetry rows arriving 100 at a time, dispatched 1 and 4 requests at once
+    rows = make_telemetry(10_000, seed=0)
+    for concurrency in (1, 4):
+        run.record(f"predict_dispatch.c{concurrency}.{len(rows)}",
+                   lambda: dispatch_all(PredictionClient(predict_url), rows, concurrency), rows=len(rows))
+
+
+def dispatch_all(client, rows, concurrency, piece_rows=100):
+    from dispatch_module import PredictionDispatcher
+
+    dispatcher = PredictionDispatcher(client, concurrency, batch_rows=1_000).start()
+    try:
+        for start in range(0, len(rows), piece_rows):
+            dispatcher.submit(rows.iloc[start:start + piece_rows])
+        predicted = 0
+        while predicted < len(rows):
+            predicted += sum(len(records) for _, records, _ in dispatcher.completed())
+            time.sleep(0.001)
+    finally:
+        dispatcher.stop()
+
+
+def bench_charts(run, sizes):
+    from charts_module import ChartGenerator
+
+    generator = ChartGenerator("en")
+    for size in sizes:
+        data = make_telemetry(size, seed=size)
+        for chart_name, config in generator.get_available_charts().items():
+            method = config["function"].__name__.lstrip("_")
+            run.record(f"chart.{method}.{size}", lambda: generator.create_chart(chart_name, data, 400), rows=size)
+
+
+def bench_telemetry(run, sizes):
+    from charts_module import ChartGenerator
+    from telemetry_module import TelemetryStore
+
+    generator = ChartGenerator("en")
+    timeline = next(name for name, config in generator.get_available_charts().items()
+                    if config["method"] == "_create_rpm_timeline")
+    for size in sizes:
+        data = make_telemetry(size, seed=size)
+        store = TelemetryStore()
+        run.record(f"telemetry.append.{size}", lambda: TelemetryStore().append(data), rows=size)
+        store.append(data)
+        run.record(
+            f"telemetry.timeline_chart.{size}",
+            lambda: generator.create_chart(timeline, None, 400, telemetry=store),
+            rows=size
+        )
+        # Small tiers so every size seals, compresses and spills blocks
+        retention = {"hot_rows": 1_000, "block_rows": 1_000, "warm_blocks": 2}
+        run.record(f"retention.append.{size}", lambda: TelemetryStore(retention=retention).append(data), rows=size)
+        tiered = TelemetryStore(retention=retention)
+        tiered.append(data)
+        run.record(f"retention.frame.{size}", lambda: tiered.frame, rows=size)
+
+
+def bench_analytics(run, analytics, sizes):
+    import streamlit as st
+    from correlation_module import CorrelationTracker
+    from predictions_module import PredictionStore
+    from profiles_module import event_windows, fault_onsets, profile_bands
+    from telemetry_module import TelemetryStore
+
+    values = make_telemetry(10_000)["Coolant_Temp_C"].tolist()
+    run.record(
+        "categorize_value.10000",
+        lambda: [analytics.categorize_value("Coolant_Temp_C", v) for v in values],
+        rows=len(values)
+    )
+
+    for size in sizes:
+        data = make_telemetry(size, seed=size)
+        run.record(
+            f"column_summary.{size}",
+            lambda: analytics.summarize_columns(data, analytics.IMPORTANT_COLUMNS),
+            rows=size
+        )
+
+        def column_analysis():
+            summary = analytics.summarize_columns(data, analytics.IMPORTANT_COLUMNS)
+            return [analytics.create_column_figure(col, summary[col]) for col in summary]
+
+        run.record(f"create_column_analysis.{size}", column_analysis, rows=size)
+
+        run.record(f"correlation.update.{size}", lambda: CorrelationTracker().update(data), rows=size)
+        # One live tick after `size` rows of history: the cost should not grow with the history
+        tracker = CorrelationTracker()
+        tracker.update(data)
+        tick = data.iloc[-1:]
+        run.record(f"correlation.tick.{size}", lambda: (tracker.update(tick), tracker.correlation()), rows=1)
+
+        store = TelemetryStore()
+        store.append(data)
+
+        predictions = PredictionStore()
+        predictions.append(pd.DataFrame({"Predicted_Fault": np.where(data["Status"] == "Fault", "Engine Overheating", "No Fault")}))
+
+        def fault_profiles():
+            onsets = fault_onsets(predictions.positions("Engine Overheating"))
+            return profile_bands(event_windows(store, onsets)[2])
+
+        run.record(f"fault_profiles.{size}", fault_profiles, rows=size)
+
+        def setup():
+            st.session_state.clear()
+            st.session_state["telemetry_store"] = store
+            # Live sessions keep it updated as rows arrive
+            st.session_state["correlation_tracker"] = tracker
+            st.session_state["lang_code"] = "en"
+
+        run.record(f"analytics_page.{size}", analytics.display_analytics_page, rows=size, setup=setup)
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions against the baseline results
+
+    The ratio uses calibration-normalized times when both sides have them,
+    raw medians otherwise; differences under MIN_REGRESSION_SECONDS are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if not reference:
+            continue
+        if reference.get("normalized") and result.get("normalized"):
+            ratio = result["normalized"] / reference["normalized"]
+        else:
+            ratio = result["seconds"] / reference["seconds"]
+        if ratio > 1 + tolerance and result["seconds"] - reference["seconds"] > MIN_REGRESSION_SECONDS:
+            regressions.append({
+                "name": name,
+                "baseline_seconds": reference["seconds"],
+                "seconds": result["seconds"],
+                "ratio": ratio
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the dashboard performance benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="row counts for chart and analytics benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark (median is reported)")
+    parser.add_argument("--only", nargs="+", choices=["generate_row", "simulate_data", "predict", "charts", "telemetry", "analytics"],
+                        help="run only these benchmark groups")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.35, help="allowed slowdown before a regression is reported")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="re-measure a benchmark up to this many times before reporting it as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text())
+
+    from stub_server import start_stub_server
+
+    server, predict_url = start_stub_server()
+    os.environ["FASTAPI_URL"] = predict_url
+
+    dashboard = load_script(ROOT / "Fault-Dashboard.py", "fault_dashboard")
+    analytics = load_script(ROOT / "pages" / "ELM327-Analytics.py", "elm327_analytics")
+    # Bare-mode Streamlit logs a warning for every element call; keep stderr readable
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+    groups = set(args.only or ["generate_row", "simulate_data", "predict", "charts", "telemetry", "analytics"])
+
+    run = BenchmarkRun(args.repeat, baseline, args.tolerance, args.retries)
+    try:
+        if "generate_row" in groups:
+            bench_generate_row(run, dashboard)
+        if "simulate_data" in groups:
+            bench_simulate_data(run, dashboard, predict_url)
+        if "predict" in groups:
+            bench_predict(run, predict_url)
+        if "charts" in groups:
+            bench_charts(run, args.sizes)
+        if "telemetry" in groups:
+            bench_telemetry(run, args.sizes)
+        if "analytics" in groups:
+            bench_analytics(run, analytics, args.sizes)
+    finally:
+        server.shutdown()
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "sizes": args.sizes,
+            "repeat": args.repeat
+        },
+        "results": run.results
+    }
+
+    if baseline is not None:
+        report["regressions"] = compare(run.results, baseline, args.tolerance)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    if args.save_baseline:
+        baseline_path.write_text(text)
+
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['name']}: {regression['baseline_seconds'] * 1000:.2f} ms -> "
+              f"{regression['seconds'] * 1000:.2f} ms (x{regression['ratio']:.2f})", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
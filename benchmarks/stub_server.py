@@ -0,0 +1,121 @@
+"""Local stand-in for the fault prediction API.
+
+Accepts the same multipart CSV upload as the hosted /predict endpoint and
+answers with one prediction per data row, so benchmarks and local runs need
+no network access. It also accepts the batch as an Arrow IPC stream
+(optionally zstd/lz4-compressed) and advertises that in X-Predict-Formats;
+--csv-only behaves like a backend without binary support, to check the
+client's fallback.
+
+    python benchmarks/stub_server.py --port 8765
+    FASTAPI_URL=http://127.0.0.1:8765/predict streamlit run Fault-Dashboard.py
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAULT_RULES = [
+    ("Engine_RPM", lambda v: v >= 4000, "Engine Overload"),
+    ("Coolant_Temp_C", lambda v: v >= 105, "Engine Overheating"),
+    ("Battery_Voltage_V", lambda v: v <= 11.5, "Battery Failure"),
+]
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _file_part(body, content_type):
+    """Extract (content type, bytes) of the uploaded file from a multipart/form-data body"""
+    boundary = content_type.split("boundary=", 1)[-1].strip('"').encode()
+    for part in body.split(b"--" + boundary):
+        header, _, content = part.partition(b"\r\n\r\n")
+        if b'name="file"' in header:
+            part_type = ""
+            for line in header.decode(errors="replace").split("\r\n"):
+                if line.lower().startswith("content-type:"):
+                    part_type = line.split(":", 1)[1].strip()
+            return part_type, content.rsplit(b"\r\n", 1)[0]
+    return "", b""
+
+
+def csv_records(csv_text):
+    lines = [line for line in csv_text.splitlines() if line]
+    if not lines:
+        return []
+    columns = lines[0].split(",")
+    return [dict(zip(columns, line.split(","))) for line in lines[1:]]
+
+
+def arrow_records(payload):
+    import pyarrow.ipc as ipc
+
+    return ipc.open_stream(payload).read_all().to_pylist()
+
+
+def predict_records(records):
+    results = []
+    for number, row in enumerate(records, start=1):
+        fault = "No Fault"
+        for column, rule, label in FAULT_RULES:
+            try:
+                if rule(float(row.get(column, "nan"))):
+                    fault = label
+                    break
+            except (TypeError, ValueError):
+                continue
+        results.append({
+            "Recording": number,
+            "Predicted_Fault": fault,
+            "Prediction_Message": "Stub prediction"
+        })
+    return results
+
+
+class PredictHandler(BaseHTTPRequestHandler):
+    formats = ("arrow", "csv")
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/predict":
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        part_type, content = _file_part(body, self.headers.get("Content-Type", ""))
+        if part_type == ARROW_STREAM_TYPE:
+            if "arrow" not in self.formats:
+                self.send_error(415)
+                return
+            records = arrow_records(content)
+        else:
+            records = csv_records(content.decode())
+        payload = json.dumps({"status": "success", "results": predict_records(records)}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Predict-Formats", ", ".join(self.formats))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CsvOnlyHandler(PredictHandler):
+    formats = ("csv",)
+
+
+def start_stub_server(host="127.0.0.1", port=0, csv_only=False):
+    """Start the stub server on a background thread and return (server, predict_url)"""
+    server = ThreadingHTTPServer((host, port), CsvOnlyHandler if csv_only else PredictHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/predict"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--csv-only", action="store_true", help="reject binary batches, like a CSV-only backend")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), CsvOnlyHandler if args.csv_only else PredictHandler)
+    print(f"Stub prediction API on http://{args.host}:{args.port}/predict")
+    server.serve_forever()
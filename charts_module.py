@@ -1,231 +1,168 @@
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+from rules_module import threshold
+from instrumentation_module import timed
+from lazy_module import lazy_import
+from telemetry_module import RAW_RESOLUTION
+
+# plotly.express alone dominates import time; load it when the first chart is drawn
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
+plotly_subplots = lazy_import("plotly.subplots")
+
+LANGUAGE_CODES = ("ar", "en")
+OVERLAY_LABELS = {
+    "ar": {"anomaly": "شذوذ", "range": "المدى (أدنى - أقصى)", "resolution": "الدقة"},
+    "en": {"anomaly": "Anomaly", "range": "Min-max range", "resolution": "Resolution"}
+}
+# Timeline points that fill a wide chart; longer windows switch to rollups
+TIMELINE_POINTS = 1200
+# Raw rows read from the telemetry store per chart; older rows reach the timelines through rollups
+RAW_CHART_ROWS = 50_000
+
+# Above this many rows the 3D scatter is aggregated or sampled so the figure payload stays bounded
+SCATTER_3D_POINT_BUDGET = 20_000
+SCATTER_3D_MODES = ("voxel", "sample")
+
+# Charts in display order, filled by @register_chart while ChartGenerator is defined
+_CHART_SPECS = []
+
+
+def register_chart(chart_type, columns, name, description, labels):
+    """Register a ChartGenerator method as a chart
+
+    name, description and labels map each language code to its text; the chart
+    is numbered by registration order. The method is called as
+    method(data, height, labels) with the labels of the generator's language.
+    """
+    for field, value in (("name", name), ("description", description), ("labels", labels)):
+        missing = set(LANGUAGE_CODES) - set(value)
+        if missing:
+            raise ValueError(f"Chart {name!r} has no {field} for {sorted(missing)}")
+
+    def decorator(function):
+        _CHART_SPECS.append({
+            "type": chart_type,
+            "columns": tuple(columns),
+            "name": name,
+            "description": description,
+            "labels": labels,
+            "method": function.__name__
+        })
+        return function
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def chart_registry(language):
+    """Read-only chart table for one language, resolved once per process"""
+    registry = {}
+    for number, spec in enumerate(_CHART_SPECS, start=1):
+        registry[f"{number}. {spec['name'][language]}"] = MappingProxyType({
+            "description": spec["description"][language],
+            "type": spec["type"],
+            "columns": spec["columns"],
+            "labels": MappingProxyType(dict(spec["labels"][language])),
+            "method": spec["method"]
+        })
+    return MappingProxyType(registry)
+
+
+def _fault_range_mask(data):
+    """Rows flagged as faults by the simulator or past the RPM critical threshold"""
+    mask = np.zeros(len(data), dtype=bool)
+    if "Status" in data.columns:
+        mask |= (data["Status"] == "Fault").to_numpy()
+    rpm = pd.to_numeric(data["Engine_RPM"], errors="coerce").to_numpy(dtype=float)
+    with np.errstate(invalid="ignore"):
+        mask |= rpm >= threshold("Engine_RPM")
+    return mask
+
+
+def _voxel_ids(points, lower, upper, bins):
+    """Flat voxel index of each point on a bins^3 grid spanning lower..upper"""
+    span = np.where(upper > lower, upper - lower, 1.0)
+    cells = np.clip(((points[:, :3] - lower) / span * bins).astype(np.int64), 0, bins - 1)
+    return (cells[:, 0] * bins + cells[:, 1]) * bins + cells[:, 2]
+
+
+def _voxel_trace(points, lower, upper, budget, name, count_label, color=None):
+    """Scatter3d with one marker per occupied voxel at its centroid, sized by reading count"""
+    # bins^3 <= budget keeps the trace within the point budget whatever the data
+    bins = max(1, int(round(budget ** (1 / 3))))
+    while bins ** 3 > budget and bins > 1:
+        bins -= 1
+    _, inverse, counts = np.unique(_voxel_ids(points, lower, upper, bins), return_inverse=True, return_counts=True)
+    centroids = np.column_stack([np.bincount(inverse, weights=points[:, i]) / counts for i in range(4)])
+    sizes = 3 + 9 * np.log1p(counts) / np.log1p(counts.max())
+    marker = dict(size=sizes, opacity=0.8)
+    if color is None:
+        marker.update(color=centroids[:, 3], colorscale="Viridis", colorbar=dict(title="MAF_gps"))
+    else:
+        marker.update(color=color)
+    return go.Scatter3d(
+        x=centroids[:, 0], y=centroids[:, 1], z=centroids[:, 2],
+        mode="markers",
+        name=name,
+        marker=marker,
+        customdata=counts,
+        hovertemplate=f"%{{x:.0f}}, %{{y:.1f}}, %{{z:.1f}}<br>{count_label}: %{{customdata}}<extra>{name}</extra>"
+    )
+
+
+def _stratified_sample(points, lower, upper, budget, bins=16, seed=0):
+    """Up to `budget` points, spread evenly across occupied voxels so sparse regions survive"""
+    if len(points) <= budget:
+        return points
+    voxels = _voxel_ids(points, lower, upper, bins)
+    # Random order within each voxel, then the first `quota` points of every voxel
+    order = np.lexsort((np.random.default_rng(seed).random(len(points)), voxels))
+    sorted_voxels = voxels[order]
+    starts = np.flatnonzero(np.r_[True, sorted_voxels[1:] != sorted_voxels[:-1]])
+    rank = np.arange(len(points)) - np.repeat(starts, np.diff(np.r_[starts, len(points)]))
+    quota = max(1, budget // len(starts))
+    chosen = order[rank < quota]
+    return points[np.sort(chosen[:budget])]
+
 
 class ChartGenerator:
-    def __init__(self, language='ar'):
+    """Builds the dashboard charts for one language
+
+    Instances hold no per-call state, so one generator per language can be
+    shared by every session (see get_chart_generator in Fault-Dashboard.py).
+    """
+
+    def __init__(self, language='ar', scatter_3d_mode="voxel", scatter_3d_point_budget=SCATTER_3D_POINT_BUDGET):
+        if scatter_3d_mode not in SCATTER_3D_MODES:
+            raise ValueError(f"scatter_3d_mode must be one of {SCATTER_3D_MODES}, got {scatter_3d_mode!r}")
         self.language = language
-        self.chart_configs = self._load_chart_configurations()
-    
-    def _load_chart_configurations(self):
-        """Load chart configurations based on language"""
-        if self.language == 'ar':
-            return {
-                "1. مخطط توزيع دورات المحرك": {
-                    "description": "رسم بياني يوضح توزيع دورات المحرك، مع تمييز الدورات العالية والمنخفضة",
-                    "type": "histogram",
-                    "columns": ["Engine_RPM"],
-                    "function": self._create_rpm_histogram
-                },
-                "2. مخطط دورات المحرك عبر الزمن": {
-                    "description": "مخطط زمني يظهر تغيرات دورات المحرك مع الوقت، مع تمييز ملون للدورات العالية",
-                    "type": "line",
-                    "columns": ["Engine_RPM", "Timestamp"],
-                    "function": self._create_rpm_timeline
-                },
-                "3. مخطط درجة حرارة سائل التبريد": {
-                    "description": "مخطط درجة حرارة سائل التبريد على مدار الزمن، مع خط تحذير عند 105 درجة مئوية",
-                    "type": "line",
-                    "columns": ["Coolant_Temp_C", "Timestamp"],
-                    "function": self._create_coolant_temp_chart
-                },
-                "4. توزيع درجة حرارة الزيت": {
-                    "description": "رسم بياني يوضح توزيع درجات حرارة الزيت مع إظهار المتوسط والوسيط",
-                    "type": "histogram",
-                    "columns": ["Oil_Temp_C"],
-                    "function": self._create_oil_temp_histogram
-                },
-                "5. مخطط درجة حرارة الزيت عبر الزمن": {
-                    "description": "مخطط زمني يظهر تغيرات درجة حرارة الزيت على مدار اليوم",
-                    "type": "line",
-                    "columns": ["Oil_Temp_C", "Timestamp"],
-                    "function": self._create_oil_temp_timeline
-                },
-                "6. العلاقة بين دورات المحرك ودرجة حرارة الزيت": {
-                    "description": "مخطط مزدوج يظهر العلاقة بين دورات المحرك ودرجة حرارة الزيت",
-                    "type": "dual_line",
-                    "columns": ["Engine_RPM", "Oil_Temp_C", "Timestamp"],
-                    "function": self._create_rpm_oil_temp_chart
-                },
-                "7. العلاقة بين حمل المحرك ودوراته": {
-                    "description": "مخطط مزدوج يظهر العلاقة بين حمل المحرك ودوراته",
-                    "type": "dual_line",
-                    "columns": ["Engine_RPM", "Engine_Load_Percent", "Timestamp"],
-                    "function": self._create_rpm_load_chart
-                },
-                "8. توزيع جهد البطارية": {
-                    "description": "رسم بياني يوضح توزيع قيم جهد البطارية",
-                    "type": "histogram",
-                    "columns": ["Battery_Voltage_V"],
-                    "function": self._create_battery_histogram
-                },
-                "9. مخطط جهد البطارية عبر الزمن": {
-                    "description": "مخطط زمني يظهر تغيرات جهد البطارية على مدار اليوم",
-                    "type": "line",
-                    "columns": ["Battery_Voltage_V", "Timestamp"],
-                    "function": self._create_battery_timeline
-                },
-                "10. ضغط مشعب السحب": {
-                    "description": "مخطط ضغط الهواء داخل مشعب السحب (MAP) مقاساً بالكيلو باسكال",
-                    "type": "line",
-                    "columns": ["MAP_kPa", "Timestamp"],
-                    "function": self._create_map_chart
-                },
-                "11. تدفق كتلة الهواء": {
-                    "description": "مخطط زمني لتدفق كتلة الهواء (MAF) مقاساً بالجرام في الثانية",
-                    "type": "line",
-                    "columns": ["MAF_gps", "Timestamp"],
-                    "function": self._create_maf_chart
-                },
-                "12. الرسم ثلاثي الأبعاد لمعاملات المحرك": {
-                    "description": "رسم ثلاثي الأبعاد يوضح العلاقة بين دورات المحرك وتوقيت الإشعال وضغط مشعب السحب",
-                    "type": "3d_scatter",
-                    "columns": ["Engine_RPM", "Ignition_Timing_Deg", "MAP_kPa", "MAF_gps"],
-                    "function": self._create_3d_scatter
-                },
-                "13. مخطط إعادة تدوير غاز العادم": {
-                    "description": "مخطط زمني لحالة نظام إعادة تدوير غاز العادم (EGR)",
-                    "type": "line",
-                    "columns": ["EGR_Status", "Timestamp"],
-                    "function": self._create_egr_chart
-                },
-                "14. مخطط كفاءة المحول الحفاز": {
-                    "description": "مخطط زمني يوضح كفاءة عمل المحول الحفاز",
-                    "type": "line",
-                    "columns": ["Catalytic_Converter_Percent", "Timestamp"],
-                    "function": self._create_catalytic_converter_chart
-                },
-                "15. مخطط حالة الفرامل": {
-                    "description": "مخطط زمني يوضح حالة الفرامل",
-                    "type": "line",
-                    "columns": ["Brake_Status", "Timestamp"],
-                    "function": self._create_brake_status_chart
-                },
-                "16. مخطط ضغط الإطارات": {
-                    "description": "مخطط زمني يوضح ضغط الإطارات بالـ PSI",
-                    "type": "line",
-                    "columns": ["Tire_Pressure_psi", "Timestamp"],
-                    "function": self._create_tire_pressure_chart
-                },
-                "17. مخطط درجة الحرارة المحيطة": {
-                    "description": "مخطط زمني يوضح درجة الحرارة المحيطة بالمركبة",
-                    "type": "line",
-                    "columns": ["Ambient_Temp_C", "Timestamp"],
-                    "function": self._create_ambient_temp_chart
-                }
-            }
-        else:  # English
-            return {
-                "1. Engine RPM Distribution": {
-                    "description": "Histogram showing engine RPM distribution with high and low RPM differentiation",
-                    "type": "histogram",
-                    "columns": ["Engine_RPM"],
-                    "function": self._create_rpm_histogram
-                },
-                "2. Engine RPM Timeline": {
-                    "description": "Time series showing engine RPM changes over time with color-coded high RPM periods",
-                    "type": "line",
-                    "columns": ["Engine_RPM", "Timestamp"],
-                    "function": self._create_rpm_timeline
-                },
-                "3. Coolant Temperature Chart": {
-                    "description": "Coolant temperature over time with warning line at 105°C",
-                    "type": "line",
-                    "columns": ["Coolant_Temp_C", "Timestamp"],
-                    "function": self._create_coolant_temp_chart
-                },
-                "4. Oil Temperature Distribution": {
-                    "description": "Histogram showing oil temperature distribution with mean and median indicators",
-                    "type": "histogram",
-                    "columns": ["Oil_Temp_C"],
-                    "function": self._create_oil_temp_histogram
-                },
-                "5. Oil Temperature Timeline": {
-                    "description": "Time series showing oil temperature changes throughout the day",
-                    "type": "line",
-                    "columns": ["Oil_Temp_C", "Timestamp"],
-                    "function": self._create_oil_temp_timeline
-                },
-                "6. Engine RPM vs Oil Temperature": {
-                    "description": "Dual axis chart showing relationship between engine RPM and oil temperature",
-                    "type": "dual_line",
-                    "columns": ["Engine_RPM", "Oil_Temp_C", "Timestamp"],
-                    "function": self._create_rpm_oil_temp_chart
-                },
-                "7. Engine Load vs RPM": {
-                    "description": "Dual axis chart showing relationship between engine load and RPM",
-                    "type": "dual_line",
-                    "columns": ["Engine_RPM", "Engine_Load_Percent", "Timestamp"],
-                    "function": self._create_rpm_load_chart
-                },
-                "8. Battery Voltage Distribution": {
-                    "description": "Histogram showing battery voltage value distribution",
-                    "type": "histogram",
-                    "columns": ["Battery_Voltage_V"],
-                    "function": self._create_battery_histogram
-                },
-                "9. Battery Voltage Timeline": {
-                    "description": "Time series showing battery voltage changes throughout the day",
-                    "type": "line",
-                    "columns": ["Battery_Voltage_V", "Timestamp"],
-                    "function": self._create_battery_timeline
-                },
-                "10. Manifold Absolute Pressure": {
-                    "description": "Chart showing intake manifold air pressure (MAP) in kPa",
-                    "type": "line",
-                    "columns": ["MAP_kPa", "Timestamp"],
-                    "function": self._create_map_chart
-                },
-                "11. Mass Air Flow": {
-                    "description": "Time series for mass air flow (MAF) in grams per second",
-                    "type": "line",
-                    "columns": ["MAF_gps", "Timestamp"],
-                    "function": self._create_maf_chart
-                },
-                "12. 3D Engine Parameters Plot": {
-                    "description": "3D scatter plot showing relationship between RPM, ignition timing, and MAP",
-                    "type": "3d_scatter",
-                    "columns": ["Engine_RPM", "Ignition_Timing_Deg", "MAP_kPa", "MAF_gps"],
-                    "function": self._create_3d_scatter
-                },
-                "13. Exhaust Gas Recirculation Chart": {
-                    "description": "Time series showing exhaust gas recirculation (EGR) status",
-                    "type": "line",
-                    "columns": ["EGR_Status", "Timestamp"],
-                    "function": self._create_egr_chart
-                },
-                "14. Catalytic Converter Efficiency Chart": {
-                    "description": "Time series showing catalytic converter efficiency",
-                    "type": "line",
-                    "columns": ["Catalytic_Converter_Percent", "Timestamp"],
-                    "function": self._create_catalytic_converter_chart
-                },
-                "15. Brake Status Chart": {
-                    "description": "Time series showing brake status",
-                    "type": "line",
-                    "columns": ["Brake_Status", "Timestamp"],
-                    "function": self._create_brake_status_chart
-                },
-                "16. Tire Pressure Chart": {
-                    "description": "Time series showing tire pressure in PSI",
-                    "type": "line",
-                    "columns": ["Tire_Pressure_psi", "Timestamp"],
-                    "function": self._create_tire_pressure_chart
-                },
-                "17. Ambient Temperature Chart": {
-                    "description": "Time series showing ambient temperature around the vehicle",
-                    "type": "line",
-                    "columns": ["Ambient_Temp_C", "Timestamp"],
-                    "function": self._create_ambient_temp_chart
-                }
-            }
+        self.scatter_3d_mode = scatter_3d_mode
+        self.scatter_3d_point_budget = scatter_3d_point_budget
+        self.timeline_points = TIMELINE_POINTS
+        self.raw_chart_rows = RAW_CHART_ROWS
+        self.chart_configs = MappingProxyType({
+            chart_name: MappingProxyType(dict(config, function=getattr(self, config["method"])))
+            for chart_name, config in chart_registry(language).items()
+        })
     
     def get_available_charts(self):
-        """Return the list of available charts"""
+        """Return the available charts, keyed by their localized name"""
         return self.chart_configs
     
-    def create_chart(self, chart_name, data, height=500):
-        """Create a chart based on the chart name and data"""
+    def create_chart(self, chart_name, data, height=500, anomalies=None, telemetry=None, start=None):
+        """Create a chart based on the chart name and data
+
+        anomalies optionally maps a column name to the row positions flagged by
+        the streaming anomaly detector; timelines overlay them as markers.
+
+        With a TelemetryStore as telemetry, data may be None: the chart covers
+        the newest raw_chart_rows rows from `start` (epoch seconds) on, and
+        numeric timelines read the finest rollup that fits in timeline_points
+        when the raw rows do not.
+        """
         if chart_name not in self.chart_configs:
             return {"fig": None, "description": "Chart not found"}
         
@@ -233,31 +170,89 @@ class ChartGenerator:
         required_columns = chart_config["columns"]
         
         # Check if all required columns exist in the data
-        if not all(col in data.columns for col in required_columns):
+        available = telemetry.columns if telemetry is not None else data.columns
+        if not all(col in available for col in required_columns):
             return {"fig": None, "description": chart_config["description"]}
         
+        plot_data, resolution = data, None
+        if telemetry is not None:
+            data = plot_data = telemetry.window(start, max_rows=self.raw_chart_rows)
+            sensor_columns = [col for col in required_columns if col != "Timestamp"]
+            if chart_config["type"] in ("line", "dual_line") and set(sensor_columns) <= set(telemetry.rollup_columns):
+                plot_data, resolution = telemetry.timeline(sensor_columns, start=start, max_points=self.timeline_points)
+        
         # Call the specific chart creation function
-        fig = chart_config["function"](data, height)
+        with timed(f"chart.{chart_config['function'].__name__.lstrip('_')}", rows=len(plot_data)):
+            fig = chart_config["function"](plot_data, height, chart_config["labels"])
+            if fig is not None and resolution not in (None, RAW_RESOLUTION):
+                self._add_rollup_band(fig, plot_data, chart_config, resolution)
+            if anomalies and fig is not None and chart_config["type"] in ("line", "dual_line"):
+                self._add_anomaly_overlay(fig, data, chart_config, anomalies)
         return {"fig": fig, "description": chart_config["description"]}
     
-    def _create_rpm_histogram(self, data, height):
-        """Create histogram for engine RPM distribution"""
-        labels = {
-            "ar": {"title": "توزيع دورات المحرك", "x": "دورات المحرك ( RPM )", "y": "العدد"},
-            "en": {"title": "Engine RPM Distribution", "x": "Engine RPM", "y": "Count"}
+    def _add_rollup_band(self, fig, plot_data, chart_config, resolution):
+        """Shade the min-max range of each bucket and name the resolution in the title"""
+        labels = OVERLAY_LABELS[self.language]
+        if chart_config["type"] == "line":
+            column = chart_config["columns"][0]
+            fig.add_trace(go.Scatter(
+                x=plot_data["Timestamp"], y=plot_data[f"{column}_max"],
+                mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"
+            ))
+            fig.add_trace(go.Scatter(
+                x=plot_data["Timestamp"], y=plot_data[f"{column}_min"],
+                mode="lines", line=dict(width=0), fill="tonexty", fillcolor="rgba(52, 152, 219, 0.15)",
+                name=labels["range"], hoverinfo="skip"
+            ))
+        title = fig.layout.title.text or ""
+        fig.update_layout(title_text=f"{title}<br><sup>{labels['resolution']}: {resolution}</sup>")
+    
+    def _add_anomaly_overlay(self, fig, data, chart_config, anomalies):
+        """Mark rows flagged by the anomaly detector on top of a timeline"""
+        sensor_columns = [col for col in chart_config["columns"] if col != "Timestamp"]
+        for i, column in enumerate(sensor_columns):
+            positions = data.index.intersection(anomalies.get(column, []))
+            if positions.empty:
+                continue
+            flagged = data.loc[positions]
+            trace = go.Scatter(
+                x=flagged["Timestamp"],
+                y=flagged[column],
+                mode="markers",
+                marker=dict(color="red", size=10, symbol="x"),
+                name=OVERLAY_LABELS[self.language]["anomaly"]
+            )
+            # Dual-axis charts plot their second sensor on the secondary y axis
+            if chart_config["type"] == "dual_line":
+                fig.add_trace(trace, secondary_y=i == 1)
+            else:
+                fig.add_trace(trace)
+    
+    @register_chart(
+        "histogram", ["Engine_RPM"],
+        name={"ar": "مخطط توزيع دورات المحرك", "en": "Engine RPM Distribution"},
+        description={
+            "ar": "رسم بياني يوضح توزيع دورات المحرك، مع تمييز الدورات العالية والمنخفضة",
+            "en": "Histogram showing engine RPM distribution with high and low RPM differentiation"
+        },
+        labels={
+            "ar": {"title": "توزيع دورات المحرك", "x": "دورات المحرك ( RPM )", "y": "العدد", "threshold": "دورات عالية"},
+            "en": {"title": "Engine RPM Distribution", "x": "Engine RPM", "y": "Count", "threshold": "High RPM"}
         }
-        
+    )
+    def _create_rpm_histogram(self, data, height, labels):
+        """Create histogram for engine RPM distribution"""
         fig = px.histogram(
             data,
             x="Engine_RPM",
             nbins=50,
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#3498db"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -266,33 +261,40 @@ class ChartGenerator:
         
         # Add high RPM threshold line
         fig.add_vline(
-            x=4000,
+            x=threshold("Engine_RPM"),
             line_dash="dash",
             line_color="red",
-            annotation_text="High RPM" if self.language == "en" else "دورات عالية",
+            annotation_text=labels["threshold"],
             annotation_position="top"
         )
         
         return fig
     
-    def _create_rpm_timeline(self, data, height):
-        """Create line chart for engine RPM over time"""
-        labels = {
-            "ar": {"title": "دورات المحرك عبر الزمن", "x": "الوقت", "y": "دورات المحرك (RPM)"},
-            "en": {"title": "Engine RPM Timeline", "x": "Time", "y": "Engine RPM"}
+    @register_chart(
+        "line", ["Engine_RPM", "Timestamp"],
+        name={"ar": "مخطط دورات المحرك عبر الزمن", "en": "Engine RPM Timeline"},
+        description={
+            "ar": "مخطط زمني يظهر تغيرات دورات المحرك مع الوقت، مع تمييز ملون للدورات العالية",
+            "en": "Time series showing engine RPM changes over time with color-coded high RPM periods"
+        },
+        labels={
+            "ar": {"title": "دورات المحرك عبر الزمن", "x": "الوقت", "y": "دورات المحرك (RPM)", "threshold": "دورات عالية"},
+            "en": {"title": "Engine RPM Timeline", "x": "Time", "y": "Engine RPM", "threshold": "High RPM"}
         }
-        
+    )
+    def _create_rpm_timeline(self, data, height, labels):
+        """Create line chart for engine RPM over time"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Engine_RPM",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#3498db"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
@@ -300,61 +302,75 @@ class ChartGenerator:
         
         # Add high RPM threshold line
         fig.add_hline(
-            y=4000,
+            y=threshold("Engine_RPM"),
             line_dash="dash",
             line_color="red",
-            annotation_text="High RPM" if self.language == "en" else "دورات عالية",
+            annotation_text=labels["threshold"],
             annotation_position="top right"
         )
         
         return fig
     
-    def _create_coolant_temp_chart(self, data, height):
-        """Create line chart for coolant temperature over time"""
-        labels = {
-            "ar": {"title": "درجة حرارة سائل التبريد", "x": "الوقت", "y": "درجة الحرارة (°C)"},
-            "en": {"title": "Coolant Temperature", "x": "Time", "y": "Temperature (°C)"}
+    @register_chart(
+        "line", ["Coolant_Temp_C", "Timestamp"],
+        name={"ar": "مخطط درجة حرارة سائل التبريد", "en": "Coolant Temperature Chart"},
+        description={
+            "ar": "مخطط درجة حرارة سائل التبريد على مدار الزمن، مع خط تحذير عند 105 درجة مئوية",
+            "en": "Coolant temperature over time with warning line at 105°C"
+        },
+        labels={
+            "ar": {"title": "درجة حرارة سائل التبريد", "x": "الوقت", "y": "درجة الحرارة (°C)", "threshold": "تحذير"},
+            "en": {"title": "Coolant Temperature", "x": "Time", "y": "Temperature (°C)", "threshold": "Warning"}
         }
-        
+    )
+    def _create_coolant_temp_chart(self, data, height, labels):
+        """Create line chart for coolant temperature over time"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Coolant_Temp_C",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#e74c3c"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
         )
         
-        # Add warning line at 105°C
+        # Add warning line at the coolant critical threshold (105°C)
         fig.add_hline(
-            y=105,
+            y=threshold("Coolant_Temp_C"),
             line_dash="dash",
             line_color="red",
-            annotation_text="Warning" if self.language == "en" else "تحذير",
+            annotation_text=labels["threshold"],
             annotation_position="top right"
         )
         
         return fig
     
-    def _create_oil_temp_histogram(self, data, height):
-        """Create histogram for oil temperature distribution"""
-        labels = {
-            "ar": {"title": "توزيع درجة حرارة الزيت", "x": "درجة الحرارة (°C)", "y": "العدد"},
-            "en": {"title": "Oil Temperature Distribution", "x": "Temperature (°C)", "y": "Count"}
+    @register_chart(
+        "histogram", ["Oil_Temp_C"],
+        name={"ar": "توزيع درجة حرارة الزيت", "en": "Oil Temperature Distribution"},
+        description={
+            "ar": "رسم بياني يوضح توزيع درجات حرارة الزيت مع إظهار المتوسط والوسيط",
+            "en": "Histogram showing oil temperature distribution with mean and median indicators"
+        },
+        labels={
+            "ar": {"title": "توزيع درجة حرارة الزيت", "x": "درجة الحرارة (°C)", "y": "العدد", "mean": "المتوسط", "median": "الوسيط"},
+            "en": {"title": "Oil Temperature Distribution", "x": "Temperature (°C)", "y": "Count", "mean": "Mean", "median": "Median"}
         }
-        
+    )
+    def _create_oil_temp_histogram(self, data, height, labels):
+        """Create histogram for oil temperature distribution"""
         fig = px.histogram(
             data,
             x="Oil_Temp_C",
             nbins=50,
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#e67e22"]
         )
         
@@ -366,20 +382,20 @@ class ChartGenerator:
             x=mean_temp,
             line_dash="dash",
             line_color="blue",
-            annotation_text="Mean" if self.language == "en" else "المتوسط",
+            annotation_text=labels["mean"],
             annotation_position="top left"
         )
         fig.add_vline(
             x=median_temp,
             line_dash="dash",
             line_color="green",
-            annotation_text="Median" if self.language == "en" else "الوسيط",
+            annotation_text=labels["median"],
             annotation_position="top right"
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -388,24 +404,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_oil_temp_timeline(self, data, height):
-        """Create line chart for oil temperature over time"""
-        labels = {
+    @register_chart(
+        "line", ["Oil_Temp_C", "Timestamp"],
+        name={"ar": "مخطط درجة حرارة الزيت عبر الزمن", "en": "Oil Temperature Timeline"},
+        description={
+            "ar": "مخطط زمني يظهر تغيرات درجة حرارة الزيت على مدار اليوم",
+            "en": "Time series showing oil temperature changes throughout the day"
+        },
+        labels={
             "ar": {"title": "درجة حرارة الزيت عبر الزمن", "x": "الوقت", "y": "درجة الحرارة (°C)"},
             "en": {"title": "Oil Temperature Timeline", "x": "Time", "y": "Temperature (°C)"}
         }
-        
+    )
+    def _create_oil_temp_timeline(self, data, height, labels):
+        """Create line chart for oil temperature over time"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Oil_Temp_C",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#e67e22"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
@@ -413,31 +436,28 @@ class ChartGenerator:
         
         return fig
     
-    def _create_rpm_oil_temp_chart(self, data, height):
-        """Create dual axis chart for engine RPM and oil temperature"""
-        labels = {
-            "ar": {
-                "title": "دورات المحرك مقابل درجة حرارة الزيت",
-                "x": "الوقت",
-                "y1": "دورات المحرك (RPM)",
-                "y2": "درجة الحرارة (°C)"
-            },
-            "en": {
-                "title": "Engine RPM vs Oil Temperature",
-                "x": "Time",
-                "y1": "Engine RPM",
-                "y2": "Temperature (°C)"
-            }
+    @register_chart(
+        "dual_line", ["Engine_RPM", "Oil_Temp_C", "Timestamp"],
+        name={"ar": "العلاقة بين دورات المحرك ودرجة حرارة الزيت", "en": "Engine RPM vs Oil Temperature"},
+        description={
+            "ar": "مخطط مزدوج يظهر العلاقة بين دورات المحرك ودرجة حرارة الزيت",
+            "en": "Dual axis chart showing relationship between engine RPM and oil temperature"
+        },
+        labels={
+            "ar": {"title": "دورات المحرك مقابل درجة حرارة الزيت", "x": "الوقت", "y1": "دورات المحرك (RPM)", "y2": "درجة الحرارة (°C)", "y1_trace": "دورات المحرك", "y2_trace": "درجة حرارة الزيت"},
+            "en": {"title": "Engine RPM vs Oil Temperature", "x": "Time", "y1": "Engine RPM", "y2": "Temperature (°C)", "y1_trace": "RPM", "y2_trace": "Oil Temp"}
         }
-        
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+    )
+    def _create_rpm_oil_temp_chart(self, data, height, labels):
+        """Create dual axis chart for engine RPM and oil temperature"""
+        fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": True}]])
         
         # Engine RPM trace
         fig.add_trace(
             go.Scatter(
                 x=data["Timestamp"],
                 y=data["Engine_RPM"],
-                name="RPM" if self.language == "en" else "دورات المحرك",
+                name=labels["y1_trace"],
                 line=dict(color="#3498db")
             ),
             secondary_y=False
@@ -448,17 +468,17 @@ class ChartGenerator:
             go.Scatter(
                 x=data["Timestamp"],
                 y=data["Oil_Temp_C"],
-                name="Oil Temp" if self.language == "en" else "درجة حرارة الزيت",
+                name=labels["y2_trace"],
                 line=dict(color="#e67e22")
             ),
             secondary_y=True
         )
         
         fig.update_layout(
-            title=labels[self.language]["title"],
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y1"],
-            yaxis2_title=labels[self.language]["y2"],
+            title=labels["title"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y1"],
+            yaxis2_title=labels["y2"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
@@ -466,31 +486,28 @@ class ChartGenerator:
         
         return fig
     
-    def _create_rpm_load_chart(self, data, height):
-        """Create dual axis chart for engine RPM and load"""
-        labels = {
-            "ar": {
-                "title": "دورات المحرك مقابل حمل المحرك",
-                "x": "الوقت",
-                "y1": "دورات المحرك (RPM)",
-                "y2": "حمل المحرك (%)"
-            },
-            "en": {
-                "title": "Engine RPM vs Engine Load",
-                "x": "Time",
-                "y1": "Engine RPM",
-                "y2": "Engine Load (%)"
-            }
+    @register_chart(
+        "dual_line", ["Engine_RPM", "Engine_Load_Percent", "Timestamp"],
+        name={"ar": "العلاقة بين حمل المحرك ودوراته", "en": "Engine Load vs RPM"},
+        description={
+            "ar": "مخطط مزدوج يظهر العلاقة بين حمل المحرك ودوراته",
+            "en": "Dual axis chart showing relationship between engine load and RPM"
+        },
+        labels={
+            "ar": {"title": "دورات المحرك مقابل حمل المحرك", "x": "الوقت", "y1": "دورات المحرك (RPM)", "y2": "حمل المحرك (%)", "y1_trace": "دورات المحرك", "y2_trace": "حمل المحرك"},
+            "en": {"title": "Engine RPM vs Engine Load", "x": "Time", "y1": "Engine RPM", "y2": "Engine Load (%)", "y1_trace": "RPM", "y2_trace": "Load"}
         }
-        
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+    )
+    def _create_rpm_load_chart(self, data, height, labels):
+        """Create dual axis chart for engine RPM and load"""
+        fig = plotly_subplots.make_subplots(specs=[[{"secondary_y": True}]])
         
         # Engine RPM trace
         fig.add_trace(
             go.Scatter(
                 x=data["Timestamp"],
                 y=data["Engine_RPM"],
-                name="RPM" if self.language == "en" else "دورات المحرك",
+                name=labels["y1_trace"],
                 line=dict(color="#3498db")
             ),
             secondary_y=False
@@ -501,17 +518,17 @@ class ChartGenerator:
             go.Scatter(
                 x=data["Timestamp"],
                 y=data["Engine_Load_Percent"],
-                name="Load" if self.language == "en" else "حمل المحرك",
+                name=labels["y2_trace"],
                 line=dict(color="#27ae60")
             ),
             secondary_y=True
         )
         
         fig.update_layout(
-            title=labels[self.language]["title"],
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y1"],
-            yaxis2_title=labels[self.language]["y2"],
+            title=labels["title"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y1"],
+            yaxis2_title=labels["y2"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
@@ -519,24 +536,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_battery_histogram(self, data, height):
-        """Create histogram for battery voltage distribution"""
-        labels = {
+    @register_chart(
+        "histogram", ["Battery_Voltage_V"],
+        name={"ar": "توزيع جهد البطارية", "en": "Battery Voltage Distribution"},
+        description={
+            "ar": "رسم بياني يوضح توزيع قيم جهد البطارية",
+            "en": "Histogram showing battery voltage value distribution"
+        },
+        labels={
             "ar": {"title": "توزيع جهد البطارية", "x": "الجهد (V)", "y": "العدد"},
             "en": {"title": "Battery Voltage Distribution", "x": "Voltage (V)", "y": "Count"}
         }
-        
+    )
+    def _create_battery_histogram(self, data, height, labels):
+        """Create histogram for battery voltage distribution"""
         fig = px.histogram(
             data,
             x="Battery_Voltage_V",
             nbins=50,
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#27ae60"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -545,24 +569,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_battery_timeline(self, data, height):
-        """Create line chart for battery voltage over time"""
-        labels = {
-            "ar": {"title": "جهد البطارية عبر الزمن", "x": "الوقت", "y": "الجهد (V)"},
-            "en": {"title": "Battery Voltage Timeline", "x": "Time", "y": "Voltage (V)"}
+    @register_chart(
+        "line", ["Battery_Voltage_V", "Timestamp"],
+        name={"ar": "مخطط جهد البطارية عبر الزمن", "en": "Battery Voltage Timeline"},
+        description={
+            "ar": "مخطط زمني يظهر تغيرات جهد البطارية على مدار اليوم",
+            "en": "Time series showing battery voltage changes throughout the day"
+        },
+        labels={
+            "ar": {"title": "جهد البطارية عبر الزمن", "x": "الوقت", "y": "الجهد (V)", "threshold": "جهد منخفض"},
+            "en": {"title": "Battery Voltage Timeline", "x": "Time", "y": "Voltage (V)", "threshold": "Low Voltage"}
         }
-        
+    )
+    def _create_battery_timeline(self, data, height, labels):
+        """Create line chart for battery voltage over time"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Battery_Voltage_V",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#27ae60"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
@@ -570,33 +601,40 @@ class ChartGenerator:
         
         # Add warning line at 11.5V
         fig.add_hline(
-            y=11.5,
+            y=threshold("Battery_Voltage_V", side="low"),
             line_dash="dash",
             line_color="red",
-            annotation_text="Low Voltage" if self.language == "en" else "جهد منخفض",
+            annotation_text=labels["threshold"],
             annotation_position="top right"
         )
         
         return fig
     
-    def _create_map_chart(self, data, height):
-        """Create line chart for manifold absolute pressure"""
-        labels = {
+    @register_chart(
+        "line", ["MAP_kPa", "Timestamp"],
+        name={"ar": "ضغط مشعب السحب", "en": "Manifold Absolute Pressure"},
+        description={
+            "ar": "مخطط ضغط الهواء داخل مشعب السحب (MAP) مقاساً بالكيلو باسكال",
+            "en": "Chart showing intake manifold air pressure (MAP) in kPa"
+        },
+        labels={
             "ar": {"title": "ضغط مشعب السحب", "x": "الوقت", "y": "الضغط (kPa)"},
             "en": {"title": "Manifold Absolute Pressure", "x": "Time", "y": "Pressure (kPa)"}
         }
-        
+    )
+    def _create_map_chart(self, data, height, labels):
+        """Create line chart for manifold absolute pressure"""
         fig = px.line(
             data,
             x="Timestamp",
             y="MAP_kPa",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#9b59b6"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12)
@@ -604,13 +642,20 @@ class ChartGenerator:
         
         return fig
     
-    def _create_maf_chart(self, data, height):
-        """Create line chart for mass air flow"""
-        labels = {
+    @register_chart(
+        "line", ["MAF_gps", "Timestamp"],
+        name={"ar": "تدفق كتلة الهواء", "en": "Mass Air Flow"},
+        description={
+            "ar": "مخطط زمني لتدفق كتلة الهواء (MAF) مقاساً بالجرام في الثانية",
+            "en": "Time series for mass air flow (MAF) in grams per second"
+        },
+        labels={
             "ar": {"title": "تدفق كتلة الهواء", "x": "الوقت", "y": "التدفق (g/s)"},
             "en": {"title": "Mass Air Flow", "x": "Time", "y": "Flow (g/s)"}
         }
-        
+    )
+    def _create_maf_chart(self, data, height, labels):
+        """Create line chart for mass air flow"""
         # Ensure data is sorted by Timestamp
         data = data.sort_values("Timestamp")
         
@@ -618,13 +663,13 @@ class ChartGenerator:
             data,
             x="Timestamp",
             y="MAF_gps",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#2ecc71"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -640,38 +685,53 @@ class ChartGenerator:
         
         return fig
     
-    def _create_3d_scatter(self, data, height):
-        """Create 3D scatter plot for engine parameters"""
-        labels = {
+    @register_chart(
+        "3d_scatter", ["Engine_RPM", "Ignition_Timing_Deg", "MAP_kPa", "MAF_gps"],
+        name={"ar": "الرسم ثلاثي الأبعاد لمعاملات المحرك", "en": "3D Engine Parameters Plot"},
+        description={
+            "ar": "رسم ثلاثي الأبعاد يوضح العلاقة بين دورات المحرك وتوقيت الإشعال وضغط مشعب السحب",
+            "en": "3D scatter plot showing relationship between RPM, ignition timing, and MAP"
+        },
+        labels={
             "ar": {
-                "title": "العلاقة ثلاثية الأبعاد لمعاملات المحرك",
-                "x": "دورات المحرك (RPM)",
-                "y": "توقيت الإشعال (°)",
-                "z": "ضغط مشعب السحب (kPa)"
+                "title": "العلاقة ثلاثية الأبعاد لمعاملات المحرك", "x": "دورات المحرك (RPM)", "y": "توقيت الإشعال (°)",
+                "z": "ضغط مشعب السحب (kPa)", "normal": "القراءات", "faults": "نطاق الأعطال", "count": "عدد القراءات",
+                "voxel_note": "{rows:,} قراءة مجمعة في {points:,} خلية", "sample_note": "عينة من {points:,} من أصل {rows:,} قراءة"
             },
             "en": {
-                "title": "3D Engine Parameters",
-                "x": "Engine RPM",
-                "y": "Ignition Timing (°)",
-                "z": "MAP (kPa)"
+                "title": "3D Engine Parameters", "x": "Engine RPM", "y": "Ignition Timing (°)",
+                "z": "MAP (kPa)", "normal": "Readings", "faults": "Fault range", "count": "Readings",
+                "voxel_note": "{rows:,} readings aggregated into {points:,} voxels", "sample_note": "{points:,} of {rows:,} readings sampled"
             }
         }
-        
-        fig = px.scatter_3d(
-            data,
-            x="Engine_RPM",
-            y="Ignition_Timing_Deg",
-            z="MAP_kPa",
-            color="MAF_gps",
-            title=labels[self.language]["title"],
-            color_continuous_scale="Viridis"
-        )
+    )
+    def _create_3d_scatter(self, data, height, labels):
+        """Create 3D scatter plot for engine parameters
+
+        Up to SCATTER_3D_POINT_BUDGET rows every reading is plotted. Above it,
+        normal readings are binned into voxels (mean MAF color, size by count)
+        or stratified-sampled per voxel, depending on scatter_3d_mode; fault
+        range readings are kept as individual points while they fit in half
+        the budget and are voxel-aggregated in their own trace otherwise.
+        """
+        if len(data) <= self.scatter_3d_point_budget:
+            fig = px.scatter_3d(
+                data,
+                x="Engine_RPM",
+                y="Ignition_Timing_Deg",
+                z="MAP_kPa",
+                color="MAF_gps",
+                title=labels["title"],
+                color_continuous_scale="Viridis"
+            )
+        else:
+            fig = self._create_bounded_3d_scatter(data, labels)
         
         fig.update_layout(
             scene=dict(
-                xaxis_title=labels[self.language]["x"],
-                yaxis_title=labels[self.language]["y"],
-                zaxis_title=labels[self.language]["z"]
+                xaxis_title=labels["x"],
+                yaxis_title=labels["y"],
+                zaxis_title=labels["z"]
             ),
             height=height,
             template="plotly_white",
@@ -680,24 +740,79 @@ class ChartGenerator:
         
         return fig
     
-    def _create_egr_chart(self, data, height):
-        """Create line chart for exhaust gas recirculation (EGR) status"""
-        labels = {
+    def _create_bounded_3d_scatter(self, data, labels):
+        """3D scatter for large histories with at most scatter_3d_point_budget markers"""
+        columns = ["Engine_RPM", "Ignition_Timing_Deg", "MAP_kPa", "MAF_gps"]
+        values = np.column_stack([pd.to_numeric(data[col], errors="coerce").to_numpy(dtype=float) for col in columns])
+        valid = ~np.isnan(values).any(axis=1)
+        fault = _fault_range_mask(data)[valid]
+        values = values[valid]
+        normal, faulty = values[~fault], values[fault]
+
+        fault_budget = self.scatter_3d_point_budget // 2
+        normal_budget = self.scatter_3d_point_budget - min(len(faulty), fault_budget)
+        # Shared grid so normal and fault voxels line up; no complete row at all leaves an empty grid
+        if len(values):
+            lower, upper = values[:, :3].min(axis=0), values[:, :3].max(axis=0)
+        else:
+            lower = upper = np.zeros(3)
+
+        fig = go.Figure()
+        if self.scatter_3d_mode == "sample":
+            points = _stratified_sample(normal, lower, upper, normal_budget)
+            if len(points):
+                fig.add_trace(go.Scatter3d(
+                    x=points[:, 0], y=points[:, 1], z=points[:, 2],
+                    mode="markers",
+                    name=labels["normal"],
+                    marker=dict(size=3, color=points[:, 3], colorscale="Viridis", colorbar=dict(title="MAF_gps"))
+                ))
+            note = labels["sample_note"].format(points=len(points), rows=len(normal))
+        elif len(normal):
+            fig.add_trace(_voxel_trace(normal, lower, upper, normal_budget, labels["normal"], labels["count"]))
+            note = labels["voxel_note"].format(points=len(fig.data[0].x), rows=len(normal))
+        else:
+            note = labels["voxel_note"].format(points=0, rows=0)
+
+        if len(faulty) <= fault_budget:
+            fig.add_trace(go.Scatter3d(
+                x=faulty[:, 0], y=faulty[:, 1], z=faulty[:, 2],
+                mode="markers",
+                name=labels["faults"],
+                marker=dict(size=3, color="#e74c3c", symbol="x")
+            ))
+        else:
+            fig.add_trace(_voxel_trace(faulty, lower, upper, fault_budget, labels["faults"], labels["count"],
+                                       color="#e74c3c"))
+
+        fig.update_layout(title=f"{labels['title']}<br><sup>{note}</sup>", legend=dict(x=0, y=1))
+        return fig
+    
+    @register_chart(
+        "line", ["EGR_Status", "Timestamp"],
+        name={"ar": "مخطط إعادة تدوير غاز العادم", "en": "Exhaust Gas Recirculation Chart"},
+        description={
+            "ar": "مخطط زمني لحالة نظام إعادة تدوير غاز العادم (EGR)",
+            "en": "Time series showing exhaust gas recirculation (EGR) status"
+        },
+        labels={
             "ar": {"title": "حالة نظام إعادة تدوير غاز العادم (EGR)", "x": "الوقت", "y": "حالة EGR (مشفرة)"},
             "en": {"title": "Exhaust Gas Recirculation (EGR) Status", "x": "Time", "y": "EGR Status (Encoded)"}
         }
-        
+    )
+    def _create_egr_chart(self, data, height, labels):
+        """Create line chart for exhaust gas recirculation (EGR) status"""
         fig = px.line(
             data,
             x="Timestamp",
             y="EGR_Status",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#2980b9"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -713,24 +828,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_catalytic_converter_chart(self, data, height):
-        """Create line chart for catalytic converter efficiency"""
-        labels = {
+    @register_chart(
+        "line", ["Catalytic_Converter_Percent", "Timestamp"],
+        name={"ar": "مخطط كفاءة المحول الحفاز", "en": "Catalytic Converter Efficiency Chart"},
+        description={
+            "ar": "مخطط زمني يوضح كفاءة عمل المحول الحفاز",
+            "en": "Time series showing catalytic converter efficiency"
+        },
+        labels={
             "ar": {"title": "كفاءة المحول الحفاز", "x": "الوقت", "y": "كفاءة المحول الحفاز (%)"},
             "en": {"title": "Catalytic Converter Efficiency", "x": "Time", "y": "Catalytic Converter Efficiency (%)"}
         }
-        
+    )
+    def _create_catalytic_converter_chart(self, data, height, labels):
+        """Create line chart for catalytic converter efficiency"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Catalytic_Converter_Percent",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#16a085"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -746,24 +868,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_brake_status_chart(self, data, height):
-        """Create line chart for brake status"""
-        labels = {
+    @register_chart(
+        "line", ["Brake_Status", "Timestamp"],
+        name={"ar": "مخطط حالة الفرامل", "en": "Brake Status Chart"},
+        description={
+            "ar": "مخطط زمني يوضح حالة الفرامل",
+            "en": "Time series showing brake status"
+        },
+        labels={
             "ar": {"title": "حالة الفرامل", "x": "الوقت", "y": "حالة الفرامل"},
             "en": {"title": "Brake Status", "x": "Time", "y": "Brake Status"}
         }
-        
+    )
+    def _create_brake_status_chart(self, data, height, labels):
+        """Create line chart for brake status"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Brake_Status",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#2980b9"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -779,24 +908,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_tire_pressure_chart(self, data, height):
-        """Create line chart for tire pressure"""
-        labels = {
+    @register_chart(
+        "line", ["Tire_Pressure_psi", "Timestamp"],
+        name={"ar": "مخطط ضغط الإطارات", "en": "Tire Pressure Chart"},
+        description={
+            "ar": "مخطط زمني يوضح ضغط الإطارات بالـ PSI",
+            "en": "Time series showing tire pressure in PSI"
+        },
+        labels={
             "ar": {"title": "ضغط إطارات المركبة", "x": "الوقت", "y": "ضغط الإطارات (PSI)"},
             "en": {"title": "Tire Pressure", "x": "Time", "y": "Tire Pressure (PSI)"}
         }
-        
+    )
+    def _create_tire_pressure_chart(self, data, height, labels):
+        """Create line chart for tire pressure"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Tire_Pressure_psi",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#8e44ad"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
@@ -812,24 +948,31 @@ class ChartGenerator:
         
         return fig
     
-    def _create_ambient_temp_chart(self, data, height):
-        """Create line chart for ambient temperature"""
-        labels = {
+    @register_chart(
+        "line", ["Ambient_Temp_C", "Timestamp"],
+        name={"ar": "مخطط درجة الحرارة المحيطة", "en": "Ambient Temperature Chart"},
+        description={
+            "ar": "مخطط زمني يوضح درجة الحرارة المحيطة بالمركبة",
+            "en": "Time series showing ambient temperature around the vehicle"
+        },
+        labels={
             "ar": {"title": "درجة الحرارة المحيطة بالمركبة", "x": "الوقت", "y": "درجة الحرارة (°C)"},
             "en": {"title": "Ambient Temperature", "x": "Time", "y": "Temperature (°C)"}
         }
-        
+    )
+    def _create_ambient_temp_chart(self, data, height, labels):
+        """Create line chart for ambient temperature"""
         fig = px.line(
             data,
             x="Timestamp",
             y="Ambient_Temp_C",
-            title=labels[self.language]["title"],
+            title=labels["title"],
             color_discrete_sequence=["#f1c40f"]
         )
         
         fig.update_layout(
-            xaxis_title=labels[self.language]["x"],
-            yaxis_title=labels[self.language]["y"],
+            xaxis_title=labels["x"],
+            yaxis_title=labels["y"],
             height=height,
             template="plotly_white",
             font=dict(family="Cairo" if self.language == "ar" else "Arial", size=12),
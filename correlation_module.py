@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from anomaly_module import SENSOR_COLUMNS
+
+# Columns whose labels split the rows into fault-conditional matrices
+GROUP_COLUMNS = ['Status', 'Predicted_Fault']
+# Labels tracked per group column; the prediction API could return any number
+MAX_GROUPS = 20
+
+
+class RunningCovariance:
+    """Pairwise covariance and correlation from streaming sums of products
+
+    For every column pair it keeps the row count, the sums and sums of
+    squares of both columns and the sum of their products, each over the
+    rows where both values are present. An update costs O(rows * columns²)
+    for the new rows only, and the state is O(columns²) however long the
+    history. Values are shifted by the first batch's means before they are
+    summed, so large offsets (engine RPM) do not cancel out the precision.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        width = len(self.columns)
+        self.shift = None
+        self.counts = np.zeros((width, width))
+        # sums[i, j]: sum of column i over the rows where columns i and j are both present
+        self.sums = np.zeros((width, width))
+        self.squares = np.zeros((width, width))
+        self.products = np.zeros((width, width))
+
+    @property
+    def rows(self):
+        return int(self.counts.max()) if self.counts.size else 0
+
+    def update(self, values):
+        """Fold a (rows, columns) float array into the sums; NaN marks a missing value"""
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        present = np.isfinite(values)
+        if self.shift is None:
+            counts = present.sum(axis=0)
+            self.shift = np.where(counts, np.where(present, values, 0).sum(axis=0) / np.maximum(counts, 1), 0.0)
+        centred = np.where(present, values - self.shift, 0.0)
+        mask = present.astype(float)
+        self.counts += mask.T @ mask
+        self.sums += centred.T @ mask
+        self.squares += (centred * centred).T @ mask
+        self.products += centred.T @ centred
+
+    def _centred(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self.sums / self.counts
+            cross = self.products - self.sums * means.T
+            # Sum of squared deviations of column i (rows) and of column j (columns) over the shared rows
+            spread = self.squares - self.sums * means
+        return cross, spread
+
+    def covariance(self):
+        cross, _ = self._centred()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = np.where(self.counts > 1, cross / (self.counts - 1), np.nan)
+        return pd.DataFrame(covariance, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pearson correlation matrix; NaN for pairs with under two shared rows or a constant column"""
+        cross, spread = self._centred()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.sqrt(spread * spread.T)
+            correlation = np.where((self.counts > 1) & (scale > 0), cross / scale, np.nan)
+        return pd.DataFrame(np.clip(correlation, -1, 1), index=self.columns, columns=self.columns)
+
+
+class CorrelationTracker:
+    """Overall and fault-conditional running correlations across the numeric telemetry columns
+
+    Telemetry rows update the overall matrix and one matrix per Status label.
+    Predictions arrive after their telemetry, so the per-Predicted_Fault
+    matrices are updated from update_labels() once they do.
+    """
+
+    def __init__(self, columns=None, group_columns=None, max_groups=MAX_GROUPS):
+        self.columns = list(columns or SENSOR_COLUMNS)
+        self.group_columns = list(group_columns or GROUP_COLUMNS)
+        self.max_groups = max_groups
+        self.overall = RunningCovariance(self.columns)
+        self.groups = {column: {} for column in self.group_columns}
+
+    def _values(self, frame):
+        return frame.reindex(columns=self.columns).to_numpy(dtype=float, na_value=np.nan)
+
+    def update(self, frame):
+        """Fold new telemetry rows into the overall matrix and the matrices of any group column they carry"""
+        if frame.empty:
+            return
+        values = self._values(frame)
+        self.overall.update(values)
+        for column in self.group_columns:
+            if column in frame.columns:
+                self._update_groups(column, frame[column].to_numpy(dtype=object), values)
+
+    def update_labels(self, column, labels, frame):
+        """Fold rows into the per-label matrices of one group column only; missing labels are skipped"""
+        if frame.empty:
+            return
+        self._update_groups(column, np.asarray(labels, dtype=object), self._values(frame))
+
+    def _update_groups(self, column, labels, values):
+        codes, uniques = pd.factorize(labels)
+        groups = self.groups.setdefault(column, {})
+        for code, label in enumerate(uniques):
+            label = str(label)
+            if label not in groups:
+                if len(groups) >= self.max_groups:
+                    continue
+                groups[label] = RunningCovariance(self.columns)
+            groups[label].update(values[codes == code])
+
+    def correlation(self, column=None, label=None):
+        """The overall matrix, or the one for rows where `column` equals `label`"""
+        if column is None:
+            return self.overall.correlation()
+        return self.groups[column][label].correlation()
+
+    def scopes(self):
+        """[(column, label, rows)] for every tracked split, overall first"""
+        scopes = [(None, None, self.overall.rows)]
+        for column, groups in self.groups.items():
+            scopes.extend((column, label, stats.rows) for label, stats in sorted(groups.items()))
+        return scopes
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from instrumentation_module import timed
+
+# In-flight requests, rows per request, queued rows before the oldest are shed, seconds per row batch
+DISPATCH_CONCURRENCY = int(os.environ.get("DISPATCH_CONCURRENCY", 4))
+DISPATCH_BATCH_ROWS = int(os.environ.get("DISPATCH_BATCH_ROWS", 1_000))
+DISPATCH_QUEUE_ROWS = int(os.environ.get("DISPATCH_QUEUE_ROWS", 20_000))
+DISPATCH_DEADLINE = float(os.environ.get("DISPATCH_DEADLINE", 30.0))
+
+
+def placeholder_records(count, reason):
+    """Prediction rows for telemetry that got no prediction, so positions stay aligned"""
+    return [{"Recording": None, "Predicted_Fault": None, "Prediction_Message": reason} for _ in range(count)]
+
+
+class PredictionDispatcher:
+    """Concurrent prediction requests with a bounded in-flight window
+
+    Rows are submitted from any thread; an asyncio loop on its own thread
+    coalesces queued rows into batches of up to batch_rows and keeps at most
+    `concurrency` requests in flight, each on a worker thread running the
+    blocking client.
+
+    - Deadlines: a batch must be answered within `deadline` seconds of its
+      oldest row's submission; one still queued past that is not sent, and
+      the remaining budget is the request timeout.
+    - Load shedding: when more than queue_rows rows are waiting, the oldest
+      are dropped, since fresh telemetry matters more than a backlog.
+    - Ordering: completed() hands results back in row-position order however
+      the requests finish. Shed, expired or failed rows come back as
+      placeholder records, so prediction positions keep matching telemetry
+      positions.
+    """
+
+    def __init__(self, client, concurrency=DISPATCH_CONCURRENCY, batch_rows=DISPATCH_BATCH_ROWS,
+                 queue_rows=DISPATCH_QUEUE_ROWS, deadline=DISPATCH_DEADLINE):
+        self.client = client
+        self.concurrency = concurrency
+        self.batch_rows = batch_rows
+        self.queue_rows = queue_rows
+        self.deadline = deadline
+        self.counters = {"submitted_rows": 0, "predicted_rows": 0, "shed_rows": 0,
+                         "expired_rows": 0, "failed_rows": 0}
+        # Loop-thread state: queued (first_position, frame, submitted_at) pieces
+        self._queue = deque()
+        self._queued_rows = 0
+        self._in_flight = 0
+        # Finished batches by first position, guarded by _lock: (count, records, status)
+        self._done = {}
+        self._next_position = None
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._executor = None
+        self._wake = None
+        self._stopping = False
+
+    def start(self):
+        if self._thread is None:
+            self._loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="predict")
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._wake = asyncio.Event()
+        workers = [self._loop.create_task(self._worker()) for _ in range(self.concurrency)]
+        try:
+            self._loop.run_forever()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._loop.run_until_complete(asyncio.gather(*workers, return_exceptions=True))
+            self._loop.close()
+
+    def stop(self):
+        if self._thread is not None:
+            with self._lock:
+                # Rows submitted from here on are dropped rather than sent to a closed loop
+                self._stopping = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._thread = None
+
+    def submit(self, frame):
+        """Queue rows for prediction; the frame's index holds their telemetry positions"""
+        if frame.empty:
+            return
+        with self._lock:
+            if self._stopping:
+                return
+            if self._thread is None:
+                raise RuntimeError("dispatcher not started; call start() before submit()")
+            if self._next_position is None:
+                self._next_position = int(frame.index[0])
+            self.counters["submitted_rows"] += len(frame)
+            self._loop.call_soon_threadsafe(self._enqueue, frame, time.monotonic())
+
+    def _enqueue(self, frame, submitted_at):
+        self._queue.append((int(frame.index[0]), frame, submitted_at))
+        self._queued_rows += len(frame)
+        while self._queued_rows > self.queue_rows and len(self._queue) > 1:
+            first_position, shed, _ = self._queue.popleft()
+            self._queued_rows -= len(shed)
+            self._finish(first_position, len(shed), placeholder_records(len(shed), "Shed: prediction queue full"), "shed")
+        self._wake.set()
+
+    def _take_batch(self):
+        """Coalesce queued pieces into one batch of at most batch_rows rows"""
+        pieces = [self._queue.popleft()]
+        rows = len(pieces[0][1])
+        while self._queue and rows + len(self._queue[0][1]) <= self.batch_rows:
+            pieces.append(self._queue.popleft())
+            rows += len(pieces[-1][1])
+        self._queued_rows -= rows
+        frame = pieces[0][1] if len(pieces) == 1 else pd.concat([piece[1] for piece in pieces])
+        return pieces[0][0], frame, pieces[0][2]
+
+    async def _worker(self):
+        while True:
+            while not self._queue:
+                self._wake.clear()
+                await self._wake.wait()
+            first_position, frame, submitted_at = self._take_batch()
+            remaining = submitted_at + self.deadline - time.monotonic()
+            if remaining <= 0:
+                self._finish(first_position, len(frame), placeholder_records(len(frame), "Expired: prediction deadline passed"), "deadline")
+                continue
+            self._in_flight += 1
+            try:
+                with timed("dispatch.request", rows=len(frame)):
+                    results, status = await asyncio.wait_for(
+                        self._loop.run_in_executor(self._executor, self.client.predict, frame, remaining),
+                        remaining
+                    )
+            except asyncio.TimeoutError:
+                results, status = None, "deadline"
+            except Exception as error:
+                results, status = None, type(error).__name__
+            finally:
+                self._in_flight -= 1
+            if results is not None and len(results) != len(frame):
+                results, status = None, "mismatched results"
+            if results is None:
+                reason = "Expired: prediction deadline passed" if status == "deadline" else f"Failed: {status}"
+                results = placeholder_records(len(frame), reason)
+            self._finish(first_position, len(frame), results, status)
+
+    def _finish(self, first_position, count, records, status):
+        counter = {"shed": "shed_rows", "deadline": "expired_rows", 200: "predicted_rows"}.get(status, "failed_rows")
+        with self._lock:
+            self._done[first_position] = (count, records, status)
+            self.counters[counter] += count
+
+    def completed(self):
+        """Finished batches in position order: [(first_position, records, status)], stopping at the first gap"""
+        ready = []
+        with self._lock:
+            while self._next_position in self._done:
+                count, records, status = self._done.pop(self._next_position)
+                ready.append((self._next_position, records, status))
+                self._next_position += count
+        return ready
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats.update({"queued_rows": self._queued_rows, "in_flight": self._in_flight})
+        return stats
@@ -0,0 +1,559 @@
+"""Telemetry ingestion and prediction pipeline, shared by the dashboard and the headless service.
+
+The dashboard runs the pipeline inside its live fragment. Run standalone, the
+service keeps ingesting with no viewer connected and serves the collected
+rows to any number of dashboard processes over a local HTTP socket, and
+optionally publishes the newest telemetry to a shared-memory segment that
+dashboard processes on the same host map directly:
+
+    python ingest_module.py --port 8766 --interval 5 --shm vehicle_telemetry
+    INGEST_URL=http://127.0.0.1:8766 TELEMETRY_SHM=vehicle_telemetry streamlit run Fault-Dashboard.py
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from alerts_module import AlertManager, DEFAULT_VEHICLE_ID
+from anomaly_module import StreamingAnomalyDetector
+from correlation_module import CorrelationTracker
+from dispatch_module import (
+    PredictionDispatcher, DISPATCH_BATCH_ROWS, DISPATCH_QUEUE_ROWS, DISPATCH_DEADLINE, placeholder_records
+)
+from instrumentation_module import timed
+from lazy_module import lazy_import
+from predictions_module import PredictionStore
+from retention_module import to_arrow
+from rules_module import RuleEngine
+from scenario_module import ScenarioEngine, SCENARIOS
+from sharedmem_module import TelemetrySegment, SEGMENT_CAPACITY, segment_schema
+from telemetry_module import TelemetryStore
+
+requests = lazy_import("requests")
+
+FASTAPI_URL = os.environ.get("FASTAPI_URL", "https://fault-prediction-api.onrender.com/predict")
+# Rows per /telemetry or /predictions response; a new viewer catches up over a few ticks
+SYNC_LIMIT = 10_000
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+# Prediction batch format: "auto" sends CSV until the API lists "arrow" in its
+# X-Predict-Formats response header; "arrow" or "csv" force one
+PREDICT_FORMAT = os.environ.get("PREDICT_FORMAT", "auto")
+# Buffer codec for Arrow batches: zstd, lz4 or none
+PREDICT_COMPRESSION = os.environ.get("PREDICT_COMPRESSION", "zstd")
+# Below this many rows the Arrow schema outweighs the data and CSV is smaller
+PREDICT_BINARY_MIN_ROWS = int(os.environ.get("PREDICT_BINARY_MIN_ROWS", 64))
+
+logger = logging.getLogger(__name__)
+
+
+def generate_row():
+
+    is_fault = random.random() > 0.85  # n% Fault
+    status = "Fault" if is_fault else "Normal"
+
+    def choose(normal_range, fault_range, is_float=False, round_to=0):
+        if is_fault:
+            val = np.random.uniform(*fault_range) if is_float else np.random.randint(*fault_range)
+        else:
+            val = np.random.uniform(*normal_range) if is_float else np.random.randint(*normal_range)
+        return round(val, round_to) if is_float else val
+
+    return {
+        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Engine_RPM": choose((900, 2000), (4000, 6000)),
+        "Coolant_Temp_C": choose((85, 95), (100, 120)),
+        "Oil_Temp_C": choose((80, 95), (110, 130)),
+        "Idle_Status": np.random.choice(["False", "True"], p=[0.8, 0.2]),
+        "Engine_Load_Percent": choose((25, 50), (80, 100)),
+        "Ignition_Timing_Deg": choose((5, 20), (-5, 0)),
+        "MAP_kPa": choose((30, 60), (80, 100)),
+        "MAF_gps": choose((5, 15), (60, 150), is_float=True, round_to=1),
+        "Battery_Voltage_V": choose((13.5, 14.2), (11.0, 12.0), is_float=True, round_to=1),
+        "Charging_System_Status": np.random.choice(["Normal", "Fault"], p=[0.9, 0.1]),
+        "O2_Sensor_V": choose((0.6, 0.8), (0.1, 0.2), is_float=True, round_to=2),
+        "Catalytic_Converter_Percent": choose((90, 99), (70, 80)),
+        "EGR_Status": np.random.choice(["Open", "Closed", "Stuck_Open"], p=[0.5, 0.4, 0.1]),
+        "Vehicle_Speed_kmh": choose((40, 90), (150, 200)),
+        "Transmission_Gear": np.random.choice(
+            ["P", "R", "N", "D", "1", "2", "3", "4", "5", "6"],
+            p=[0.1, 0.05, 0.05, 0.5, 0.05, 0.05, 0.07, 0.07, 0.04, 0.02]
+        ),
+        "Brake_Status": np.random.choice(["Released", "Engaged"], p=[0.85, 0.15]),
+        "Tire_Pressure_psi": choose((30, 34), (20, 26)),
+        "Ambient_Temp_C": choose((20, 30), (35, 40)),
+        "Battery_Age_Months": choose((6, 24), (48, 72), is_float=True, round_to=1),
+        "Fuel_Level_Percent": choose((50, 100), (0, 15)),
+        "Status": status
+    }
+
+
+def init_stores(state):
+    """Create the stores the pipeline needs in a mapping (Streamlit session state or a plain dict)"""
+    if 'telemetry_store' not in state:
+        state['telemetry_store'] = TelemetryStore()
+    if 'telemetry_version' not in state:
+        state['telemetry_version'] = 0
+    if 'prediction_store' not in state:
+        state['prediction_store'] = PredictionStore()
+    if 'anomaly_detector' not in state:
+        state['anomaly_detector'] = StreamingAnomalyDetector()
+    if 'rule_engine' not in state:
+        state['rule_engine'] = RuleEngine()
+    if 'alert_manager' not in state:
+        state['alert_manager'] = AlertManager()
+    if 'correlation_tracker' not in state:
+        tracker = state['correlation_tracker'] = CorrelationTracker()
+        # Catch up once on rows stored before the tracker existed
+        if not state['telemetry_store'].empty:
+            tracker.update(state['telemetry_store'].frame)
+    return state
+
+
+def ingest_telemetry(state, frame):
+    """Store new rows and run the local anomaly and rule checks; return the rows indexed by position"""
+    # The store also folds the rows into its 1 min / 10 min / 1 h rollups
+    frame = state['telemetry_store'].append(frame)
+    state['telemetry_version'] += 1
+
+    # Local anomaly scoring runs before the API call so it alerts even when the API is slow or down
+    state['anomaly_detector'].update_many(frame)
+    state['correlation_tracker'].update(frame)
+    alert_manager = state['alert_manager']
+    alert_manager.ingest_rule_events(state['rule_engine'].events(frame))
+    if len(frame):
+        alert_manager.hold_rule_state(state['rule_engine'].current_severity(), position=int(frame.index[-1]))
+    # After the rule state is applied, so a breach that is still ongoing is not expired
+    alert_manager.expire()
+    return frame
+
+
+class PredictionClient:
+    """Prediction API client that negotiates a binary batch format
+
+    Every backend accepts the multipart CSV upload, so negotiation starts
+    there and switches to an Arrow IPC stream with compressed buffers once a
+    response lists "arrow" in X-Predict-Formats. A binary batch answered with
+    415 drops the client back to CSV for good and is resent as CSV. Batches
+    under binary_min_rows rows (a single live tick) stay CSV, which is smaller
+    there.
+    """
+
+    def __init__(self, url=FASTAPI_URL, batch_format=PREDICT_FORMAT, compression=PREDICT_COMPRESSION,
+                 binary_min_rows=PREDICT_BINARY_MIN_ROWS):
+        if batch_format not in ("auto", "arrow", "csv"):
+            raise ValueError(f"batch_format must be auto, arrow or csv, got {batch_format!r}")
+        self.url = url
+        self.negotiate = batch_format == "auto"
+        self.batch_format = "csv" if self.negotiate else batch_format
+        self.compression = None if compression in (None, "", "none") else compression
+        self.binary_min_rows = binary_min_rows
+
+    def _file(self, frame, batch_format):
+        if batch_format == "arrow":
+            # The pandas metadata is a few KB of JSON the backend does not need
+            table = to_arrow(frame).combine_chunks().replace_schema_metadata(None)
+            payload = table_to_ipc(table, self.compression)
+            return ('batch.arrows', payload.to_pybytes(), ARROW_STREAM_TYPE)
+        return ('simulated_data.csv', frame.to_csv(index=False), 'text/csv')
+
+    def predict(self, frame, timeout=None):
+        """Send rows for prediction; return (results, status_code), results None on failure"""
+        with timed("predict_call", rows=len(frame)):
+            batch_format = self.batch_format if len(frame) >= self.binary_min_rows else "csv"
+            response = requests.post(self.url, files={'file': self._file(frame, batch_format)}, timeout=timeout)
+            if response.status_code == 415 and batch_format != "csv":
+                self.batch_format, self.negotiate = "csv", False
+                response = requests.post(self.url, files={'file': self._file(frame, "csv")}, timeout=timeout)
+        if self.negotiate:
+            formats = response.headers.get("X-Predict-Formats", "")
+            if "arrow" in [item.strip() for item in formats.split(",")]:
+                self.batch_format, self.negotiate = "arrow", False
+        if response.status_code == 200 and response.json().get("status") == "success":
+            return response.json()["results"], response.status_code
+        return None, response.status_code
+
+
+_prediction_clients = {}
+
+
+def request_predictions(frame, url=FASTAPI_URL, timeout=None):
+    """Send rows to the prediction API in the negotiated format; return (results, status_code)"""
+    client = _prediction_clients.get(url)
+    if client is None:
+        # One client per API URL and process, so the negotiated format is remembered
+        client = _prediction_clients[url] = PredictionClient(url)
+    return client.predict(frame, timeout)
+
+
+def predict_rows(frame, url=FASTAPI_URL, timeout=None):
+    """One prediction record per row of frame; return (records, status_code)
+
+    A failed call, or one answering with a different number of rows, yields
+    placeholder records like the dispatcher's, so prediction positions keep
+    matching telemetry positions. Only a 200 status carries real predictions.
+    """
+    try:
+        results, status_code = request_predictions(frame, url, timeout)
+    except requests.RequestException as error:
+        results, status_code = None, type(error).__name__
+    if results is not None and len(results) != len(frame):
+        results, status_code = None, "mismatched results"
+    if results is None:
+        return placeholder_records(len(frame), f"Failed: {status_code}"), status_code
+    return results, status_code
+
+
+def ingest_predictions(state, results, first_position=None):
+    """Append predictions for the telemetry rows from `first_position` (default: the next prediction position) on
+
+    Prediction positions are telemetry positions: rows that got no prediction
+    are filled with placeholder records and rows already predicted are skipped.
+    """
+    store_length = len(state['prediction_store'])
+    if first_position is None:
+        first_position = store_length
+    if first_position > store_length:
+        results = placeholder_records(first_position - store_length, "Missing: no prediction received") + list(results)
+    else:
+        results = list(results)[store_length - first_position:]
+    if not results:
+        return
+    first_position = store_length
+    state['prediction_store'].append(results)
+    state['alert_manager'].ingest_predictions(results, first_position=first_position)
+    # Fault-conditional correlations by predicted fault, over the telemetry rows the results belong to
+    telemetry = state['telemetry_store'].rows(first_position, first_position + len(results))
+    offset = int(telemetry.index[0]) - first_position if len(telemetry) else 0
+    labels = [record.get('Predicted_Fault') for record in results[offset:offset + len(telemetry)]]
+    state['correlation_tracker'].update_labels('Predicted_Fault', labels, telemetry)
+
+
+def report_api_failure(state, status_code):
+    """Record a failing API as an alert; True only for the first failure of an incident"""
+    return state['alert_manager'].observe(DEFAULT_VEHICLE_ID, 'api', f"HTTP {status_code}", 'warning', debounce=1)
+
+
+def frame_to_json(frame):
+    return json.dumps({
+        "columns": list(frame.columns),
+        "index": frame.index.tolist(),
+        "data": frame.to_numpy(dtype=object).tolist()
+    }, default=str)
+
+
+def frame_from_json(text):
+    payload = json.loads(text)
+    return pd.DataFrame(payload["data"], columns=payload["columns"], index=pd.Index(payload["index"], dtype="int64"))
+
+
+def table_to_ipc(table, compression=None):
+    """Arrow IPC stream bytes; the columns' buffers are written as they are, without text encoding"""
+    sink = pa.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema, options=ipc.IpcWriteOptions(compression=compression)) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def frame_from_ipc(payload, first_position):
+    frame = ipc.open_stream(payload).read_all().to_pandas()
+    return frame.set_axis(pd.RangeIndex(first_position, first_position + len(frame)))
+
+
+class IngestionService:
+    """Headless ingestion loop: generate rows, store them, score them and predict, every `interval` seconds
+
+    With concurrency 0 each tick waits for its own prediction call. Above
+    that, ticks hand their rows to a PredictionDispatcher and ingest
+    whatever predictions have come back, in row order, so a slow API no
+    longer limits the ingest rate.
+
+    With a scenario, each tick generates rows_per_tick time steps of a
+    single-vehicle ScenarioEngine (time-correlated signals, gradual faults)
+    instead of independent generate_row() rows. The anomaly detector, rule
+    engine, alerts and stores each follow one series, so fleets are left to
+    ScenarioEngine callers that partition the rows by Vehicle_ID themselves.
+    """
+
+    def __init__(self, predict_url=FASTAPI_URL, interval=5.0, timeout=30,
+                 segment_name=None, segment_path=None, segment_capacity=SEGMENT_CAPACITY,
+                 rows_per_tick=1, concurrency=0, batch_rows=DISPATCH_BATCH_ROWS,
+                 queue_rows=DISPATCH_QUEUE_ROWS, deadline=DISPATCH_DEADLINE,
+                 scenario=None, seed=None):
+        self.predict_url = predict_url
+        self.interval = interval
+        self.timeout = timeout
+        self.rows_per_tick = rows_per_tick
+        self.scenario = None
+        if scenario:
+            self.scenario = ScenarioEngine(scenario, seed=seed, step_seconds=interval / rows_per_tick)
+        self.dispatcher = None
+        if predict_url and concurrency > 0:
+            self.dispatcher = PredictionDispatcher(
+                PredictionClient(predict_url), concurrency, batch_rows, queue_rows, deadline
+            )
+        self.segment_name = segment_name
+        self.segment_path = segment_path
+        self.segment_capacity = segment_capacity
+        # Created from the first batch's column types
+        self.segment = None
+        self.state = init_stores({})
+        # Guards the stores between the ingest loop and the HTTP handler threads
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def tick(self):
+        with timed("ingest.tick", rows=self.rows_per_tick):
+            if self.scenario is not None:
+                # The last step is stamped now, the earlier ones spread back over the tick
+                start_time = datetime.now() - timedelta(seconds=self.scenario.step_seconds * (self.rows_per_tick - 1))
+                batch = self.scenario.generate(self.rows_per_tick, start_time=start_time)
+            else:
+                batch = pd.DataFrame([generate_row() for _ in range(self.rows_per_tick)])
+            with self.lock:
+                frame = ingest_telemetry(self.state, batch)
+            if self.segment_name or self.segment_path:
+                self.publish(frame)
+            if not self.predict_url:
+                return
+            if self.dispatcher is not None:
+                self.dispatcher.submit(frame)
+                self.collect()
+                return
+            records, status_code = predict_rows(frame, self.predict_url, self.timeout)
+            with self.lock:
+                ingest_predictions(self.state, records, first_position=int(frame.index[0]))
+                if status_code != 200 and report_api_failure(self.state, status_code):
+                    logger.warning("prediction API failed: %s", status_code)
+
+    def collect(self):
+        """Ingest the dispatcher's finished predictions, in row order"""
+        for first_position, records, status in self.dispatcher.completed():
+            with self.lock:
+                ingest_predictions(self.state, records, first_position=first_position)
+                if status not in (200, "shed") and report_api_failure(self.state, status):
+                    logger.warning("prediction API failed: %s", status)
+
+    def run(self):
+        """Tick until stop() is called; a slow tick delays the next one rather than overlapping it"""
+        if self.dispatcher is not None:
+            self.dispatcher.start()
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("ingest tick failed")
+            self.stopped.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def publish(self, frame):
+        """Copy new rows into the shared-memory segment (the segment's own seqlock covers readers)"""
+        if self.stopped.is_set():
+            return
+        if self.segment is None:
+            self.segment = TelemetrySegment.create(
+                self.segment_name, segment_schema(frame), self.segment_capacity, path=self.segment_path
+            )
+            # Rows from before the segment existed (none for a fresh service)
+            frame = self.state['telemetry_store'].rows()
+        with timed("ingest.publish", rows=len(frame)):
+            self.segment.write(frame)
+
+    def stop(self):
+        self.stopped.set()
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+        if self.segment is not None:
+            self.segment.close()
+            self.segment = None
+
+    def status(self):
+        with self.lock:
+            return {
+                "telemetry_rows": len(self.state['telemetry_store']),
+                "prediction_rows": len(self.state['prediction_store']),
+                "telemetry_version": self.state['telemetry_version'],
+                "open_alerts": self.state['alert_manager'].open_count(),
+                "dispatch": self.dispatcher.stats() if self.dispatcher is not None else None
+            }
+
+    def telemetry(self, since=0, limit=SYNC_LIMIT, arrow=False):
+        """(first position, rows) of the telemetry rows from `since` that are still retained"""
+        return self._read('telemetry_store', since, limit, arrow)
+
+    def predictions(self, since=0, limit=SYNC_LIMIT, arrow=False):
+        """(first position, rows) of the predictions from `since` that are still retained"""
+        return self._read('prediction_store', since, limit, arrow)
+
+    def _read(self, key, since, limit, arrow):
+        # Under one lock hold, so retention cannot drop rows between the cut-off and the read
+        with self.lock:
+            store = self.state[key]
+            first_position = max(since, store.first_position)
+            rows = store.arrow(since, since + limit) if arrow else store.rows(since, since + limit)
+        return first_position, rows
+
+
+class _IngestHandler(BaseHTTPRequestHandler):
+    # GET /status, /telemetry?since=N&limit=M, /predictions?since=N&limit=M
+    # Rows are sent as an Arrow IPC stream to clients that accept it, else as JSON
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: int(values[-1]) for key, values in parse_qs(url.query).items() if values[-1].isdigit()}
+        service = self.server.service
+        headers = {}
+        if url.path == "/status":
+            payload, content_type = json.dumps(service.status()).encode(), "application/json"
+        elif url.path in ("/telemetry", "/predictions"):
+            read = service.telemetry if url.path == "/telemetry" else service.predictions
+            since, limit = query.get("since", 0), min(query.get("limit", SYNC_LIMIT), SYNC_LIMIT)
+            if ARROW_STREAM_TYPE in self.headers.get("Accept", ""):
+                first_position, table = read(since, limit, arrow=True)
+                # Rows before a retention cut-off are gone; tell the client where these start
+                headers["X-First-Position"] = str(first_position)
+                payload, content_type = table_to_ipc(table), ARROW_STREAM_TYPE
+            else:
+                # The JSON index carries the positions
+                _, frame = read(since, limit)
+                payload, content_type = frame_to_json(frame).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_service(service, host="127.0.0.1", port=0):
+    """Run the ingest loop and its HTTP server on background threads; return (server, url)"""
+    server = ThreadingHTTPServer((host, port), _IngestHandler)
+    server.service = service
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    threading.Thread(target=service.run, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+class IngestClient:
+    """Reads telemetry and predictions from a running IngestionService
+
+    With segment_name or segment_path, telemetry still held by the service's
+    shared-memory segment is read from it directly; older rows (a new viewer
+    catching up) and predictions go over HTTP.
+    """
+
+    def __init__(self, url, timeout=10, segment_name=None, segment_path=None):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.segment_name = segment_name
+        self.segment_path = segment_path
+        self._segment = None
+
+    def segment(self):
+        """The mapped segment, or None until the service has created it"""
+        if self._segment is None and (self.segment_name or self.segment_path):
+            try:
+                self._segment = TelemetrySegment.attach(self.segment_name, path=self.segment_path)
+            except (FileNotFoundError, ValueError):
+                return None
+        return self._segment
+
+    def _get(self, path, **params):
+        response = requests.get(f"{self.url}{path}", params=params, timeout=self.timeout,
+                                headers={"Accept": f"{ARROW_STREAM_TYPE}, application/json"})
+        response.raise_for_status()
+        return response
+
+    def _rows(self, path, since, limit):
+        response = self._get(path, since=since, limit=limit)
+        if response.headers.get("Content-Type", "").startswith(ARROW_STREAM_TYPE):
+            return frame_from_ipc(response.content, int(response.headers.get("X-First-Position", since)))
+        return frame_from_json(response.text)
+
+    def status(self):
+        return self._get("/status").json()
+
+    def telemetry(self, since=0, limit=SYNC_LIMIT):
+        segment = self.segment()
+        # A segment shorter than `since` belongs to a restarted service; fall back to HTTP
+        if segment is not None and segment.first_position <= since <= len(segment):
+            return segment.read(since, limit)
+        return self._rows("/telemetry", since, limit)
+
+    def predictions(self, since=0, limit=SYNC_LIMIT):
+        return self._rows("/predictions", since, limit)
+
+
+def sync_from_service(state, client, limit=SYNC_LIMIT):
+    """Pull the rows added since the last sync into local stores; return the number of new telemetry rows
+
+    The anomaly and rule checks rerun locally on the new rows, so alerts match
+    what the service saw without shipping its detector state. Rows the service
+    dropped before they were pulled are skipped, and service positions are
+    shifted so predictions still land on their telemetry rows locally.
+    """
+    # Local position minus service position
+    offset = state.get('service_offset', 0)
+    frame = client.telemetry(len(state['telemetry_store']) - offset, limit)
+    if not frame.empty:
+        offset = state['service_offset'] = len(state['telemetry_store']) - int(frame.index[0])
+        ingest_telemetry(state, frame)
+    predictions = client.predictions(len(state['prediction_store']) - offset, limit)
+    if not predictions.empty:
+        ingest_predictions(state, predictions.to_dict('records'), first_position=int(predictions.index[0]) + offset)
+    return len(frame)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between ticks")
+    parser.add_argument("--rows-per-tick", type=int, default=1,
+                        help="rows generated per tick")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS),
+                        help="generate time-correlated telemetry from a scenario instead of independent rows")
+    parser.add_argument("--seed", type=int, help="scenario random seed, for reproducible runs")
+    parser.add_argument("--predict-url", default=FASTAPI_URL, help="prediction API; empty to skip predictions")
+    parser.add_argument("--shm", help="publish telemetry to a shared-memory segment with this name")
+    parser.add_argument("--shm-path", help="publish telemetry to a memory-mapped file instead")
+    parser.add_argument("--shm-capacity", type=int, default=SEGMENT_CAPACITY, help="rows kept in the segment")
+    parser.add_argument("--concurrency", type=int, default=0,
+                        help="prediction requests in flight; 0 predicts inline, one call per tick")
+    parser.add_argument("--batch-rows", type=int, default=DISPATCH_BATCH_ROWS, help="rows per prediction request")
+    parser.add_argument("--queue-rows", type=int, default=DISPATCH_QUEUE_ROWS,
+                        help="queued rows before the oldest are shed")
+    parser.add_argument("--deadline", type=float, default=DISPATCH_DEADLINE,
+                        help="seconds a row may wait for its prediction")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    service = IngestionService(args.predict_url, args.interval, segment_name=args.shm,
+                               segment_path=args.shm_path, segment_capacity=args.shm_capacity,
+                               rows_per_tick=args.rows_per_tick, concurrency=args.concurrency,
+                               batch_rows=args.batch_rows, queue_rows=args.queue_rows, deadline=args.deadline,
+                               scenario=args.scenario, seed=args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), _IngestHandler)
+    server.service = service
+    threading.Thread(target=service.run, daemon=True).start()
+    print(f"Ingestion service on http://{args.host}:{args.port} (status at /status)")
+    try:
+        server.serve_forever()
+    finally:
+        service.stop()
@@ -0,0 +1,244 @@
+import cProfile
+import json
+import os
+import pstats
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import ContextDecorator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+QUANTILES = (50, 95, 99)
+
+
+class StageStats:
+    """Bounded histogram of recent durations for one pipeline stage"""
+
+    def __init__(self, max_samples):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.total_rows = 0
+
+    def add(self, seconds, rows):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total_seconds += seconds
+        if rows:
+            self.total_rows += rows
+
+
+class TimingRegistry:
+    """Process-wide per-stage timings shared by every session of the server"""
+
+    def __init__(self, max_samples=1000):
+        self.max_samples = max_samples
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, rows=None):
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats(self.max_samples)
+            stats.add(seconds, rows)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def summary(self):
+        """Return one dict per stage with count, mean, p50/p95/p99 (ms) and rows/sec"""
+        with self._lock:
+            snapshot = {stage: (np.array(stats.samples), stats.count, stats.total_seconds, stats.total_rows)
+                        for stage, stats in self._stages.items()}
+
+        rows = []
+        for stage, (samples, count, total_seconds, total_rows) in sorted(snapshot.items()):
+            quantiles = np.percentile(samples, QUANTILES) * 1000 if len(samples) else [0.0] * len(QUANTILES)
+            row = {"stage": stage, "count": count, "mean_ms": total_seconds / count * 1000 if count else 0.0}
+            row.update({f"p{q}_ms": value for q, value in zip(QUANTILES, quantiles)})
+            row["rows_per_sec"] = total_rows / total_seconds if total_rows and total_seconds > 0 else None
+            rows.append(row)
+        return rows
+
+    def to_json(self):
+        return json.dumps({"generated_at": time.time(), "stages": self.summary()}, indent=2)
+
+    def to_prometheus(self):
+        """Render the summary in the Prometheus text exposition format"""
+        lines = [
+            "# HELP dashboard_stage_seconds Wall time per dashboard pipeline stage",
+            "# TYPE dashboard_stage_seconds summary"
+        ]
+        for row in self.summary():
+            label = row["stage"].replace("\\", "\\\\").replace('"', '\\"')
+            for q in QUANTILES:
+                lines.append(f'dashboard_stage_seconds{{stage="{label}",quantile="{q / 100}"}} {row[f"p{q}_ms"] / 1000:.6f}')
+            lines.append(f'dashboard_stage_seconds_sum{{stage="{label}"}} {row["mean_ms"] * row["count"] / 1000:.6f}')
+            lines.append(f'dashboard_stage_seconds_count{{stage="{label}"}} {row["count"]}')
+            if row["rows_per_sec"] is not None:
+                lines.append(f'dashboard_stage_rows_per_second{{stage="{label}"}} {row["rows_per_sec"]:.3f}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = TimingRegistry()
+
+
+class timed(ContextDecorator):
+    """Time a block or function into the registry under a stage name
+
+        with timed("predict_call") as timer:
+            ...
+            timer.rows = len(batch)
+
+        @timed("simulate_data")
+        def simulate_data(): ...
+    """
+
+    def __init__(self, stage, rows=None, registry=None):
+        self.stage = stage
+        self.rows = rows
+        self.registry = registry or REGISTRY
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.record(self.stage, time.perf_counter() - self._start, self.rows)
+        return False
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = REGISTRY.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = REGISTRY.to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+_metrics_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host="127.0.0.1"):
+    """Serve /metrics (Prometheus) and /metrics.json once per process
+
+    Disabled unless a port is given or the METRICS_PORT environment variable is set.
+    """
+    global _metrics_server
+    port = port or os.environ.get("METRICS_PORT")
+    if not port:
+        return None
+    with _metrics_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_metrics_server.serve_forever, daemon=True).start()
+    return _metrics_server
+
+
+def diagnostics_enabled():
+    """The diagnostics panel is hidden unless the page is opened with ?diagnostics=1"""
+    import streamlit as st
+
+    return st.query_params.get("diagnostics") == "1"
+
+
+def render_diagnostics_panel(storage=None):
+    """Sidebar view of per-stage latency percentiles with JSON/Prometheus downloads
+
+    storage optionally maps a name to a store with memory_usage() (telemetry,
+    predictions); their rows and bytes per retention tier are listed too.
+    """
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Diagnostics", expanded=True):
+        summary = REGISTRY.summary()
+        if summary:
+            table = pd.DataFrame(summary).set_index("stage")
+            st.dataframe(table.round(2), use_container_width=True)
+            st.download_button("Timings (JSON)", REGISTRY.to_json(), file_name="timings.json",
+                               mime="application/json", key="diagnostics_json")
+            st.download_button("Timings (Prometheus)", REGISTRY.to_prometheus(), file_name="timings.prom",
+                               mime="text/plain", key="diagnostics_prometheus")
+        else:
+            st.caption("No timings recorded yet")
+        if st.button("Reset timings", key="diagnostics_reset"):
+            REGISTRY.reset()
+        if st.button("Profile next rerun", key="diagnostics_profile"):
+            st.session_state["profile_next_rerun"] = True
+        if storage:
+            from retention_module import storage_report
+
+            st.caption("Storage by tier")
+            st.dataframe(storage_report(storage).round(3), use_container_width=True, hide_index=True)
+
+
+def profile_stats_table(profile, limit=25):
+    """Top functions of a cProfile run by cumulative time"""
+    import pandas as pd
+
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({function})",
+            "ncalls": ncalls,
+            "tottime_s": tottime,
+            "cumtime_s": cumtime
+        })
+    table = pd.DataFrame(rows, columns=["function", "ncalls", "tottime_s", "cumtime_s"])
+    return table.sort_values("cumtime_s", ascending=False).head(limit).reset_index(drop=True)
+
+
+def run_page(page_fn):
+    """Run a page function, under cProfile when one profiled rerun was requested
+
+    A rerun is profiled when the URL carries ?profile=1 (the parameter is
+    removed afterwards so only one rerun pays the overhead) or when
+    "Profile next rerun" was pressed in the diagnostics panel.
+    """
+    import streamlit as st
+
+    requested = st.query_params.get("profile") == "1" or st.session_state.pop("profile_next_rerun", False)
+    if not requested:
+        return page_fn()
+
+    if "profile" in st.query_params:
+        del st.query_params["profile"]
+
+    profile = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        return profile.runcall(page_fn)
+    finally:
+        elapsed = time.perf_counter() - start
+        with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as handle:
+            path = handle.name
+        profile.dump_stats(path)
+        with open(path, "rb") as handle:
+            profile_bytes = handle.read()
+        os.unlink(path)
+
+        with st.expander(f"Profile of this rerun ({elapsed * 1000:.0f} ms)", expanded=True):
+            st.dataframe(profile_stats_table(profile), use_container_width=True, hide_index=True)
+            st.download_button("Download profile (.prof)", profile_bytes, file_name="rerun.prof",
+                               mime="application/octet-stream", key="profile_download")
+            st.caption("Open with: python -m pstats rerun.prof  or  snakeviz rerun.prof")
@@ -0,0 +1,29 @@
+import importlib
+
+
+class LazyModule:
+    """Module placeholder that imports the real module on first attribute access
+
+    Used for heavy dependencies that the first render does not need, e.g.
+    plotly.express is only loaded once a chart is drawn.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
@@ -1,10 +1,32 @@
+import io
+import os
+import warnings
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from streamlit_autorefresh import st_autorefresh
+from rules_module import THRESHOLD_RULES, categorize, category_counts
+from refresh_module import schedule_refresh
+from instrumentation_module import timed, diagnostics_enabled, render_diagnostics_panel, run_page
+from lazy_module import lazy_import
+from sharedmem_module import TelemetrySegment, SEGMENT_CAPACITY
+from retention_module import to_arrow
+from correlation_module import CorrelationTracker
+from anomaly_module import SENSOR_COLUMNS
+from profiles_module import (
+    PROFILE_WINDOW_SECONDS, PROFILE_PERCENTILES, fault_types, fault_onsets, event_windows, profile_bands
+)
+
+# Plotly is only needed once there is data to plot
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+plotly_subplots = lazy_import("plotly.subplots")
+parquet = lazy_import("pyarrow.parquet")
+
+# Shared-memory segment published by the ingestion service (python ingest_module.py --shm NAME)
+TELEMETRY_SHM = os.environ.get("TELEMETRY_SHM")
+TELEMETRY_SHM_PATH = os.environ.get("TELEMETRY_SHM_PATH")
+# Newest rows analysed per rerun, the same bound the shared-memory segment keeps
+ANALYTICS_MAX_ROWS = int(os.environ.get("ANALYTICS_MAX_ROWS", SEGMENT_CAPACITY))
 
 TRANSLATIONS = {
     'ar': {
@@ -18,8 +40,19 @@ TRANSLATIONS = {
         'no_data': 'لا توجد بيانات متاحة',
         'data_with_predictions': 'البيانات مع التنبؤات',
         'download_results': 'تحميل النتائج كملف CSV',
+        'download_parquet': 'تحميل النتائج كملف Parquet',
         'stats_overview': 'نظرة عامة على الإحصائيات',
-        'distribution_analysis': 'تحليل التوزيع'
+        'distribution_analysis': 'تحليل التوزيع',
+        'correlation_analysis': 'الارتباط بين الحساسات',
+        'correlation_scope': 'نطاق الارتباط',
+        'all_rows': 'كل السجلات',
+        'correlation_rows': 'السجلات المستخدمة',
+        'fault_profiles': 'سلوك الحساسات قبل وبعد العطل',
+        'fault_type': 'نوع العطل',
+        'profile_window': 'الثواني قبل وبعد بداية العطل',
+        'profile_sensors': 'الحساسات',
+        'profile_events': 'عدد مرات بدء العطل',
+        'window_note': 'الإحصائيات لآخر {rows:,} سجل من أصل {total:,}'
     },
     'en': {
         'analytics_title': 'Data Analytics',
@@ -32,117 +65,241 @@ TRANSLATIONS = {
         'no_data': 'No data available',
         'data_with_predictions': 'Data with Predictions',
         'download_results': 'Download Results as CSV',
+        'download_parquet': 'Download Results as Parquet',
         'stats_overview': 'Statistics Overview',
-        'distribution_analysis': 'Distribution Analysis'
+        'distribution_analysis': 'Distribution Analysis',
+        'correlation_analysis': 'Cross-Sensor Correlation',
+        'correlation_scope': 'Correlation scope',
+        'all_rows': 'All records',
+        'correlation_rows': 'Records used',
+        'fault_profiles': 'Sensor Profiles Around Fault Onsets',
+        'fault_type': 'Fault type',
+        'profile_window': 'Seconds before and after the onset',
+        'profile_sensors': 'Sensors',
+        'profile_events': 'Fault onsets',
+        'window_note': 'Statistics cover the latest {rows:,} of {total:,} records'
     }
 }
 
 IMPORTANT_COLUMNS = [
-    'Coolant_Temp_C', 'Oil_Temp_C', 'Vehical_Speed_kmh',
+    'Coolant_Temp_C', 'Oil_Temp_C', 'Vehicle_Speed_kmh',
     'Battery_Voltage_V', 'Catalytic_Converter_Percent',
     'Charging_System_Status', 'O2_Sensor_V'
 ]
 
+HISTOGRAM_BINS = 20
+CATEGORY_COLORS = ['#3498db', '#2ecc71', '#f1c40f', '#e74c3c']
+
 def categorize_value(column, value):
-    categories = {
-        "Coolant_Temp_C": {
-            (0, 70): "🔵 منخفض",
-            (70, 90): "🟢 طبيعي", 
-            (90, 105): "🟡 مرتفع",
-            (105, float('inf')): "🔴 خطورة"
-        },
-        "Oil_Temp_C": {
-            (0, 60): "🔵 منخفض",
-            (60, 95): "🟢 طبيعي",
-            (95, 110): "🟡 مرتفع", 
-            (110, float('inf')): "🔴 خطورة"
-        },
-        "Catalytic_Converter_Percent": {
-            (0, 25): "🟢 ممتاز",
-            (25, 50): "🟡 جيد",
-            (50, 75): "🟠 ضعيف",
-            (75, float('inf')): "🔴 خطورة"
-        },
-        "Battery_Voltage_V": {
-            (0, 11.5): "🔴 منخفض",
-            (11.5, 12.2): "🟠 ضعيف",
-            (12.2, 13.5): "🟢 طبيعي",
-            (13.5, float('inf')): "⚡ مرتفع"
-        },
-        "Vehical_Speed_kmh": {
-            (0, 0.1): "🛑 موقف",
-            (0.1, 80): "🟢 قيادة طبيعية",
-            (80, 120): "🟠 سريع",
-            (120, float('inf')): "🔴 مفرط"
-        },
-        "O2_Sensor_V": lambda x: "🔴 غير طبيعي" if x < 0.1 or x > 0.9 else "🟢 طبيعي"
-    }
-    
-    if column not in categories:
-        return "غير معروف"
-    
-    cat_rules = categories[column]
-    if callable(cat_rules):
-        return cat_rules(value)
-    
-    for (min_val, max_val), label in cat_rules.items():
-        if min_val <= value < max_val:
-            return label
-    return "غير معروف"
+    return categorize(column, [value])[0]
 
-def create_column_analysis(data, column):
-    
-    if column not in data.columns or data[column].empty:
-        return None, None
-    
-    col_data = data[column].dropna()
-    
-    stats = {}
-    if pd.api.types.is_numeric_dtype(col_data):
-        stats = {
-            'الحد الأدنى': col_data.min(),
-            'الحد الأقصى': col_data.max(), 
-            'المتوسط': col_data.mean(),
-            'الوسيط': col_data.median(),
-            'الانحراف المعياري': col_data.std()
+def summarize_columns(data, columns, bins=HISTOGRAM_BINS):
+    """Stats, histogram and category counts for every column in one pass over the column block
+
+    Returns {column: {"stats", "histogram", "categories"}}; the figures are
+    built from this small summary instead of from the raw rows.
+    """
+    columns = [col for col in columns if col in data.columns and not data[col].empty]
+    numeric = [col for col in columns if pd.api.types.is_numeric_dtype(data[col])]
+    summary = {col: {"stats": {}, "histogram": None, "categories": {}} for col in columns}
+    if not numeric:
+        return summary
+
+    block = data[numeric].to_numpy(dtype=float, na_value=np.nan)
+    finite = np.isfinite(block)
+    present = finite.any(axis=0)
+    # Missing values are left out, like the dropna() per column; all-missing columns get no stats
+    masked = np.where(finite, block, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        lows = np.nanmin(masked, axis=0)
+        highs = np.nanmax(masked, axis=0)
+        means = np.nanmean(masked, axis=0)
+        medians = np.nanmedian(masked, axis=0)
+        stds = np.nanstd(masked, axis=0, ddof=1)
+
+    # Equal-width bins between each column's min and max, counted for all columns with one bincount
+    spans = np.where(present & (highs > lows), highs - lows, 1.0)
+    offsets = np.where(present, lows, 0.0)
+    positions = np.clip(((np.where(finite, block, offsets) - offsets) / spans * bins).astype(int), 0, bins - 1)
+    flat = (positions + np.arange(len(numeric)) * bins)[finite]
+    histograms = np.bincount(flat, minlength=len(numeric) * bins).reshape(len(numeric), bins)
+
+    for i, col in enumerate(numeric):
+        if not present[i]:
+            continue
+        summary[col]["stats"] = {
+            'الحد الأدنى': lows[i],
+            'الحد الأقصى': highs[i],
+            'المتوسط': means[i],
+            'الوسيط': medians[i],
+            'الانحراف المعياري': stds[i]
         }
-    
-    fig = make_subplots(
+        summary[col]["histogram"] = (histograms[i], offsets[i] + spans[i] * np.arange(bins + 1) / bins)
+        if "categories" in THRESHOLD_RULES.get(col, {}):
+            summary[col]["categories"] = category_counts(col, block[finite[:, i], i])
+    return summary
+
+def create_column_figure(column, column_summary):
+    fig = plotly_subplots.make_subplots(
         rows=1, cols=2,
         subplot_titles=['توزيع القيم', 'توزيع الفئات'],
         specs=[[{"secondary_y": False}, {"type": "pie"}]]
     )
-    
-    #  Histogram - Box Plot
-    if pd.api.types.is_numeric_dtype(col_data):
+
+    # Histogram from the precomputed bins
+    if column_summary["histogram"] is not None:
+        counts, edges = column_summary["histogram"]
         fig.add_trace(
-            go.Histogram(x=col_data, name='توزيع القيم', nbinsx=20),
+            go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), name='توزيع القيم'),
             row=1, col=1
         )
-    
-    if column in ["Coolant_Temp_C", "Oil_Temp_C", "Catalytic_Converter_Percent", "Battery_Voltage_V", "Vehical_Speed_kmh", "O2_Sensor_V"]:
-        categorized = col_data.apply(lambda x: categorize_value(column, x))
-        value_counts = categorized.value_counts()
-        
-        colors = ['#3498db', '#2ecc71', '#f1c40f', '#e74c3c']
-        
+
+    categories = column_summary["categories"]
+    if categories:
         fig.add_trace(
             go.Pie(
-                labels=value_counts.index,
-                values=value_counts.values,
+                labels=list(categories),
+                values=list(categories.values()),
                 hole=0.3,
-                marker_colors=colors[:len(value_counts)]
+                marker_colors=CATEGORY_COLORS[:len(categories)]
             ),
             row=1, col=2
         )
-    
+
     fig.update_layout(
         title_text=f"Analysis {column}",
         height=350,
         showlegend=True
     )
-    
-    return stats, fig
+    return fig
+
+def create_column_analysis(data, column):
+    """Stats and figure for a single column"""
+    summary = summarize_columns(data, [column])
+    if column not in summary:
+        return None, None
+    return summary[column]["stats"], create_column_figure(column, summary[column])
+
+def display_column_analysis(column, column_summary):
+    st.markdown(f"""
+    <div style='border: 2px solid #007BFF; border-radius: 10px; padding: 8px 0 8px 0; background: #181c24; margin-bottom: 8px;'>
+        <h4 style='color: #007BFF; text-align: center; margin: 0;'>{column}</h4>
+    </div>
+    """, unsafe_allow_html=True)
+    stats = column_summary["stats"]
+
+    # عرض الإحصائيات لجميع الأعمدة الرقمية
+    if stats:
+        st.markdown("الإحصائيات:")
+        stats_col1, stats_col2 = st.columns(2)
+        with stats_col1:
+            st.metric("الحد الأدنى", f"{stats['الحد الأدنى']:.2f}")
+            st.metric("المتوسط", f"{stats['المتوسط']:.2f}")
+        with stats_col2:
+            st.metric("الحد الأقصى", f"{stats['الحد الأقصى']:.2f}")
+            st.metric("الوسيط", f"{stats['الوسيط']:.2f}")
+
+    st.plotly_chart(create_column_figure(column, column_summary), use_container_width=True, key=f"chart_{column}")
+
+@st.cache_resource
+def attach_telemetry_segment(name, path):
+    """Mapped once per server process; raises (and so is not cached) until the service has created it"""
+    return TelemetrySegment.attach(name, path=path)
+
+def load_telemetry():
+    """The newest ANALYTICS_MAX_ROWS rows of the session's telemetry, else those the ingestion service published to shared memory"""
+    store = st.session_state.get('telemetry_store')
+    if store is not None and not store.empty:
+        # Older rows stay in the warm and spilled tiers; the correlations and profiles cover them without a reload
+        return store.window(max_rows=ANALYTICS_MAX_ROWS)
+    if TELEMETRY_SHM or TELEMETRY_SHM_PATH:
+        try:
+            return attach_telemetry_segment(TELEMETRY_SHM, TELEMETRY_SHM_PATH).read()
+        except (FileNotFoundError, ValueError):
+            return None
+    return None
+
+def load_correlations(telemetry):
+    """The session's correlation tracker, else one fed only the shared-memory rows it has not seen"""
+    store = st.session_state.get('telemetry_store')
+    if store is not None and not store.empty and 'correlation_tracker' in st.session_state:
+        return st.session_state['correlation_tracker']
+    tracker, position = st.session_state.get('segment_correlation', (CorrelationTracker(), 0))
+    # The segment frame is indexed by row position
+    tracker.update(telemetry.loc[position:])
+    st.session_state['segment_correlation'] = (tracker, int(telemetry.index[-1]) + 1)
+    return tracker
+
+def display_correlation_analysis(tracker, t):
+    st.markdown(f"### {t['correlation_analysis']}")
+    scopes = {
+        t['all_rows'] if column is None else f"{column} = {label}": (column, label, rows)
+        for column, label, rows in tracker.scopes() if rows > 1
+    }
+    if not scopes:
+        return
+    scope = st.selectbox(t['correlation_scope'], list(scopes), key="correlation_scope")
+    column, label, rows = scopes[scope]
+
+    with timed("correlation_heatmap", rows=rows):
+        fig = px.imshow(
+            tracker.correlation(column, label),
+            zmin=-1, zmax=1,
+            color_continuous_scale="RdBu_r",
+            text_auto=".2f",
+            aspect="auto"
+        )
+        fig.update_layout(height=600)
+    st.plotly_chart(fig, use_container_width=True, key="correlation_heatmap")
+    st.caption(f"{t['correlation_rows']}: {rows}")
+
+def display_fault_profiles(telemetry_store, prediction_store, t):
+    faults = fault_types(prediction_store)
+    if not faults:
+        return
+    st.markdown(f"### {t['fault_profiles']}")
+    fault_col, window_col = st.columns(2)
+    with fault_col:
+        fault = st.selectbox(t['fault_type'], faults, key="profile_fault")
+    with window_col:
+        window = st.slider(t['profile_window'], 15, 300, PROFILE_WINDOW_SECONDS, step=15, key="profile_window")
+    sensors = st.multiselect(
+        t['profile_sensors'], SENSOR_COLUMNS,
+        default=[col for col in IMPORTANT_COLUMNS if col in SENSOR_COLUMNS][:4],
+        key="profile_sensors"
+    )
+    if not sensors:
+        return
+
+    with timed("fault_profiles", rows=len(telemetry_store)):
+        onsets = fault_onsets(prediction_store.positions(fault))
+        offsets, events, values = event_windows(telemetry_store, onsets, window, window, columns=sensors)
+        bands = profile_bands(values)
+    st.caption(f"{t['profile_events']}: {len(events)}")
+
+    low, median, high = PROFILE_PERCENTILES
+    fig = plotly_subplots.make_subplots(rows=len(sensors), cols=1, shared_xaxes=True, subplot_titles=sensors)
+    for i, sensor in enumerate(sensors):
+        row = i + 1
+        fig.add_trace(go.Scatter(x=offsets, y=bands[high][:, i], line_width=0, showlegend=False, hoverinfo="skip"),
+                      row=row, col=1)
+        fig.add_trace(go.Scatter(
+            x=offsets, y=bands[low][:, i], fill="tonexty", fillcolor="rgba(52, 152, 219, 0.25)", line_width=0,
+            name=f"{low}–{high}%", legendgroup="band", showlegend=i == 0
+        ), row=row, col=1)
+        fig.add_trace(go.Scatter(
+            x=offsets, y=bands[median][:, i], line=dict(color="#3498db", dash="dot"),
+            name=f"{median}%", legendgroup="median", showlegend=i == 0
+        ), row=row, col=1)
+        fig.add_trace(go.Scatter(
+            x=offsets, y=bands["mean"][:, i], line=dict(color="#e74c3c"),
+            name=t['avg_value'], legendgroup="mean", showlegend=i == 0
+        ), row=row, col=1)
+    # The fault onset
+    fig.add_vline(x=0, line_dash="dash", line_color="#aaa")
+    fig.update_layout(height=220 * len(sensors) + 60)
+    st.plotly_chart(fig, use_container_width=True, key="fault_profiles_chart")
 
 def display_analytics_page():
     t = TRANSLATIONS[st.session_state.get('lang_code', 'ar')]
@@ -152,19 +309,34 @@ def display_analytics_page():
     </div>
     """, unsafe_allow_html=True)
 
-    st_autorefresh(interval=5000, key="analytics_refresh")
+    # Refresh only while new telemetry can arrive, backing off while it does not change
+    if st.session_state.get('simulator_on', False):
+        alert_manager = st.session_state.get('alert_manager')
+        schedule_refresh(
+            "analytics_refresh",
+            st.session_state.get('telemetry_version', 0),
+            active_fault=alert_manager is not None and alert_manager.open_count() > 0
+        )
+
+    if diagnostics_enabled():
+        render_diagnostics_panel(storage={
+            name: st.session_state[key]
+            for name, key in (("telemetry", 'telemetry_store'), ("predictions", 'prediction_store'))
+            if key in st.session_state
+        })
 
-    if 'simulated_data' not in st.session_state or st.session_state['simulated_data'].empty:
+    telemetry = load_telemetry()
+    if telemetry is None or telemetry.empty:
         st.markdown(f"<p style='text-align: center;'>{t['no_data']}</p>", unsafe_allow_html=True)
         return
 
-    if 'predictions' in st.session_state and not st.session_state['predictions'].empty:
-        merged_data = st.session_state['simulated_data'].merge(
-            st.session_state['predictions'][['Predicted_Fault']],
-            left_index=True, right_index=True, how='left'
-        )
-    else:
-        merged_data = st.session_state['simulated_data'].copy()
+    # telemetry is a fresh frame from the store, so it is extended in place rather than merged or copied
+    merged_data = telemetry
+    prediction_store = st.session_state.get('prediction_store')
+    if prediction_store is not None and not prediction_store.empty:
+        predictions = prediction_store.rows(telemetry.index[0], telemetry.index[-1] + 1)
+        # Aligned on row position, like the left merge on the index it replaces
+        merged_data = telemetry.assign(Predicted_Fault=predictions['Predicted_Fault'])
 
     total_rows = len(merged_data)
     fault_count = len(merged_data[merged_data['Status'] == 'Fault'])
@@ -194,6 +366,10 @@ def display_analytics_page():
         t['fault_percentage'], f"{fault_percentage:.1f}%",
         fault_count
     ), unsafe_allow_html=True)
+    # Positions count every row ever stored, so the last one tells how many the window left out
+    total_stored = int(telemetry.index[-1]) + 1
+    if total_stored > total_rows:
+        st.caption(t['window_note'].format(rows=total_rows, total=total_stored))
 
     fault_labels = ['Normal', 'Fault']
     fault_values = [total_rows - fault_count, fault_count]
@@ -207,76 +383,58 @@ def display_analytics_page():
 
     st.markdown(f"### {t['distribution_analysis']}")
     
-    available_columns = [col for col in IMPORTANT_COLUMNS if col in merged_data.columns]
-    
+    with timed("summarize_columns", rows=total_rows):
+        summary = summarize_columns(merged_data, IMPORTANT_COLUMNS)
+    available_columns = list(summary)
+
     for i in range(0, len(available_columns), 2):
-        col1, col2 = st.columns(2)
-        
-        # First column in the pair
-        if i < len(available_columns):
-            column1 = available_columns[i]
-            with col1:
-                with st.container():
-                    st.markdown(f"""
-                    <div style='border: 2px solid #007BFF; border-radius: 10px; padding: 8px 0 8px 0; background: #181c24; margin-bottom: 8px;'>
-                        <h4 style='color: #007BFF; text-align: center; margin: 0;'>{column1}</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    stats1, fig1 = create_column_analysis(merged_data, column1)
-                    
-                    # عرض الإحصائيات لجميع الأعمدة الرقمية
-                    if stats1:
-                        st.markdown("الإحصائيات:")
-                        stats_col1, stats_col2 = st.columns(2)
-                        with stats_col1:
-                            st.metric("الحد الأدنى", f"{stats1['الحد الأدنى']:.2f}")
-                            st.metric("المتوسط", f"{stats1['المتوسط']:.2f}")
-                        with stats_col2:
-                            st.metric("الحد الأقصى", f"{stats1['الحد الأقصى']:.2f}")
-                            st.metric("الوسيط", f"{stats1['الوسيط']:.2f}")
-                    
-                    if fig1:
-                        st.plotly_chart(fig1, use_container_width=True, key=f"chart_{column1}")
-                        
-        # Second column in the pair
-        if i + 1 < len(available_columns):
-            column2 = available_columns[i + 1]
-            with col2:
+        for column, container in zip(available_columns[i:i + 2], st.columns(2)):
+            with container:
                 with st.container():
-                    st.markdown(f"""
-                    <div style='border: 2px solid #007BFF; border-radius: 10px; padding: 8px 0 8px 0; background: #181c24; margin-bottom: 8px;'>
-                        <h4 style='color: #007BFF; text-align: center; margin: 0;'>{column2}</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    stats2, fig2 = create_column_analysis(merged_data, column2)
-                    
-                    # عرض الإحصائيات لجميع الأعمدة الرقمية
-                    if stats2:
-                        st.markdown("الإحصائيات:")
-                        stats_col1, stats_col2 = st.columns(2)
-                        with stats_col1:
-                            st.metric("الحد الأدنى", f"{stats2['الحد الأدنى']:.2f}")
-                            st.metric("المتوسط", f"{stats2['المتوسط']:.2f}")
-                        with stats_col2:
-                            st.metric("الحد الأقصى", f"{stats2['الحد الأقصى']:.2f}")
-                            st.metric("الوسيط", f"{stats2['الوسيط']:.2f}")
-                    
-                    if fig2:
-                        st.plotly_chart(fig2, use_container_width=True, key=f"chart_{column2}")
-        
+                    display_column_analysis(column, summary[column])
+
         if i + 2 < len(available_columns):
             st.divider()
 
+    st.divider()
+    display_correlation_analysis(load_correlations(telemetry), t)
+
+    # Fault onsets come from the session's predictions
+    telemetry_store = st.session_state.get('telemetry_store')
+    if prediction_store is not None and not prediction_store.empty and telemetry_store is not None:
+        st.divider()
+        display_fault_profiles(telemetry_store, prediction_store, t)
+
     st.markdown(f"<h3 style='color: #007BFF;'>{t['data_with_predictions']}</h3>", unsafe_allow_html=True)
     st.dataframe(merged_data.tail(10), use_container_width=True)
 
-    csv = merged_data.to_csv(index=False)
-    st.download_button(
-        label=t['download_results'],
-        data=csv,
-        file_name="data_with_predictions.csv",
-        mime="text/csv"
-    )
+    # Exports are built only when a button is clicked, not on every rerun
+    def export_csv():
+        with timed("export_csv.analytics", rows=total_rows):
+            return merged_data.to_csv(index=False)
+
+    def export_parquet():
+        with timed("export_parquet.analytics", rows=total_rows):
+            sink = io.BytesIO()
+            # pandas string columns are Arrow arrays already, so the table reuses their buffers
+            parquet.write_table(to_arrow(merged_data), sink, compression="zstd")
+            return sink.getvalue()
+
+    csv_col, parquet_col = st.columns(2)
+    with csv_col:
+        st.download_button(
+            label=t['download_results'],
+            data=export_csv,
+            file_name="data_with_predictions.csv",
+            mime="text/csv"
+        )
+    with parquet_col:
+        st.download_button(
+            label=t['download_parquet'],
+            data=export_parquet,
+            file_name="data_with_predictions.parquet",
+            mime="application/vnd.apache.parquet"
+        )
 
 if __name__ == "__main__":
-    display_analytics_page()
+    run_page(display_analytics_page)
@@ -0,0 +1,123 @@
+from bisect import bisect_left
+
+import pandas as pd
+
+from retention_module import TieredLog
+
+PREDICTION_COLUMNS = ['Recording', 'Predicted_Fault', 'Prediction_Message']
+
+
+class PredictionStore:
+    """Append-only prediction history with a per-fault-type secondary index
+
+    Rows live in a TieredLog (hot / warm compressed / cold on disk); the
+    posting lists stay in memory so filtered reads only touch the blocks
+    holding matching rows. Entries for predictions that retention has
+    dropped are trimmed from the posting lists as the blocks go.
+    """
+
+    def __init__(self, columns=None, retention=None):
+        self.columns = list(columns or PREDICTION_COLUMNS)
+        self._log = TieredLog(columns=self.columns, **(retention or {}))
+        # Posting lists: fault type -> positions of its rows, in arrival order
+        self._fault_index = {}
+        self._indexed_from = 0
+
+    def __len__(self):
+        return len(self._log)
+
+    @property
+    def empty(self):
+        return len(self._log) == 0
+
+    @property
+    def first_position(self):
+        """Oldest position still retained (predictions before it were dropped by retention)"""
+        return self._log.first_position
+
+    def append(self, results):
+        """Append API results (a DataFrame or a list of dicts) and update the index"""
+        if not isinstance(results, pd.DataFrame):
+            results = pd.DataFrame(list(results))
+        if results.empty:
+            return
+
+        for column in results.columns:
+            if column not in self.columns:
+                self.columns.append(column)
+        first_position = self._log.append(results.reset_index(drop=True))
+        faults = results['Predicted_Fault'] if 'Predicted_Fault' in results.columns else [None] * len(results)
+        for offset, fault in enumerate(faults):
+            self._fault_index.setdefault(None if pd.isna(fault) else fault, []).append(first_position + offset)
+        if self.first_position > self._indexed_from:
+            self._trim_index()
+
+    def _trim_index(self):
+        """Drop posting-list entries before first_position, and fault types with none left"""
+        for fault, positions in list(self._fault_index.items()):
+            del positions[:bisect_left(positions, self.first_position)]
+            if not positions:
+                del self._fault_index[fault]
+        self._indexed_from = self.first_position
+
+    def fault_types(self):
+        """Return the distinct fault types in order of first appearance"""
+        return [fault for fault in self._fault_index if fault is not None]
+
+    def fault_counts(self):
+        """Return the number of predictions per fault type"""
+        return {fault: len(positions) for fault, positions in self._fault_index.items() if fault is not None}
+
+    def count(self, fault=None):
+        """Return the number of predictions, optionally for one fault type"""
+        return len(self.positions(fault))
+
+    def positions(self, fault=None):
+        """Return the row positions for a fault type, or for all rows when fault is None"""
+        if fault is None:
+            return range(self.first_position, len(self._log))
+        return self._fault_index.get(fault, [])
+
+    def tail(self, n=10, fault=None):
+        """Return the last n predictions, optionally restricted to one fault type"""
+        positions = self.positions(fault)
+        return self._build_frame(positions[-n:] if n > 0 else positions[:0])
+
+    def slice(self, start, stop, fault=None):
+        """Return predictions [start:stop), optionally restricted to one fault type"""
+        return self._build_frame(self.positions(fault)[start:stop])
+
+    def rows(self, start=None, stop=None):
+        """Predictions by position [start, stop)"""
+        return self._log.rows(start, stop).reindex(columns=self.columns)
+
+    def arrow(self, start=None, stop=None):
+        """Predictions by position [start, stop) as an Arrow table"""
+        return self._log.arrow(start, stop)
+
+    @property
+    def frame(self):
+        """Full prediction history across all tiers as a DataFrame"""
+        return self._log.rows().reindex(columns=self.columns)
+
+    def memory_usage(self):
+        usage = self._log.memory_usage()
+        # Posting-list entries are Python ints in lists: roughly 36 bytes each
+        usage["index_bytes"] = 36 * sum(map(len, self._fault_index.values()))
+        return usage
+
+    def _build_frame(self, positions):
+        if isinstance(positions, range):
+            frame = self._log.rows(positions.start, positions.stop)
+        else:
+            frame = self._log.take(positions)
+        return frame.reindex(columns=self.columns)
+
+
+def build_prediction_table(frame):
+    """Build the display table for a slice of predictions with column operations"""
+    return pd.DataFrame({
+        'Recording': (frame.index + 1).astype(str),
+        'Predicted_Fault': frame['Predicted_Fault'].to_numpy(),
+        'Prediction_Message': frame['Prediction_Message'].to_numpy()
+    })
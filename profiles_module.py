@@ -0,0 +1,72 @@
+import warnings
+
+import numpy as np
+
+from alerts_module import NORMAL_LABELS
+from anomaly_module import SENSOR_COLUMNS
+
+# Seconds shown before and after each fault onset, and the spacing of the offset grid
+PROFILE_WINDOW_SECONDS = 60
+PROFILE_STEP_SECONDS = 5
+# Newest onsets kept per profile; bounds the events x offsets x sensors array
+MAX_PROFILE_EVENTS = 5_000
+PROFILE_PERCENTILES = (10, 50, 90)
+
+
+def fault_types(prediction_store):
+    """Predicted fault types other than the normal labels, most frequent first"""
+    counts = prediction_store.fault_counts()
+    return sorted((fault for fault in counts if str(fault) not in NORMAL_LABELS), key=counts.get, reverse=True)
+
+
+def fault_onsets(positions):
+    """First position of every run of consecutive positions, so a fault held over many rows is one event"""
+    positions = np.asarray(positions, dtype=np.int64)
+    if len(positions) == 0:
+        return positions
+    return positions[np.diff(positions, prepend=positions[0] - 2) > 1]
+
+
+def event_windows(telemetry_store, onsets, before=PROFILE_WINDOW_SECONDS, after=PROFILE_WINDOW_SECONDS,
+                  step=PROFILE_STEP_SECONDS, columns=None, max_events=MAX_PROFILE_EVENTS):
+    """Sensor values around each event, aligned on the event time
+
+    Returns (offsets, onsets, values): offsets in seconds from -before to
+    after, the event positions used and a (events, offsets, sensors) array.
+    Each cell holds the newest row at or before event time + offset, or NaN
+    when there is no row within `step` seconds of it (a gap in the data,
+    the start of the history or rows dropped by retention). Every event is
+    looked up at once: one searchsorted over the timestamp index for all
+    (event, offset) targets and one gather of the rows they hit.
+    """
+    columns = list(columns or SENSOR_COLUMNS)
+    offsets = np.arange(-before, after + step, step, dtype=np.int64)
+    onsets = np.asarray(onsets, dtype=np.int64)[-max_events:]
+    event_seconds = telemetry_store.seconds_at(onsets) if len(onsets) else np.empty(0, dtype=np.int64)
+    onsets = onsets[event_seconds >= 0]
+    event_seconds = event_seconds[event_seconds >= 0]
+
+    targets = event_seconds[:, None] + offsets[None, :]
+    positions = telemetry_store.positions_at(targets)
+    valid = positions >= 0
+    valid[valid] = telemetry_store.seconds_at(positions[valid]) > targets[valid] - step
+
+    wanted = np.unique(positions[valid])
+    rows = telemetry_store.take(wanted).reindex(index=wanted, columns=columns)
+    block = np.vstack([rows.to_numpy(dtype=float, na_value=np.nan), np.full((1, len(columns)), np.nan)])
+    # Cells without a row point at the all-NaN row appended to the block
+    lookup = np.where(valid, np.searchsorted(wanted, positions), len(wanted))
+    return offsets, onsets, block[lookup]
+
+
+def profile_bands(values, percentiles=PROFILE_PERCENTILES):
+    """Mean and percentile bands over the events axis: {"mean": (offsets, sensors), percentile: ...}"""
+    if not len(values):
+        empty = np.full(values.shape[1:], np.nan)
+        return {"mean": empty, **{percentile: empty for percentile in percentiles}}
+    with warnings.catch_warnings():
+        # Offsets no event reaches are all-NaN columns
+        warnings.simplefilter("ignore", RuntimeWarning)
+        bands = dict(zip(percentiles, np.nanpercentile(values, percentiles, axis=0)))
+        bands["mean"] = np.nanmean(values, axis=0)
+    return bands
@@ -0,0 +1,145 @@
+import os
+
+# Refresh bounds in milliseconds; override per deployment through the environment
+BASE_INTERVAL_MS = int(os.environ.get("REFRESH_BASE_MS", 5000))
+MIN_INTERVAL_MS = int(os.environ.get("REFRESH_MIN_MS", 2000))
+MAX_INTERVAL_MS = int(os.environ.get("REFRESH_MAX_MS", 60000))
+
+
+class RefreshScheduler:
+    """Chooses the next auto-refresh interval for a page
+
+    - new telemetry since the last rerun refreshes at the base interval
+    - an ongoing fault (open alert episode) with new telemetry halves the
+      interval on every rerun, from at most the base interval, down to the
+      minimum; a page that ingests nothing itself backs off even while an
+      episode is open
+    - every rerun without new telemetry doubles the interval up to the maximum
+    - after `idle_after` consecutive automatic reruns with no user interaction
+      the tab is treated as idle and backs off the same way, fault or not
+    """
+
+    def __init__(self, base_interval=BASE_INTERVAL_MS, min_interval=MIN_INTERVAL_MS,
+                 max_interval=MAX_INTERVAL_MS, backoff=2.0, idle_after=120, settle_ticks=3):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = backoff
+        self.idle_after = idle_after
+        self.settle_ticks = settle_ticks
+        self.interval = base_interval
+        # Interval currently in effect as a fragment's run_every
+        self.applied_interval = base_interval
+        self._last_version = None
+        self._unchanged = 0
+        self._last_refresh_count = None
+        self._auto_reruns = 0
+        # Consecutive ticks whose interval was longer (> 0) or shorter (< 0) than the applied one
+        self._drift = 0
+
+    def next_interval(self, version, active_fault=False):
+        """Return the refresh interval (ms) to schedule after this rerun"""
+        if version != self._last_version:
+            self._unchanged = 0
+        else:
+            self._unchanged += 1
+        self._last_version = version
+
+        steps = self._unchanged + max(0, self._auto_reruns - self.idle_after)
+        if active_fault and steps == 0:
+            # Step down rather than jump, so one rerun never goes from a backed-off interval to the minimum
+            self.interval = int(max(self.min_interval, min(self.interval / self.backoff, self.base_interval)))
+        else:
+            # Cap the exponent; the interval saturates at max_interval long before this
+            self.interval = int(min(self.base_interval * self.backoff ** min(steps, 32), self.max_interval))
+        return self.interval
+
+    def settled(self):
+        """True once the interval has been on the same side of applied_interval for settle_ticks ticks
+
+        Called once per tick after next_interval. A fragment's cadence changes
+        only then, so an interval that moves back and forth costs no reruns.
+        """
+        if self.interval == self.applied_interval:
+            self._drift = 0
+        elif (self.interval > self.applied_interval) == (self._drift > 0):
+            self._drift += 1 if self._drift > 0 else -1
+        else:
+            self._drift = 1 if self.interval > self.applied_interval else -1
+        return abs(self._drift) >= self.settle_ticks
+
+    def apply_interval(self):
+        """Record the current interval as the one in effect and return it"""
+        self.applied_interval = self.interval
+        self._drift = 0
+        return self.interval
+
+    def observe_refresh(self, refresh_count):
+        """Record the st_autorefresh counter to tell automatic reruns from user interaction"""
+        if self._last_refresh_count is not None and refresh_count > self._last_refresh_count:
+            self.mark_auto_rerun()
+        else:
+            self.mark_interaction()
+        self._last_refresh_count = refresh_count
+
+    def mark_auto_rerun(self):
+        self._auto_reruns += 1
+
+    def mark_interaction(self):
+        self._auto_reruns = 0
+
+    @property
+    def idle(self):
+        return self._auto_reruns > self.idle_after
+
+
+def get_scheduler(key):
+    """Return this session's scheduler for a page or fragment"""
+    import streamlit as st
+
+    scheduler_key = f"refresh_scheduler_{key}"
+    if scheduler_key not in st.session_state:
+        st.session_state[scheduler_key] = RefreshScheduler()
+    return st.session_state[scheduler_key]
+
+
+def schedule_refresh(key, version, active_fault=False):
+    """Run st_autorefresh with the session's adaptive interval for this page"""
+    from streamlit_autorefresh import st_autorefresh
+
+    scheduler = get_scheduler(key)
+    interval = scheduler.next_interval(version, active_fault=active_fault)
+    scheduler.observe_refresh(st_autorefresh(interval=interval, key=key) or 0)
+    return interval
+
+
+def fragment_run_every(key):
+    """run_every (seconds) for a live fragment, called on each full-page run
+
+    Full-page runs come from user interaction, except the ones requested by
+    update_fragment_interval to apply a new cadence.
+    """
+    import streamlit as st
+
+    scheduler = get_scheduler(key)
+    if not st.session_state.pop(f"{key}_interval_rerun", False):
+        scheduler.mark_interaction()
+    return scheduler.apply_interval() / 1000
+
+
+def update_fragment_interval(key, version, active_fault=False, full_run=False):
+    """Called from a live fragment after ingesting; reruns the page when the cadence must change
+
+    A fragment's run_every is fixed until the next full-page run, so a new
+    interval is applied with one full rerun, and only once it has settled
+    (see RefreshScheduler.settled). During a full-page run the new interval
+    is only recorded; the next fragment tick applies it.
+    """
+    import streamlit as st
+
+    scheduler = get_scheduler(key)
+    scheduler.mark_auto_rerun()
+    scheduler.next_interval(version, active_fault=active_fault)
+    if scheduler.settled() and not full_run:
+        st.session_state[f"{key}_interval_rerun"] = True
+        st.rerun()
@@ -0,0 +1,281 @@
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+# Retention defaults, overridable per deployment through the environment
+HOT_ROWS = int(os.environ.get("RETENTION_HOT_ROWS", 10_000))
+BLOCK_ROWS = int(os.environ.get("RETENTION_BLOCK_ROWS", 5_000))
+WARM_BLOCKS = int(os.environ.get("RETENTION_WARM_BLOCKS", 20))
+SPILL_DIR = os.environ.get("RETENTION_SPILL_DIR") or None
+# Consolidate the per-append pieces of the hot tier once this many are pending
+_PENDING_PIECES = 64
+# Sealed blocks are Arrow IPC streams with zstd-compressed buffers
+_IPC_OPTIONS = ipc.IpcWriteOptions(compression="zstd")
+
+
+def to_arrow(frame):
+    """Arrow table of a DataFrame's columns (the index is dropped)"""
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Object columns mixing types (e.g. numbers and text from an API response) are stored as text
+        mixed = {column: str for column in frame.columns if frame[column].dtype == object}
+        return pa.Table.from_pandas(frame.astype(mixed), preserve_index=False)
+
+
+def _compress(frame):
+    # pandas string columns built by repeated appends arrive in many small chunks; write one batch
+    table = to_arrow(frame).combine_chunks()
+    sink = pa.BufferOutputStream()
+    with ipc.new_stream(sink, table.schema, options=_IPC_OPTIONS) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _decompress(source):
+    return ipc.open_stream(source).read_all()
+
+
+class TieredLog:
+    """Append-only log of DataFrame rows kept in three tiers
+
+    - hot: the newest rows, uncompressed (at most hot_rows + block_rows)
+    - warm: sealed blocks of block_rows rows, as compressed Arrow IPC buffers in memory
+    - cold: the oldest blocks, spilled to Arrow IPC files under spill_dir
+
+    Row positions are global and stable; reads stitch the tiers back together,
+    so callers never see where a row lives. RAM is bounded by the hot rows
+    plus warm_blocks compressed blocks. With max_cold_blocks set, the oldest
+    cold blocks are deleted and their rows are no longer returned.
+
+    Sealed blocks decode to Arrow tables, so a read slices them without
+    copying and converts only the requested rows to pandas; arrow() returns
+    the rows as an Arrow table without going through pandas at all.
+    """
+
+    def __init__(self, hot_rows=HOT_ROWS, block_rows=BLOCK_ROWS, warm_blocks=WARM_BLOCKS,
+                 spill_dir=SPILL_DIR, max_cold_blocks=None, columns=None):
+        self.hot_rows = hot_rows
+        self.block_rows = block_rows
+        self.warm_blocks = warm_blocks
+        self.max_cold_blocks = max_cold_blocks
+        self.columns = list(columns or [])
+        self._spill_root = spill_dir
+        self._spill_dir = None
+        # Sealed blocks, oldest first: {"start", "stop", "payload" (warm) or "path" (cold), "bytes"}
+        self._blocks = []
+        self._hot = None
+        self._pending = []
+        self._hot_start = 0
+        self._length = 0
+        self.first_position = 0
+        self._cache = OrderedDict()
+        # Arrow copy of the hot rows, rebuilt after the next append
+        self._hot_table = None
+
+    def __len__(self):
+        return self._length
+
+    def append(self, frame):
+        """Append rows; returns the position of the first one"""
+        first_position = self._length
+        if len(frame):
+            self._hot_table = None
+            self._pending.append(frame)
+            self._length += len(frame)
+            for column in frame.columns:
+                if column not in self.columns:
+                    self.columns.append(column)
+            if len(self._pending) >= _PENDING_PIECES or self._length - self._hot_start >= self.hot_rows + self.block_rows:
+                self._consolidate()
+                self._seal()
+        return first_position
+
+    def _consolidate(self):
+        if not self._pending:
+            return
+        pieces = ([self._hot] if self._hot is not None else []) + self._pending
+        # The first piece keeps its dtypes; concatenating onto an empty frame would make them object
+        self._hot = pieces[0] if len(pieces) == 1 else pd.concat(pieces, ignore_index=True)
+        self._hot = self._hot.reset_index(drop=True)
+        self._pending = []
+
+    def _seal(self):
+        while len(self._hot) >= self.hot_rows + self.block_rows:
+            block = self._hot.iloc[:self.block_rows]
+            payload = _compress(block)
+            self._blocks.append({
+                "start": self._hot_start,
+                "stop": self._hot_start + self.block_rows,
+                "payload": payload,
+                "bytes": len(payload)
+            })
+            # Copy so the sealed rows' memory is released
+            self._hot = self._hot.iloc[self.block_rows:].reset_index(drop=True).copy()
+            self._hot_start += self.block_rows
+        self._spill()
+
+    def _spill(self):
+        warm = [block for block in self._blocks if "payload" in block]
+        for block in warm[:max(0, len(warm) - self.warm_blocks)]:
+            path = os.path.join(self._ensure_spill_dir(), f"block-{block['start']:012d}.arrows")
+            with open(path, "wb") as handle:
+                handle.write(block.pop("payload"))
+            block["path"] = path
+
+        if self.max_cold_blocks is not None:
+            cold = [block for block in self._blocks if "path" in block]
+            for block in cold[:max(0, len(cold) - self.max_cold_blocks)]:
+                os.unlink(block["path"])
+                self._blocks.remove(block)
+                self.first_position = block["stop"]
+
+    def _ensure_spill_dir(self):
+        if self._spill_dir is None:
+            if self._spill_root:
+                os.makedirs(self._spill_root, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix="tiered-log-", dir=self._spill_root)
+            # Spilled files belong to this log only; remove them with it
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        return self._spill_dir
+
+    def _load(self, block):
+        """Decode a sealed block to an Arrow table, keeping the two most recently read ones"""
+        key = block["start"]
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if "payload" in block:
+            table = _decompress(block["payload"])
+        else:
+            with pa.memory_map(block["path"]) as source:
+                table = _decompress(source)
+        self._cache[key] = table
+        while len(self._cache) > 2:
+            self._cache.popitem(last=False)
+        return table
+
+    def _hot_frame(self):
+        self._consolidate()
+        return self._hot
+
+    def rows(self, start=None, stop=None):
+        """Rows [start, stop) as a DataFrame indexed by position"""
+        start = self.first_position if start is None else max(start, self.first_position)
+        stop = self._length if stop is None else min(stop, self._length)
+        if start >= stop:
+            return self._empty()
+
+        # Fast path for the newest rows while they are still pending
+        if self._pending and start >= self._length - len(self._pending[-1]):
+            piece = self._pending[-1]
+            offset = self._length - len(piece)
+            return self._positioned(piece.iloc[start - offset:stop - offset], start)
+
+        parts = []
+        tables = []
+        for block in self._blocks:
+            if block["stop"] <= start or block["start"] >= stop:
+                continue
+            lo, hi = max(start, block["start"]), min(stop, block["stop"])
+            tables.append(self._load(block).slice(lo - block["start"], hi - lo))
+        if tables:
+            # One pandas conversion for all sealed rows rather than one per block
+            table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options="default")
+            parts.append(self._positioned(table.to_pandas(), start))
+        if stop > self._hot_start:
+            lo = max(start, self._hot_start)
+            parts.append(self._positioned(self._hot_frame().iloc[lo - self._hot_start:stop - self._hot_start], lo))
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    def take(self, positions):
+        """Rows at the given ascending positions, indexed by position"""
+        positions = np.asarray(positions, dtype=np.int64)
+        positions = positions[(positions >= self.first_position) & (positions < self._length)]
+        if len(positions) == 0:
+            return self._empty()
+
+        parts = []
+        for block in self._blocks:
+            lo, hi = np.searchsorted(positions, [block["start"], block["stop"]])
+            if lo < hi:
+                part = self._load(block).take(positions[lo:hi] - block["start"]).to_pandas()
+                parts.append(part.set_axis(pd.Index(positions[lo:hi])))
+        lo = np.searchsorted(positions, self._hot_start)
+        if lo < len(positions):
+            part = self._hot_frame().iloc[positions[lo:] - self._hot_start]
+            parts.append(part.set_axis(pd.Index(positions[lo:])))
+        return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+    def arrow(self, start=None, stop=None):
+        """Rows [start, stop) as an Arrow table, one chunk per tier slice and no pandas round trip
+
+        Sealed blocks are sliced in place; the hot rows are converted once per
+        append and sliced too.
+        """
+        start = self.first_position if start is None else max(start, self.first_position)
+        stop = self._length if stop is None else min(stop, self._length)
+        tables = []
+        for block in self._blocks:
+            if block["stop"] <= start or block["start"] >= stop:
+                continue
+            lo, hi = max(start, block["start"]), min(stop, block["stop"])
+            tables.append(self._load(block).slice(lo - block["start"], hi - lo))
+        if stop > self._hot_start:
+            if self._hot_table is None:
+                self._hot_table = to_arrow(self._hot_frame()).combine_chunks()
+            lo = max(start, self._hot_start)
+            tables.append(self._hot_table.slice(lo - self._hot_start, stop - lo))
+        if not tables:
+            return to_arrow(self._empty())
+        # Columns that appeared later are filled with nulls in the older chunks
+        return tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options="default")
+
+    def _positioned(self, frame, start):
+        return frame.set_axis(pd.RangeIndex(start, start + len(frame)))
+
+    def _empty(self):
+        return pd.DataFrame(columns=self.columns, index=pd.Index([], dtype="int64"))
+
+    def memory_usage(self):
+        """Rows and bytes per tier; hot bytes are the in-memory DataFrame size"""
+        hot = self._hot_frame()
+        warm = [block for block in self._blocks if "payload" in block]
+        cold = [block for block in self._blocks if "path" in block]
+        return {
+            "hot_rows": 0 if hot is None else len(hot),
+            "hot_bytes": 0 if hot is None else int(hot.memory_usage(index=True, deep=True).sum()),
+            "warm_blocks": len(warm),
+            "warm_rows": sum(block["stop"] - block["start"] for block in warm),
+            "warm_bytes": sum(block["bytes"] for block in warm),
+            "cold_blocks": len(cold),
+            "cold_rows": sum(block["stop"] - block["start"] for block in cold),
+            "cold_bytes": sum(block["bytes"] for block in cold),
+            "dropped_rows": self.first_position
+        }
+
+
+def storage_report(stores):
+    """One row per store and tier, for the diagnostics panel"""
+    rows = []
+    for name, store in stores.items():
+        usage = store.memory_usage()
+        for tier in ("hot", "warm", "cold"):
+            rows.append({
+                "store": name,
+                "tier": tier,
+                "rows": usage[f"{tier}_rows"],
+                "MB": usage[f"{tier}_bytes"] / 1e6,
+                "location": "disk" if tier == "cold" else "memory"
+            })
+        if "index_bytes" in usage:
+            rows.append({"store": name, "tier": "index", "rows": None,
+                         "MB": usage["index_bytes"] / 1e6, "location": "memory"})
+    return pd.DataFrame(rows)
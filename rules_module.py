@@ -0,0 +1,202 @@
+import numpy as np
+
+NORMAL, WARNING, CRITICAL = 0, 1, 2
+SEVERITY_NAMES = {NORMAL: "normal", WARNING: "warning", CRITICAL: "critical"}
+UNKNOWN_CATEGORY = "غير معروف"
+
+# Declarative threshold configuration, one entry per sensor column.
+#   high / low:   alert bands entered when the value rises above / falls below the threshold
+#   hysteresis:   distance back inside the threshold needed to leave a band
+#   min_duration: consecutive rows a band must hold before it is reported
+#   categories:   (lower edge, label) pairs used by the analytics categorization
+# The alert bands sit above the simulator's normal ranges (generate_row, SIGNALS in
+# scenario_module); the category edges are display bands and may lie inside them.
+THRESHOLD_RULES = {
+    "Engine_RPM": {
+        "high": {"critical": 4000},
+        "hysteresis": 200,
+        "min_duration": 1
+    },
+    "Coolant_Temp_C": {
+        "high": {"warning": 100, "critical": 105},
+        "hysteresis": 2,
+        "min_duration": 2,
+        "categories": [(0, "🔵 منخفض"), (70, "🟢 طبيعي"), (90, "🟡 مرتفع"), (105, "🔴 خطورة")]
+    },
+    "Oil_Temp_C": {
+        "high": {"warning": 100, "critical": 110},
+        "hysteresis": 2,
+        "min_duration": 2,
+        "categories": [(0, "🔵 منخفض"), (60, "🟢 طبيعي"), (95, "🟡 مرتفع"), (110, "🔴 خطورة")]
+    },
+    "Battery_Voltage_V": {
+        "low": {"warning": 12.2, "critical": 11.5},
+        "hysteresis": 0.2,
+        "min_duration": 2,
+        "categories": [(0, "🔴 منخفض"), (11.5, "🟠 ضعيف"), (12.2, "🟢 طبيعي"), (13.5, "⚡ مرتفع")]
+    },
+    "Vehicle_Speed_kmh": {
+        "high": {"warning": 120},
+        "hysteresis": 5,
+        "min_duration": 2,
+        "categories": [(0, "🛑 موقف"), (0.1, "🟢 قيادة طبيعية"), (80, "🟠 سريع"), (120, "🔴 مفرط")]
+    },
+    "O2_Sensor_V": {
+        "low": {"critical": 0.1},
+        "high": {"critical": 0.9},
+        "hysteresis": 0.05,
+        "min_duration": 2,
+        # 0.9 itself is still normal, so the upper band starts just above it
+        "categories": [(-np.inf, "🔴 غير طبيعي"), (0.1, "🟢 طبيعي"), (np.nextafter(0.9, np.inf), "🔴 غير طبيعي")]
+    },
+    "Catalytic_Converter_Percent": {
+        "categories": [(0, "🟢 ممتاز"), (25, "🟡 جيد"), (50, "🟠 ضعيف"), (75, "🔴 خطورة")]
+    }
+}
+
+
+def threshold(column, level="critical", side=None):
+    """Return the configured threshold for a column, used for chart annotations"""
+    rule = THRESHOLD_RULES.get(column, {})
+    for band_side in ([side] if side else ["high", "low"]):
+        value = rule.get(band_side, {}).get(level)
+        if value is not None:
+            return value
+    return None
+
+
+def categorize(column, values):
+    """Vectorized categorization of a column's values into its configured labels"""
+    values = np.asarray(values, dtype=float)
+    categories = THRESHOLD_RULES.get(column, {}).get("categories")
+    if not categories:
+        return np.full(values.shape, UNKNOWN_CATEGORY, dtype=object)
+
+    labels = np.array([label for _, label in categories] + [UNKNOWN_CATEGORY], dtype=object)
+    return labels[_category_bins(categories, values)]
+
+
+def category_counts(column, values):
+    """Number of values per configured label, in configuration order; empty labels are left out"""
+    values = np.asarray(values, dtype=float)
+    categories = THRESHOLD_RULES.get(column, {}).get("categories")
+    if not categories:
+        return {}
+
+    counts = np.bincount(_category_bins(categories, values), minlength=len(categories) + 1)
+    totals = {}
+    # A label may cover several ranges (O2 sensor below and above its normal band)
+    for label, count in zip([label for _, label in categories] + [UNKNOWN_CATEGORY], counts):
+        if count:
+            totals[label] = totals.get(label, 0) + int(count)
+    return totals
+
+
+def _category_bins(categories, values):
+    """Index of each value's category; len(categories) for the unknown label"""
+    edges = np.array([edge for edge, _ in categories], dtype=float)
+    bins = np.searchsorted(edges, values, side="right") - 1
+    # Values below the first edge and missing values map to the unknown label
+    bins[(bins < 0) | np.isnan(values)] = len(categories)
+    return bins
+
+
+class _Band:
+    """One compiled threshold band with its streaming hysteresis and duration state"""
+
+    def __init__(self, column, side, severity, limit, hysteresis, min_duration):
+        self.column = column
+        self.side = side
+        self.severity = severity
+        self.limit = limit
+        self.release = limit - hysteresis if side == "high" else limit + hysteresis
+        self.min_duration = max(1, int(min_duration))
+        self.active = False
+        self.run_length = 0
+
+    def evaluate(self, values):
+        n = len(values)
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+
+        with np.errstate(invalid="ignore"):
+            if self.side == "high":
+                enter, leave = values >= self.limit, values < self.release
+            else:
+                enter, leave = values <= self.limit, values > self.release
+
+        # Hysteresis: carry the last decisive row (enter or leave) forward
+        decisive = enter | leave
+        last = np.maximum.accumulate(np.where(decisive, np.arange(n), -1))
+        active = np.where(last >= 0, enter[np.maximum(last, 0)], self.active)
+
+        # Minimum duration: position of each row inside its active run, continued from the previous batch
+        index = np.arange(n)
+        starts = active & ~np.concatenate(([self.active], active[:-1]))
+        run_start = np.maximum.accumulate(np.where(starts, index, -1))
+        run_length = np.where(run_start >= 0, index - run_start + 1, index + 1 + self.run_length)
+        run_length = np.where(active, run_length, 0)
+
+        self.active = bool(active[-1])
+        self.run_length = int(run_length[-1])
+        return run_length >= self.min_duration
+
+
+class RuleEngine:
+    """Threshold rules compiled to vectorized masks over batches of telemetry rows"""
+
+    def __init__(self, rules=None):
+        self.rules = rules or THRESHOLD_RULES
+        self._bands = {}
+        for column, rule in self.rules.items():
+            bands = []
+            for side in ("high", "low"):
+                for level, severity in (("warning", WARNING), ("critical", CRITICAL)):
+                    limit = rule.get(side, {}).get(level)
+                    if limit is not None:
+                        bands.append(_Band(column, side, severity, limit,
+                                           rule.get("hysteresis", 0), rule.get("min_duration", 1)))
+            if bands:
+                self._bands[column] = bands
+        self._severity = {column: NORMAL for column in self._bands}
+
+    @property
+    def columns(self):
+        return list(self._bands)
+
+    def evaluate(self, frame):
+        """Return {column: int8 severity array} for the next batch of rows, advancing the band state"""
+        severities = {}
+        for column, bands in self._bands.items():
+            if column not in frame.columns:
+                continue
+            values = frame[column].to_numpy(dtype=float, na_value=np.nan)
+            severity = np.zeros(len(values), dtype=np.int8)
+            for band in bands:
+                severity = np.maximum(severity, np.where(band.evaluate(values), band.severity, NORMAL).astype(np.int8))
+            severities[column] = severity
+        return severities
+
+    def events(self, frame):
+        """Evaluate a batch and return severity transitions as alert events"""
+        events = []
+        positions = frame.index.to_numpy()
+        for column, severity in self.evaluate(frame).items():
+            previous = np.concatenate(([self._severity[column]], severity[:-1]))
+            values = frame[column].tolist()
+            for i in np.flatnonzero(severity != previous):
+                events.append({
+                    "column": column,
+                    "position": int(positions[i]),
+                    "severity": SEVERITY_NAMES[int(severity[i])],
+                    "previous": SEVERITY_NAMES[int(previous[i])],
+                    "value": values[i]
+                })
+            if len(severity):
+                self._severity[column] = int(severity[-1])
+        events.sort(key=lambda event: event["position"])
+        return events
+
+    def current_severity(self):
+        """Return the latest severity name per column"""
+        return {column: SEVERITY_NAMES[severity] for column, severity in self._severity.items()}
@@ -0,0 +1,274 @@
+"""Declarative, vectorized telemetry scenarios for one vehicle or a fleet.
+
+generate_row() draws every field independently, so its timelines are white
+noise. A scenario instead gives each sensor a time-correlated signal and lets
+faults develop gradually:
+
+    engine = ScenarioEngine("overheating", vehicles=1000, seed=7)
+    frame = engine.generate(3600)   # one hour at 1 s steps: 3.6M rows
+
+Every signal is computed for all vehicles and steps at once with numpy; the
+engine carries each signal's state between calls, so successive generate()
+calls continue the same timelines. The same seed and the same sequence of
+calls give the same rows.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from telemetry_module import TELEMETRY_COLUMNS, TIMESTAMP_FORMAT
+
+VEHICLE_COLUMN = "Vehicle_ID"
+# Steps per closed-form AR block; shortened for small phi so phi ** -block stays finite
+AR_BLOCK_STEPS = 256
+
+# Signal per telemetry column, generated in this order (a "linear" signal follows an earlier column).
+#   ar:      mean + AR(1) noise with stationary std `std` and lag-1 correlation `phi` per step
+#   warmup:  start -> target exponential curve with time constant `tau` seconds, plus AR(1) noise
+#   linear:  intercept + slope * column `of`, plus AR(1) noise
+#   walk:    random walk from `start`, drifting by `drift` per second with step noise `std`
+#   vehicle: a constant per vehicle, drawn uniformly from [low, high)
+#   state:   labels drawn with probabilities `labels`, kept from step to step with probability `stay`
+# Any number may be a (low, high) pair, drawn once per vehicle. `clip` bounds the
+# value (after fault effects) and `round` gives its decimals (0 for integers).
+SIGNALS = {
+    "Vehicle_Speed_kmh": {"kind": "ar", "mean": (45, 85), "std": 12, "phi": 0.98, "clip": (0, 220), "round": 0},
+    "Engine_RPM": {"kind": "linear", "of": "Vehicle_Speed_kmh", "slope": 15, "intercept": 600, "std": 80,
+                   "phi": 0.7, "clip": (600, 7000), "round": 0},
+    "Engine_Load_Percent": {"kind": "linear", "of": "Vehicle_Speed_kmh", "slope": 0.3, "intercept": 18, "std": 4,
+                            "phi": 0.8, "clip": (0, 100), "round": 0},
+    "MAP_kPa": {"kind": "linear", "of": "Engine_Load_Percent", "slope": 0.9, "intercept": 12, "std": 2,
+                "phi": 0.7, "clip": (20, 105), "round": 0},
+    "MAF_gps": {"kind": "linear", "of": "Engine_RPM", "slope": 0.006, "intercept": 0.5, "std": 0.8,
+                "phi": 0.7, "clip": (1, 200), "round": 1},
+    "Ignition_Timing_Deg": {"kind": "ar", "mean": 12, "std": 3, "phi": 0.9, "clip": (-10, 40), "round": 0},
+    "Coolant_Temp_C": {"kind": "warmup", "start": (15, 30), "target": (86, 94), "tau": 400, "std": 1,
+                       "phi": 0.95, "round": 0},
+    "Oil_Temp_C": {"kind": "warmup", "start": (15, 30), "target": (82, 92), "tau": 700, "std": 1,
+                   "phi": 0.97, "round": 0},
+    "Battery_Voltage_V": {"kind": "ar", "mean": (13.6, 14.1), "std": 0.12, "phi": 0.9, "clip": (9, 16), "round": 1},
+    "O2_Sensor_V": {"kind": "ar", "mean": 0.7, "std": 0.05, "phi": 0.3, "clip": (0, 1.1), "round": 2},
+    "Catalytic_Converter_Percent": {"kind": "ar", "mean": (91, 98), "std": 1.5, "phi": 0.995, "clip": (0, 100),
+                                    "round": 0},
+    "Tire_Pressure_psi": {"kind": "ar", "mean": (31, 33), "std": 0.5, "phi": 0.999, "round": 0},
+    "Ambient_Temp_C": {"kind": "ar", "mean": (18, 32), "std": 2, "phi": 0.9995, "round": 0},
+    "Battery_Age_Months": {"kind": "vehicle", "low": 6, "high": 24, "round": 1},
+    "Fuel_Level_Percent": {"kind": "walk", "start": (50, 100), "drift": -0.003, "std": 0.05, "clip": (0, 100),
+                           "round": 0},
+    "Idle_Status": {"kind": "state", "labels": {"False": 0.8, "True": 0.2}, "stay": 0.98},
+    "Charging_System_Status": {"kind": "state", "labels": {"Normal": 0.97, "Fault": 0.03}, "stay": 0.99},
+    "EGR_Status": {"kind": "state", "labels": {"Open": 0.5, "Closed": 0.45, "Stuck_Open": 0.05}, "stay": 0.95},
+    "Transmission_Gear": {"kind": "state", "labels": {
+        "P": 0.1, "R": 0.05, "N": 0.05, "D": 0.5, "1": 0.05, "2": 0.05, "3": 0.07, "4": 0.07, "5": 0.04, "6": 0.02
+    }, "stay": 0.95},
+    "Brake_Status": {"kind": "state", "labels": {"Released": 0.85, "Engaged": 0.15}, "stay": 0.9},
+}
+
+# Scenarios: signal overrides plus faults. A fault starts `start` seconds in (per
+# vehicle when a range), affects a `probability` share of the vehicles and ramps
+# each numeric effect linearly to its full offset over `ramp` seconds; a label
+# effect holds its state column at that label. Status is "Fault" from the start
+# of any fault.
+SCENARIOS = {
+    "normal": {},
+    "overheating": {
+        "faults": [{"name": "Engine Overheating", "start": (600, 1800), "ramp": 900, "probability": 1.0,
+                    "effects": {"Coolant_Temp_C": 30, "Oil_Temp_C": 28}}]
+    },
+    "battery_failure": {
+        "faults": [{"name": "Battery Failure", "start": (300, 1200), "ramp": 1800, "probability": 1.0,
+                    "effects": {"Battery_Voltage_V": -2.6, "Charging_System_Status": "Fault"}}]
+    },
+    "catalyst_degradation": {
+        "faults": [{"name": "Catalytic Converter Failure", "start": (0, 1800), "ramp": 3600, "probability": 1.0,
+                    "effects": {"Catalytic_Converter_Percent": -25, "O2_Sensor_V": -0.5}}]
+    },
+    "mixed_fleet": {
+        "faults": [
+            {"name": "Engine Overheating", "start": (600, 7200), "ramp": 900, "probability": 0.2,
+             "effects": {"Coolant_Temp_C": 30, "Oil_Temp_C": 28}},
+            {"name": "Battery Failure", "start": (300, 7200), "ramp": 1800, "probability": 0.2,
+             "effects": {"Battery_Voltage_V": -2.6, "Charging_System_Status": "Fault"}},
+            {"name": "Catalytic Converter Failure", "start": (0, 7200), "ramp": 3600, "probability": 0.1,
+             "effects": {"Catalytic_Converter_Percent": -25, "O2_Sensor_V": -0.5}},
+        ]
+    },
+}
+
+
+def ar1(initial, innovations, phi):
+    """AR(1) paths x[t] = phi * x[t-1] + innovations[t] for every row, continuing from `initial`
+
+    Solved in closed form over blocks of steps (x[t] = phi^(t+1) x0 +
+    sum phi^(t-s) e[s], a cumulative sum) instead of a Python loop over time.
+    """
+    if phi == 0:
+        return innovations
+    if phi == 1:
+        return initial[:, None] + np.cumsum(innovations, axis=1)
+    block = max(1, min(AR_BLOCK_STEPS, int(150 / -np.log10(abs(phi)))))
+    paths = np.empty_like(innovations)
+    state = initial
+    for lo in range(0, innovations.shape[1], block):
+        chunk = innovations[:, lo:lo + block]
+        powers = phi ** np.arange(1, chunk.shape[1] + 1)
+        paths[:, lo:lo + block] = powers * (state[:, None] + np.cumsum(chunk / powers, axis=1))
+        state = paths[:, lo + chunk.shape[1] - 1]
+    return paths
+
+
+class ScenarioEngine:
+    """Time-correlated telemetry for `vehicles` vehicles following a scenario, `step_seconds` apart"""
+
+    def __init__(self, scenario="normal", vehicles=1, seed=None, step_seconds=1.0, start_time=None):
+        config = SCENARIOS[scenario] if isinstance(scenario, str) else scenario
+        self.signals = {column: {**SIGNALS.get(column, {}), **spec}
+                        for column, spec in {**SIGNALS, **config.get("signals", {})}.items()}
+        self.vehicles = vehicles
+        self.step_seconds = step_seconds
+        self.start_time = np.datetime64(start_time or datetime.now(), "ms")
+        self.steps_done = 0
+        self.rng = np.random.default_rng(seed)
+
+        # Per-vehicle parameters and initial states, drawn once so later calls continue the same vehicles
+        self._params = {column: {key: self._per_vehicle(value) for key, value in spec.items()
+                                 if key in ("mean", "start", "target", "low", "high", "slope", "intercept")}
+                        for column, spec in self.signals.items()}
+        self._state = {}
+        for column, spec in self.signals.items():
+            if spec["kind"] in ("ar", "warmup", "linear"):
+                self._state[column] = spec["std"] * self.rng.standard_normal(vehicles)
+            elif spec["kind"] == "walk":
+                self._state[column] = self._params[column]["start"] * np.ones(vehicles)
+            elif spec["kind"] == "vehicle":
+                params = self._params[column]
+                self._state[column] = self.rng.uniform(params["low"], params["high"], vehicles)
+            elif spec["kind"] == "state":
+                self._state[column] = self._draw_labels(spec, vehicles)
+        self._faults = []
+        for fault in config.get("faults", []):
+            start = self._per_vehicle(fault["start"])
+            affected = self.rng.random(vehicles) < fault.get("probability", 1.0)
+            self._faults.append((fault, np.where(affected, start, np.inf)))
+
+    def _per_vehicle(self, value):
+        if isinstance(value, (tuple, list)):
+            return self.rng.uniform(value[0], value[1], self.vehicles)
+        return np.full(self.vehicles, float(value))
+
+    def _draw_labels(self, spec, shape):
+        """Label codes drawn by inverse CDF from the configured probabilities"""
+        cumulative = np.cumsum(list(spec["labels"].values()), dtype=float)
+        return np.searchsorted(cumulative / cumulative[-1], self.rng.random(shape), side="right")
+
+    def _signal(self, column, spec, seconds, values):
+        """(vehicles, steps) values of one column over the given elapsed seconds"""
+        params = self._params[column]
+        kind = spec["kind"]
+        shape = (self.vehicles, len(seconds))
+        if kind == "vehicle":
+            return np.broadcast_to(self._state[column][:, None], shape).copy()
+        if kind == "walk":
+            steps = spec["drift"] * self.step_seconds + spec["std"] * self.rng.standard_normal(shape)
+            path = ar1(self._state[column], steps, 1)
+            self._state[column] = path[:, -1]
+            return path
+        if kind == "state":
+            # A new label is drawn at every step where the vehicle does not stay; the rest carry the last one
+            switches = self.rng.random(shape) >= spec["stay"]
+            draws = np.empty(shape, dtype=np.int64)
+            draws[switches] = self._draw_labels(spec, int(switches.sum()))
+            index = np.where(switches, np.arange(len(seconds)), -1)
+            last = np.maximum.accumulate(index, axis=1)
+            codes = np.where(last >= 0, np.take_along_axis(draws, np.maximum(last, 0), axis=1),
+                             self._state[column][:, None])
+            self._state[column] = codes[:, -1]
+            return codes
+
+        phi = spec["phi"]
+        noise = ar1(self._state[column], spec["std"] * np.sqrt(1 - phi * phi) * self.rng.standard_normal(shape), phi)
+        self._state[column] = noise[:, -1]
+        if kind == "ar":
+            return params["mean"][:, None] + noise
+        if kind == "warmup":
+            start, target = params["start"][:, None], params["target"][:, None]
+            return target - (target - start) * np.exp(-seconds / spec["tau"]) + noise
+        if kind == "linear":
+            return params["intercept"][:, None] + params["slope"][:, None] * values[spec["of"]] + noise
+        raise ValueError(f"unknown signal kind {kind!r} for {column}")
+
+    def generate_arrays(self, steps):
+        """The next `steps` steps as {column: (vehicles, steps) array}; state columns hold label codes"""
+        seconds = (self.steps_done + np.arange(steps)) * self.step_seconds
+        in_fault = np.zeros((self.vehicles, steps), dtype=bool)
+        # (started, share of the full effect) per fault, each (vehicles, steps)
+        progress = []
+        for fault, start in self._faults:
+            elapsed = seconds[None, :] - start[:, None]
+            started = elapsed >= 0
+            in_fault |= started
+            progress.append((started, np.clip(elapsed / fault["ramp"], 0, 1) if fault["ramp"] else started * 1.0))
+
+        values = {}
+        for column, spec in self.signals.items():
+            column_values = self._signal(column, spec, seconds, values)
+            for (fault, _), (started, share) in zip(self._faults, progress):
+                effect = fault["effects"].get(column)
+                if effect is None:
+                    continue
+                if spec["kind"] == "state":
+                    column_values = np.where(started, list(spec["labels"]).index(effect), column_values)
+                else:
+                    column_values = column_values + effect * share
+            if spec["kind"] != "state":
+                if "clip" in spec:
+                    column_values = np.clip(column_values, *spec["clip"])
+                decimals = spec.get("round")
+                if decimals is not None:
+                    column_values = np.round(column_values, decimals)
+                    if decimals == 0:
+                        column_values = column_values.astype(np.int64)
+            values[column] = column_values
+        values["Status"] = in_fault
+        self.steps_done += steps
+        return values
+
+    def generate(self, steps, start_time=None):
+        """The next `steps` steps as telemetry rows, one per vehicle per step, in time order
+
+        Rows carry the telemetry columns (plus Vehicle_ID for a fleet) with
+        Timestamp strings like generate_row(). `start_time` stamps the first
+        step, e.g. the wall clock for live use; by default the engine's own
+        clock continues.
+        """
+        first_step = self.steps_done
+        values = self.generate_arrays(steps)
+        if start_time is None:
+            start_time = self.start_time + np.timedelta64(int(first_step * self.step_seconds * 1000), "ms")
+        offsets = (np.arange(steps) * self.step_seconds * 1000).astype("timedelta64[ms]")
+        # Text columns are dictionary-decoded by Arrow: only one string per distinct value is built
+        stamps = pd.DatetimeIndex(np.datetime64(start_time, "ms") + offsets).strftime(TIMESTAMP_FORMAT)
+        columns = {"Timestamp": _text(np.repeat(np.arange(steps), self.vehicles), stamps)}
+        if self.vehicles > 1:
+            names = [f"SIM-{vehicle + 1:04d}" for vehicle in range(self.vehicles)]
+            columns[VEHICLE_COLUMN] = _text(np.tile(np.arange(self.vehicles), steps), names)
+        for column in TELEMETRY_COLUMNS:
+            if column == "Timestamp" or column not in values:
+                continue
+            # (vehicles, steps) -> time-major rows
+            column_values = values[column].T.ravel()
+            spec = self.signals.get(column, {})
+            if column == "Status":
+                columns[column] = _text(column_values, ["Normal", "Fault"])
+            elif spec.get("kind") == "state":
+                columns[column] = _text(column_values, list(spec["labels"]))
+            else:
+                columns[column] = column_values
+        return pa.table(columns).to_pandas()
+
+
+def _text(codes, labels):
+    """String array of labels[codes]"""
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(list(labels))).cast(pa.string())
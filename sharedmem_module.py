@@ -0,0 +1,214 @@
+import json
+import mmap
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Segment layout: a fixed header, then one ring of `capacity` slots per column.
+#   0  magic        8 bytes
+#   8  sequence     uint64, odd while the writer is mid-update (seqlock)
+#   16 length       uint64, rows ever written; row p lives in slot p % capacity
+#   24 capacity     uint64
+#   32 schema size  uint32, followed by the JSON schema [[column, numpy dtype], ...]
+MAGIC = b"TLMSEG01"
+HEADER_SIZE = 4096
+STRING_WIDTH = 32
+SEGMENT_CAPACITY = int(os.environ.get("TELEMETRY_SHM_CAPACITY", 50_000))
+_READ_ATTEMPTS = 1000
+# Shared-memory names created by this process, already tracked by its resource tracker
+_created_names = set()
+
+
+class SegmentBusy(RuntimeError):
+    """The writer kept the segment busy for every read attempt"""
+
+
+def segment_schema(frame, string_width=STRING_WIDTH):
+    """Fixed-width numpy dtype per column: numbers as they are, text as UTF-8 bytes
+
+    Text columns get at least string_width bytes, more when a value of
+    `frame` needs it; longer values written later are cut (see _encode_text).
+    """
+    schema = []
+    for column, dtype in frame.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            schema.append((column, "<i8"))
+        elif pd.api.types.is_numeric_dtype(dtype):
+            schema.append((column, "<f8"))
+        else:
+            longest = np.char.encode(frame[column].fillna("").astype(str).to_numpy(dtype=str), "utf-8").dtype.itemsize
+            schema.append((column, f"S{max(string_width, longest)}"))
+    return schema
+
+
+def _encode_text(values, width):
+    """UTF-8 bytes of each value, cut to at most `width` bytes on a character boundary"""
+    encoded = np.char.encode(values.fillna("").astype(str).to_numpy(dtype=str), "utf-8")
+    if encoded.dtype.itemsize > width:
+        # A plain cut could split a multi-byte character, which readers then fail to decode
+        for i in np.flatnonzero(np.char.str_len(encoded) > width):
+            encoded[i] = encoded[i][:width].decode("utf-8", "ignore").encode("utf-8")
+    return encoded.astype(f"S{width}")
+
+
+class TelemetrySegment:
+    """Ring of the newest telemetry rows in shared memory or a memory-mapped file
+
+    One writer (the ingestion service) publishes rows; any number of reader
+    processes map the same pages, so a dashboard process reads new rows with
+    a memcpy of the requested slots instead of an HTTP round trip and JSON
+    decoding. Reads are made consistent by a seqlock: the writer makes the
+    sequence odd while it updates, and a reader retries when the sequence was
+    odd or changed while it copied.
+
+    Without a path the segment is a multiprocessing.shared_memory block named
+    `name`; with one it is a memory-mapped file, which also survives a writer
+    restart.
+    """
+
+    def __init__(self, buffer, owner=None, created=False):
+        self._buffer = buffer
+        self._owner = owner
+        self._created = created
+        if bytes(buffer[:8]) != MAGIC:
+            raise ValueError("not a telemetry segment")
+        self._header = np.ndarray((3,), dtype="<u8", buffer=buffer, offset=8)
+        (schema_size,) = struct.unpack_from("<I", buffer, 32)
+        self.schema = [tuple(item) for item in json.loads(bytes(buffer[36:36 + schema_size]))]
+        self.columns = [column for column, _ in self.schema]
+        self.capacity = int(self._header[2])
+        self._rings = {}
+        offset = HEADER_SIZE
+        for column, dtype in self.schema:
+            dtype = np.dtype(dtype)
+            self._rings[column] = np.ndarray((self.capacity,), dtype=dtype, buffer=buffer, offset=offset)
+            # Keep every ring 8-byte aligned
+            offset += -(-self.capacity * dtype.itemsize // 8) * 8
+
+    @staticmethod
+    def size(schema, capacity):
+        return HEADER_SIZE + sum(-(-capacity * np.dtype(dtype).itemsize // 8) * 8 for _, dtype in schema)
+
+    @classmethod
+    def create(cls, name, schema, capacity=SEGMENT_CAPACITY, path=None):
+        """Create (or replace) a segment for `schema` ([(column, dtype), ...])"""
+        encoded = json.dumps([list(item) for item in schema]).encode()
+        if 36 + len(encoded) > HEADER_SIZE:
+            raise ValueError("schema does not fit in the segment header")
+        size = cls.size(schema, capacity)
+        if path:
+            with open(path, "wb") as handle:
+                handle.truncate(size)
+            with open(path, "r+b") as handle:
+                owner = mmap.mmap(handle.fileno(), size)
+            buffer = memoryview(owner)
+        else:
+            try:
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+            owner = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _created_names.add(owner._name)
+            buffer = owner.buf
+        buffer[8:32] = struct.pack("<QQQ", 0, 0, capacity)
+        struct.pack_into("<I", buffer, 32, len(encoded))
+        buffer[36:36 + len(encoded)] = encoded
+        # The magic goes last: readers attaching mid-creation see no segment yet
+        buffer[:8] = MAGIC
+        return cls(buffer, owner, created=True)
+
+    @classmethod
+    def attach(cls, name, path=None):
+        """Map an existing segment for reading; FileNotFoundError until the writer has created it"""
+        if path:
+            with open(path, "r+b") as handle:
+                owner = mmap.mmap(handle.fileno(), 0)
+            return cls(memoryview(owner), owner)
+        owner = shared_memory.SharedMemory(name=name)
+        if owner._name not in _created_names:
+            # Before Python 3.13 the resource tracker would unlink the writer's segment when a reader exits
+            resource_tracker.unregister(owner._name, "shared_memory")
+        return cls(owner.buf, owner)
+
+    @property
+    def sequence(self):
+        return int(self._header[0])
+
+    def __len__(self):
+        return int(self._header[1])
+
+    @property
+    def first_position(self):
+        """Oldest row position still held by the ring"""
+        return max(0, len(self) - self.capacity)
+
+    def write(self, frame):
+        """Publish rows (in arrival order); only the last `capacity` of a large batch are kept
+
+        Every row of the batch takes a position, kept or not, so positions
+        stay aligned with the stores the batch was also appended to.
+        """
+        count = len(frame)
+        if not count:
+            return
+        start = len(self)
+        kept = min(count, self.capacity)
+        frame = frame.iloc[count - kept:]
+        slots = np.arange(start + count - kept, start + count) % self.capacity
+        self._header[0] += 1
+        try:
+            for column, ring in self._rings.items():
+                values = frame[column] if column in frame.columns else pd.Series(index=frame.index, dtype=float)
+                if ring.dtype.kind == "S":
+                    ring[slots] = _encode_text(values, ring.dtype.itemsize)
+                else:
+                    ring[slots] = values.to_numpy(dtype=ring.dtype, na_value=np.nan if ring.dtype.kind == "f" else 0)
+            self._header[1] = start + count
+        finally:
+            self._header[0] += 1
+
+    def read(self, since=None, limit=None):
+        """Rows [since, since + limit) still in the ring, as a DataFrame indexed by position
+
+        `since` defaults to the oldest row held. Raises SegmentBusy if no
+        consistent copy could be taken.
+        """
+        for _ in range(_READ_ATTEMPTS):
+            sequence = self.sequence
+            if sequence % 2:
+                time.sleep(0)
+                continue
+            length = len(self)
+            lo = max(self.first_position, 0 if since is None else since)
+            hi = length if limit is None else min(length, lo + limit)
+            slots = np.arange(lo, max(lo, hi)) % self.capacity
+            columns = {column: ring[slots] for column, ring in self._rings.items()}
+            if self.sequence == sequence:
+                break
+        else:
+            raise SegmentBusy(f"segment kept changing over {_READ_ATTEMPTS} reads")
+
+        for column, values in columns.items():
+            if values.dtype.kind == "S":
+                # A segment written before values were cut on character boundaries may hold a split one
+                columns[column] = np.char.decode(values, "utf-8", "replace")
+        return pd.DataFrame(columns, index=pd.RangeIndex(lo, lo + len(slots)))
+
+    def close(self):
+        """Unmap; the creator also removes the shared-memory block"""
+        rings, self._rings = self._rings, {}
+        del rings
+        self._header = None
+        if isinstance(self._owner, shared_memory.SharedMemory):
+            self._owner.close()
+            if self._created:
+                self._owner.unlink()
+        else:
+            self._buffer.release()
+            self._owner.close()
@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+
+from anomaly_module import SENSOR_COLUMNS
+from retention_module import TieredLog
+
+TELEMETRY_COLUMNS = [
+    'Timestamp', 'Engine_RPM', 'Coolant_Temp_C', 'Oil_Temp_C', 'Idle_Status',
+    'Engine_Load_Percent', 'Ignition_Timing_Deg', 'MAP_kPa', 'MAF_gps',
+    'Battery_Voltage_V', 'Charging_System_Status', 'O2_Sensor_V',
+    'Catalytic_Converter_Percent', 'EGR_Status', 'Vehicle_Speed_kmh',
+    'Transmission_Gear', 'Brake_Status', 'Tire_Pressure_psi', 'Ambient_Temp_C',
+    'Battery_Age_Months', 'Fuel_Level_Percent', 'Status'
+]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Rollup resolutions, finest first: name -> bucket width in seconds
+ROLLUP_RESOLUTIONS = {"1min": 60, "10min": 600, "1h": 3600}
+# Buckets kept per rollup resolution: one week of minutes, 30 days of 10 minutes, a year of hours
+ROLLUP_MAX_BUCKETS = {"1min": 7 * 24 * 60, "10min": 30 * 24 * 6, "1h": 365 * 24}
+RAW_RESOLUTION = "raw"
+
+
+def to_epoch_seconds(timestamps):
+    """Parse Timestamp strings (or datetimes) into int64 Unix seconds; missing or unparsable values become -1"""
+    try:
+        # numpy parses the ISO-like Timestamp format directly, with far less per-call overhead than pandas
+        parsed = np.asarray(timestamps, dtype="datetime64[s]")
+    except (TypeError, ValueError):
+        parsed = pd.to_datetime(pd.Series(timestamps), format=TIMESTAMP_FORMAT, errors="coerce").to_numpy(dtype="datetime64[s]")
+    seconds = parsed.astype(np.int64)
+    seconds[np.isnat(parsed)] = -1
+    return seconds
+
+
+class RollupLevel:
+    """count / sum / min / max per column for fixed-width time buckets, merged batch by batch
+
+    Buckets live in buffers that grow by doubling, so a new bucket at the end
+    (live ingest) is written in place. With max_buckets set, the oldest
+    buckets beyond it are dropped.
+    """
+
+    def __init__(self, seconds, columns, max_buckets=None):
+        self.seconds = seconds
+        self.columns = list(columns)
+        self.max_buckets = max_buckets
+        # True once buckets were dropped, so the level no longer reaches back to the first row
+        self.dropped = False
+        self._size = 0
+        self._allocate(64)
+
+    def _allocate(self, capacity):
+        width = len(self.columns)
+        buffers = (
+            np.empty(capacity, dtype=np.int64), np.empty((capacity, width), dtype=np.int64),
+            np.empty((capacity, width)), np.empty((capacity, width)), np.empty((capacity, width))
+        )
+        if self._size:
+            for buffer, current in zip(buffers, self._arrays()):
+                buffer[:self._size] = current
+        self._starts, self._count, self._total, self._minimum, self._maximum = buffers
+
+    def _arrays(self):
+        return self.starts, self.count, self.total, self.minimum, self.maximum
+
+    @property
+    def starts(self):
+        return self._starts[:self._size]
+
+    @property
+    def count(self):
+        return self._count[:self._size]
+
+    @property
+    def total(self):
+        return self._total[:self._size]
+
+    @property
+    def minimum(self):
+        return self._minimum[:self._size]
+
+    @property
+    def maximum(self):
+        return self._maximum[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def update(self, epoch_seconds, values):
+        """Fold a batch of rows (epoch seconds, (n, columns) float array with NaN gaps) into the buckets"""
+        if len(epoch_seconds) == 0:
+            return
+        buckets = epoch_seconds // self.seconds * self.seconds
+        order = np.argsort(buckets, kind="stable")
+        buckets, values = buckets[order], values[order]
+        first = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+
+        present = ~np.isnan(values)
+        count = np.add.reduceat(present.astype(np.int64), first, axis=0)
+        total = np.add.reduceat(np.where(present, values, 0.0), first, axis=0)
+        # fmin/fmax skip NaN; an all-NaN bucket stays NaN
+        minimum = np.fmin.reduceat(values, first, axis=0)
+        maximum = np.fmax.reduceat(values, first, axis=0)
+        self._merge(buckets[first], count, total, minimum, maximum)
+        self._trim()
+
+    def _merge(self, starts, count, total, minimum, maximum):
+        position = np.searchsorted(self.starts, starts)
+        existing = position < self._size
+        existing[existing] = self.starts[position[existing]] == starts[existing]
+
+        rows = position[existing]
+        self.count[rows] += count[existing]
+        self.total[rows] += total[existing]
+        self.minimum[rows] = np.fmin(self.minimum[rows], minimum[existing])
+        self.maximum[rows] = np.fmax(self.maximum[rows], maximum[existing])
+
+        new = ~existing
+        if not new.any():
+            return
+        at = position[new]
+        pieces = (starts[new], count[new], total[new], minimum[new], maximum[new])
+        if (at == self._size).all():
+            # Live ingest: new buckets only ever follow the last one
+            size = self._size + len(at)
+            if size > len(self._starts):
+                self._allocate(max(size, 2 * len(self._starts)))
+            for buffer, piece in zip((self._starts, self._count, self._total, self._minimum, self._maximum), pieces):
+                buffer[self._size:size] = piece
+            self._size = size
+        else:
+            # Late rows open buckets between existing ones
+            arrays = [np.insert(current, at, piece, axis=0) for current, piece in zip(self._arrays(), pieces)]
+            self._starts, self._count, self._total, self._minimum, self._maximum = arrays
+            self._size = len(arrays[0])
+
+    def _trim(self):
+        """Drop the oldest buckets beyond max_buckets"""
+        if self.max_buckets is None or self._size <= self.max_buckets:
+            return
+        dropped = self._size - self.max_buckets
+        for buffer in (self._starts, self._count, self._total, self._minimum, self._maximum):
+            buffer[:self.max_buckets] = buffer[dropped:self._size]
+        self._size = self.max_buckets
+        self.dropped = True
+
+    @property
+    def nbytes(self):
+        """Allocated bytes, including the room reserved for new buckets"""
+        return sum(buffer.nbytes for buffer in (self._starts, self._count, self._total, self._minimum, self._maximum))
+
+    def covers(self, start):
+        """True when the level still holds every bucket from `start` (None: the first row) on"""
+        return not self.dropped or (start is not None and self._size > 0 and start >= self.starts[0])
+
+    def bucket_range(self, start=None, end=None):
+        """Bucket rows overlapping [start, end] (epoch seconds)"""
+        lo = 0 if start is None else np.searchsorted(self.starts, start - self.seconds, side="right")
+        hi = len(self.starts) if end is None else np.searchsorted(self.starts, end, side="right")
+        return slice(lo, hi)
+
+    def frame(self, columns=None, start=None, end=None):
+        """Timestamp plus mean (under the column name), _min, _max and _count for each column"""
+        columns = list(columns or self.columns)
+        rows = self.bucket_range(start, end)
+        data = {"Timestamp": pd.to_datetime(self.starts[rows], unit="s")}
+        for column in columns:
+            i = self.columns.index(column)
+            count = self.count[rows, i]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                data[column] = np.where(count > 0, self.total[rows, i] / count, np.nan)
+            data[f"{column}_min"] = self.minimum[rows, i]
+            data[f"{column}_max"] = self.maximum[rows, i]
+            data[f"{column}_count"] = count
+        return pd.DataFrame(data)
+
+
+class TelemetryStore:
+    """Raw telemetry history plus incrementally maintained multi-resolution rollups
+
+    Every append updates the 1 min / 10 min / 1 h rollups of the numeric
+    sensor columns, so long-range timelines read a few hundred buckets instead
+    of every 5-second sample. Raw rows live in a TieredLog (hot / warm
+    compressed / cold on disk); the rollups and the per-row timestamps of
+    the retained rows stay in memory.
+    """
+
+    def __init__(self, columns=None, rollup_columns=None, resolutions=None, retention=None, rollup_buckets=None):
+        self.columns = list(columns or TELEMETRY_COLUMNS)
+        self.rollup_columns = list(rollup_columns or SENSOR_COLUMNS)
+        rollup_buckets = ROLLUP_MAX_BUCKETS if rollup_buckets is None else rollup_buckets
+        self.rollups = {name: RollupLevel(seconds, self.rollup_columns, rollup_buckets.get(name))
+                        for name, seconds in (resolutions or ROLLUP_RESOLUTIONS).items()}
+        self._log = TieredLog(columns=self.columns, **(retention or {}))
+        # Epoch seconds of the retained rows; grows by doubling, entry 0 is position _seconds_start
+        self._seconds_buffer = np.empty(1024, dtype=np.int64)
+        self._seconds_start = 0
+        self._seconds_count = 0
+
+    def __len__(self):
+        return len(self._log)
+
+    @property
+    def empty(self):
+        return len(self._log) == 0
+
+    @property
+    def first_position(self):
+        """Oldest position still retained (rows before it were dropped by retention)"""
+        return self._log.first_position
+
+    @property
+    def frame(self):
+        """Full raw history across all tiers; row positions are the index"""
+        return self._log.rows()
+
+    def rows(self, start=None, stop=None):
+        """Raw rows by position [start, stop)"""
+        return self._log.rows(start, stop)
+
+    def arrow(self, start=None, stop=None):
+        """Raw rows by position [start, stop) as an Arrow table"""
+        return self._log.arrow(start, stop)
+
+    def append(self, frame):
+        """Append a batch of rows; return it re-indexed to its positions in the store"""
+        first_position = self._log.append(frame.reset_index(drop=True))
+        frame = frame.set_axis(pd.RangeIndex(first_position, first_position + len(frame)))
+
+        seconds = to_epoch_seconds(frame["Timestamp"])
+        self._index_seconds(seconds)
+        valid = seconds >= 0
+        columns = self.rollup_columns if set(self.rollup_columns) <= set(frame.columns) else None
+        values = (frame[columns] if columns else frame.reindex(columns=self.rollup_columns)).to_numpy(dtype=float, na_value=np.nan)
+        for level in self.rollups.values():
+            level.update(seconds[valid], values[valid])
+        return frame
+
+    @property
+    def _seconds(self):
+        return self._seconds_buffer[:self._seconds_count]
+
+    def _index_seconds(self, seconds):
+        """Append to the timestamp index, then drop the entries of rows retention has dropped"""
+        count = self._seconds_count + len(seconds)
+        if count > len(self._seconds_buffer):
+            grown = np.empty(max(count, 2 * len(self._seconds_buffer)), dtype=np.int64)
+            grown[:self._seconds_count] = self._seconds
+            self._seconds_buffer = grown
+        self._seconds_buffer[self._seconds_count:count] = seconds
+        self._seconds_count = count
+
+        dropped = self.first_position - self._seconds_start
+        if dropped > 0:
+            # Retention drops whole blocks, so this shift runs once per block rather than per append
+            self._seconds_count -= dropped
+            self._seconds_buffer[:self._seconds_count] = self._seconds_buffer[dropped:dropped + self._seconds_count]
+            self._seconds_start = self.first_position
+
+    def time_range(self):
+        """(first, last) epoch seconds of the stored rows, or None when empty"""
+        valid = self._seconds[self._seconds >= 0]
+        return (int(valid.min()), int(valid.max())) if len(valid) else None
+
+    def position_range(self, start=None, end=None):
+        """(lo, hi) row positions of [start, end]; rows arrive in time order, so a window is a slice"""
+        lo = 0 if start is None else int(np.searchsorted(self._seconds, start, side="left"))
+        hi = len(self._seconds) if end is None else int(np.searchsorted(self._seconds, end, side="right"))
+        return self._seconds_start + lo, self._seconds_start + hi
+
+    def seconds_at(self, positions):
+        """Epoch seconds of the rows at the given positions (-1 where the timestamp was unparsable or the row was dropped)"""
+        offsets = np.asarray(positions, dtype=np.int64) - self._seconds_start
+        retained = (offsets >= 0) & (offsets < self._seconds_count)
+        seconds = np.full(offsets.shape, -1, dtype=np.int64)
+        seconds[retained] = self._seconds[offsets[retained]]
+        return seconds
+
+    def positions_at(self, seconds):
+        """Position of the newest row at or before each epoch second, -1 before the first retained row"""
+        offsets = np.searchsorted(self._seconds, seconds, side="right") - 1
+        return np.where(offsets >= 0, offsets + self._seconds_start, -1)
+
+    def take(self, positions):
+        """Rows at the given ascending positions, indexed by position; positions dropped by retention are left out"""
+        return self._log.take(positions)
+
+    def window(self, start=None, end=None, max_rows=None):
+        """Raw rows in [start, end], limited to the newest max_rows"""
+        lo, hi = self.position_range(start, end)
+        if max_rows is not None:
+            lo = max(lo, hi - max_rows)
+        return self._log.rows(lo, hi)
+
+    def memory_usage(self):
+        """Per-tier usage of the raw rows plus the in-memory rollups and timestamp index"""
+        usage = self._log.memory_usage()
+        usage["index_bytes"] = self._seconds_buffer.nbytes + sum(level.nbytes for level in self.rollups.values())
+        return usage
+
+    def choose_resolution(self, start=None, end=None, max_points=1200):
+        """Finest resolution whose point count over [start, end] fits in max_points
+
+        Raw rows are used while they fit; past that the finest rollup that fits
+        (the most detail the chart width can show), else the coarsest rollup.
+        Rollups that dropped buckets from the start of the range are skipped.
+        """
+        lo, hi = self.position_range(start, end)
+        if hi - lo <= max_points:
+            return RAW_RESOLUTION
+        for name, level in self.rollups.items():
+            if not level.covers(start):
+                continue
+            rows = level.bucket_range(start, end)
+            if rows.stop - rows.start <= max_points:
+                return name
+        return list(self.rollups)[-1]
+
+    def timeline(self, columns, start=None, end=None, max_points=1200):
+        """Return (frame, resolution) for a timeline of `columns` over [start, end]
+
+        The frame has a Timestamp column and one column per sensor, like the raw
+        telemetry, so chart functions can plot either. Rollup frames add
+        _min/_max/_count columns.
+        """
+        resolution = self.choose_resolution(start, end, max_points)
+        if resolution != RAW_RESOLUTION:
+            return self.rollups[resolution].frame(columns, start, end), resolution
+
+        return self.window(start, end)[["Timestamp"] + list(columns)], RAW_RESOLUTION